@@ -0,0 +1,110 @@
+""" Blob codec benchmark: encode and decode time and stored size for each codec and compression """
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable
+
+from benchmarks.bench_render import git_version, sample_email_data
+from benchmarks.fixtures import BATTERS, PITCHERS, fangraphs_leaderboard
+import src.mlb_today.config as config
+from src.mlb_today.services.blob_codec import (
+    CODECS, COMPRESSIONS, decode_document, encode_document, get_codec, get_compression
+)
+from src.mlb_today.services.stats_format import to_columnar
+
+
+def payloads(paths: list[str]) -> dict[str, Any]:
+    """
+    Documents to store: saved Fangraphs responses if given, else synthetic ones, as fetched and as stored
+
+    Args:
+        paths (list[str]): saved Fangraphs leaderboard responses (JSON), e.g. from the browser's network tab
+
+    Returns:
+        dict[str, Any]: document, by name
+    """
+    if paths:
+        documents: dict[str, Any] = {}
+        for path in paths:
+            with open(path, "rb") as payload_file:
+                response: dict[str, Any] = json.load(payload_file)
+            name: str = os.path.splitext(os.path.basename(path))[0]
+            documents[f"{name}.response"] = response
+            documents[f"{name}.columnar"] = to_columnar(response["data"], list(response["data"][0]))
+        return documents
+
+    batting: dict[str, Any] = fangraphs_leaderboard("bat", BATTERS, seed=1)
+    pitching: dict[str, Any] = fangraphs_leaderboard("pit", PITCHERS, seed=2)
+    return {
+        "batting.response": batting,
+        "batting.json": to_columnar(batting["data"], config.BATTING_COLUMNS),
+        "pitching.json": to_columnar(pitching["data"], config.PITCHING_COLUMNS),
+        "email_data.json": sample_email_data()
+    }
+
+
+def median_ms(function: Callable[[], Any], iterations: int) -> float:
+    """ Median wall time of a call, in milliseconds """
+    timings: list[float] = []
+    for _ in range(iterations):
+        start: float = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def installed(getter: Callable[[str], Any], name: str) -> bool:
+    """ Whether a codec or compression's package is installed """
+    try:
+        getter(name)
+    except RuntimeError:
+        return False
+    return True
+
+
+def run(paths: list[str], iterations: int) -> dict[str, Any]:
+    """
+    Time every available codec and compression on each payload
+
+    Args:
+        paths (list[str]): saved Fangraphs responses (synthetic payloads if empty)
+        iterations (int): encodes and decodes to time per combination
+
+    Returns:
+        dict[str, Any]: benchmark results: {payload: {codec+compression: {bytes, encode_ms, decode_ms}}}
+    """
+    # Skip combinations whose package is missing
+    codecs: list[str] = [name for name in CODECS if installed(get_codec, name)]
+    compressions: list[str] = [name for name in COMPRESSIONS if installed(get_compression, name)]
+
+    results: dict[str, Any] = {"version": git_version(), "iterations": iterations, "payloads": {}}
+    for payload, document in payloads(paths).items():
+        rows: dict[str, Any] = {}
+        for codec in codecs:
+            for compression in compressions:
+                encode: Callable[[], bytes] = lambda: encode_document(document, codec, compression).data
+                data: bytes = encode()
+                rows[f"{codec}+{compression}"] = {
+                    "bytes": len(data),
+                    "encode_ms": median_ms(encode, iterations),
+                    "decode_ms": median_ms(lambda: decode_document(data), iterations)
+                }
+        results["payloads"][payload] = rows
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark blob codecs and compression")
+    parser.add_argument("payloads", nargs="*", help="saved Fangraphs leaderboard responses (default: synthetic)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", help="append the results as a JSON line to this file")
+    arguments = parser.parse_args()
+
+    benchmark: dict[str, Any] = run(arguments.payloads, arguments.iterations)
+    print(json.dumps(benchmark, indent=2))
+    if arguments.output:
+        os.makedirs(os.path.dirname(arguments.output) or ".", exist_ok=True)
+        with open(arguments.output, "a", encoding="utf-8") as output:
+            output.write(json.dumps(benchmark) + "\n")
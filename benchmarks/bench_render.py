@@ -0,0 +1,131 @@
+""" Email render benchmark: template load time, render time and output size """
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Any
+
+from jinja2 import FileSystemLoader, ModuleLoader
+
+from src.mlb_today.rendering import (
+    MinifyingLoader, TEMPLATE_PATH, build_templates, create_environment, prepare_email_data
+)
+
+TEMPLATE_NAME: str = "email.jinja2"
+
+
+def sample_email_data(games: int = 15, leaders: int = 25) -> dict[str, Any]:
+    """
+    Build email data shaped like email_data.json
+
+    Args:
+        games (int): games on the slate
+        leaders (int): rows per leaderboard
+
+    Returns:
+        dict[str, Any]: email data
+    """
+    def side(number: int) -> dict[str, Any]:
+        return {
+            "abbr": f"T{number:02d}",
+            "record": {"wins": 50 + number, "losses": 40 - number % 10},
+            "pitcher": {
+                "name": f"Pitcher {number}",
+                "record": {"wins": 8.0, "losses": 5.0},
+                "era": 3.1234 + number / 100,
+                "xfip": 3.5678,
+                "war": 2.3456
+            }
+        }
+
+    return {
+        "probables": [
+            {
+                "date": f"2025-07-04T{13 + number // 5}:05:00-04:00",
+                "venue": f"Ballpark {number}, (City, ST)",
+                "away": side(number * 2),
+                "home": side(number * 2 + 1),
+                "watch": {"home": ["HOME"], "away": ["AWAY"], "national": ["NAT"] if number % 3 == 0 else [], "misc": []}
+            }
+            for number in range(games)
+        ],
+        "batting": [
+            {"name": f"Batter {n}", "team": "TM", "avg": 0.3, "hr": 20.0, "obp": 0.4, "slg": 0.5, "ops": 0.9,
+             "babip": 0.31, "war": 4.1}
+            for n in range(leaders)
+        ],
+        "pitching": [
+            {"name": f"Pitcher {n}", "team": "TM", "w": 10.0, "l": 4.0, "era": 2.5, "xfip": 3.0, "war": 3.9}
+            for n in range(leaders)
+        ]
+    }
+
+
+def git_version() -> str:
+    """ Current release/commit, for tracking results over time """
+    try:
+        return subprocess.run(
+            ["git", "describe", "--tags", "--always", "--dirty"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(iterations: int) -> dict[str, Any]:
+    """
+    Time template loading for each loader, then rendering with the precompiled template
+
+    Args:
+        iterations (int): renders to time
+
+    Returns:
+        dict[str, Any]: benchmark results
+    """
+    results: dict[str, Any] = {"version": git_version(), "iterations": iterations, "load_ms": {}}
+
+    with tempfile.TemporaryDirectory() as compiled_path:
+        build_templates(compiled_path)
+        loaders = {
+            "source": FileSystemLoader(TEMPLATE_PATH),
+            "minified": MinifyingLoader(TEMPLATE_PATH),
+            "precompiled": ModuleLoader(compiled_path)
+        }
+        for name, loader in loaders.items():  # Fresh environment each time, as on a cold start
+            start: float = time.perf_counter()
+            template = create_environment(loader).get_template(TEMPLATE_NAME)
+            results["load_ms"][name] = round((time.perf_counter() - start) * 1000, 3)
+
+        email_data: dict[str, Any] = sample_email_data()
+        timings: list[float] = []
+        html: str = ""
+        for _ in range(iterations):
+            start = time.perf_counter()
+            html = template.render(**prepare_email_data(email_data))
+            timings.append((time.perf_counter() - start) * 1000)
+
+    source_html: str = create_environment(FileSystemLoader(TEMPLATE_PATH)).get_template(TEMPLATE_NAME).render(
+        **prepare_email_data(email_data)
+    )
+    results["render_ms"] = {
+        "mean": round(statistics.fmean(timings), 3),
+        "p95": round(sorted(timings)[int(len(timings) * 0.95) - 1], 3)
+    }
+    results["output_bytes"] = {"precompiled": len(html.encode()), "source": len(source_html.encode())}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark email template rendering")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="append the results as a JSON line to this file")
+    arguments = parser.parse_args()
+
+    benchmark: dict[str, Any] = run(arguments.iterations)
+    print(json.dumps(benchmark, indent=2))
+    if arguments.output:
+        os.makedirs(os.path.dirname(arguments.output) or ".", exist_ok=True)
+        with open(arguments.output, "a", encoding="utf-8") as output:
+            output.write(json.dumps(benchmark) + "\n")
@@ -0,0 +1,344 @@
+""" Offline micro-benchmarks of the probables, leaderboard, JSON, archive, API and email stages at 1x/10x/100x scale """
+import argparse
+import atexit
+from datetime import date, timedelta
+import gc
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+os.environ.setdefault("METRICS_EXPORTER", "none")  # Don't time the metrics file writes along with the stages
+
+from benchmarks.bench_render import git_version
+from benchmarks.fakes import FakeStorageService, fake_email_client
+from benchmarks.fixtures import BATTERS, GAMES_PER_DAY, PITCHERS, TEAMS, fangraphs_leaderboard, mlb_schedule
+import src.mlb_today.config as config
+from src.mlb_today.composer import EmailComposer, RecipientPreferences
+from src.mlb_today.models import EmailData
+from src.mlb_today.read_api import ReadApi
+from src.mlb_today.rendering import create_environment, prepare_email_data
+from src.mlb_today.services.archive_service import SeasonArchive, encode_frame
+from src.mlb_today.services.email_service import EmailService
+from src.mlb_today.services.json_stream import iter_array_items, iter_encoded
+from src.mlb_today.services.leaderboards import (
+    BATTING_LEADERBOARD_SPECS, BATTING_QUALIFIER, PITCHING_LEADERBOARD_SPECS, PITCHING_QUALIFIER, compute_leaderboards
+)
+from src.mlb_today.services.probables_service import ProbablesService
+from src.mlb_today.services.stats_format import to_columnar
+
+BASELINE_PATH: str = os.path.join(os.path.dirname(__file__), "baselines.json")
+BASELINE_COMMAND: str = "python -m benchmarks.bench_suite --update-baselines"  # The only way baselines are written
+DEFAULT_SCALES: tuple[int, ...] = (1, 10, 100)
+DEFAULT_THRESHOLD: float = 1.5  # Fail when the calibrated median is this many times the baseline
+NOISE_FLOOR_MS: float = 1.0  # Differences below this are timer noise, not regressions
+ARCHIVE_DAYS: int = 180  # Daily frames in the benchmark season archive
+
+
+class Scenario:
+    """ Fixtures for one scale: raw API payloads, the blobs ingest would store, and the email data """
+    def __init__(self, scale: int):
+        self.scale = scale
+        batting_response: dict[str, Any] = fangraphs_leaderboard("bat", BATTERS * scale, seed=scale)
+        pitching_response: dict[str, Any] = fangraphs_leaderboard("pit", PITCHERS * scale, seed=scale + 1)
+        self.schedule: dict[str, Any] = mlb_schedule(GAMES_PER_DAY * scale, pitchers=PITCHERS * scale, seed=scale)
+        self.games: list[dict[str, Any]] = self.schedule["dates"][0]["games"]
+
+        self.pitching_bytes: bytes = json.dumps(pitching_response).encode("utf-8")
+        self.batting: dict[str, Any] = to_columnar(batting_response["data"], config.BATTING_COLUMNS)
+        self.pitching: dict[str, Any] = to_columnar(pitching_response["data"], config.PITCHING_COLUMNS)
+
+        self.storage: FakeStorageService = FakeStorageService()
+        self.storage.save_blob_stream("batting.json", iter_encoded(self.batting))
+        self.storage.save_blob_stream("pitching.json", iter_encoded(self.pitching))
+        self.storage.save_blob("batting.leaders.json", json.dumps(compute_leaderboards(
+            self.batting, list(BATTING_LEADERBOARD_SPECS.values()), BATTING_QUALIFIER
+        )))
+        self.storage.save_blob("pitching.leaders.json", json.dumps(compute_leaderboards(
+            self.pitching, list(PITCHING_LEADERBOARD_SPECS.values()), PITCHING_QUALIFIER
+        )))
+
+        service: ProbablesService = ProbablesService(self.storage)
+        self.email_model: EmailData = EmailData(
+            service.get_probables_data(self.games), service.get_off_war_leaders(), service.get_pitching_war_leaders()
+        )
+        self.email_data: dict[str, Any] = self.email_model.to_dict()  # As bp_email reads it back
+        self.storage.save_blob("email_data.json", self.email_model.to_json(), config.EMAIL_BLOB_CONTAINER_NAME)
+
+
+def _season_archive(scenario: Scenario) -> str:
+    """ Write a season archive of ARCHIVE_DAYS daily copies of the scenario's pitching snapshot; returns its path """
+    directory: str = tempfile.mkdtemp(prefix="mlb-today-bench-")
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    path: str = os.path.join(directory, "pitching.bin")
+    frame: bytes = encode_frame("2025-03-27", scenario.pitching)
+    date_offset: int = 8  # The date follows magic, version and column count in the frame header
+    with open(path, "wb") as archive_file:
+        for number in range(ARCHIVE_DAYS):
+            day: bytes = (date(2025, 3, 27) + timedelta(days=number)).isoformat().encode("ascii")
+            archive_file.write(frame[:date_offset] + day + frame[date_offset + 10:])
+    return path
+
+
+def _chunks(data: bytes, size: int = 64 * 1024) -> list[bytes]:
+    """ Split a response body the way HttpClient.iter_bytes yields it """
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+def benchmarks(scenario: Scenario) -> dict[str, Callable[[], Any]]:
+    """
+    Callables to time for one scenario
+
+    Args:
+        scenario (Scenario): fixtures at one scale
+
+    Returns:
+        dict[str, Callable[[], Any]]: benchmark, by name
+    """
+    service: ProbablesService = ProbablesService(scenario.storage)
+    environment = create_environment()
+    template = environment.get_template("email.jinja2")
+    email_service: EmailService = EmailService()
+    recipients: list[dict[str, str]] = email_service.create_email_recipients("reader@example.com")
+    html: str = template.render(**prepare_email_data(scenario.email_data))
+    pitching_chunks: list[bytes] = _chunks(scenario.pitching_bytes)
+    composer: EmailComposer = EmailComposer(environment)
+    preferences: list[RecipientPreferences] = [  # 500 recipients, each following one team
+        RecipientPreferences([TEAMS[number % len(TEAMS)][0]], only_teams=number % 2 == 0) for number in range(500)
+    ]
+
+    def compose_emails() -> list[str]:
+        edition = composer.edition(prepare_email_data(scenario.email_data))
+        return [edition.assemble(recipient) for recipient in preferences]
+
+    archive: dict[str, str] = {}
+    player_id: Any = scenario.pitching["columns"]["xMLBAMID"][-1]
+
+    def player_series() -> list[dict[str, Any]]:
+        if "path" not in archive:  # Written on the untimed warm-up call, and only if selected
+            archive["path"] = _season_archive(scenario)
+        with SeasonArchive(archive["path"]) as season:
+            return season.series(player_id, ("ERA", "IP"))
+
+    read_api: ReadApi = ReadApi(lambda: scenario.storage)
+
+    def serve_games_cold() -> tuple[bytes, str | None]:  # Load, encode and gzip, as on a worker's first request
+        return ReadApi(lambda: scenario.storage).games().encoded("gzip")
+
+    def serve_games_cached() -> bool:  # Revalidated client, answered from the response cache with a 304
+        response = read_api.games()
+        return response.matches(response.etag)
+
+    def send_email() -> None:
+        with fake_email_client():
+            email_service.send_email_with_acs(subject="MLB Today", html_body=html, to_recipients=recipients)
+
+    return {
+        "probables.get_probables_data": lambda: service.get_probables_data(scenario.games),
+        "probables.get_tv_watch": lambda: [service.get_tv_watch(game.get("broadcasts", [])) for game in scenario.games],
+        "leaders.compute_leaderboards": lambda: compute_leaderboards(
+            scenario.batting, list(BATTING_LEADERBOARD_SPECS.values()), BATTING_QUALIFIER
+        ),
+        "leaders.war_leaders": lambda: (service.get_off_war_leaders(), service.get_pitching_war_leaders()),
+        "json.ingest_stream": lambda: to_columnar(
+            iter_array_items(iter(pitching_chunks), "data"), config.PITCHING_COLUMNS
+        ),
+        "json.encode_snapshot": lambda: b"".join(iter_encoded(scenario.pitching)),
+        "json.encode_email_data": scenario.email_model.to_json,
+        "archive.encode_frame": lambda: encode_frame("2025-03-27", scenario.pitching),
+        "archive.player_series": player_series,
+        "api.games_cold": serve_games_cold,
+        "api.games_cached": serve_games_cached,
+        "email.render": lambda: template.render(**prepare_email_data(scenario.email_data)),
+        "email.compose_personalized": compose_emails,
+        "email.send": send_email
+    }
+
+
+def calibration_workload() -> Any:
+    """ Fixed mix of the work the stages do (dict building, JSON round trip, sorting, string formatting) """
+    rows: list[dict[str, Any]] = [
+        {"id": number, "name": f"Player {number}", "value": (number * 7919) % 1000 / 10} for number in range(1000)
+    ]
+    rows = json.loads(json.dumps(rows))
+    rows.sort(key=lambda row: (-row["value"], row["id"]))
+    return "".join(f"<td>{row['name']}</td><td>{row['value']:.1f}</td>" for row in rows)
+
+
+def measure(function: Callable[[], Any], min_runs: int = 3, max_runs: int = 50, budget_s: float = 1.0) -> dict[str, Any]:
+    """
+    Time a callable: one warm-up call, then at least min_runs calls or until the time budget is spent.
+    Each call is paired with a call of the calibration workload, so both see the machine at the same speed.
+
+    Args:
+        function (Callable[[], Any]): code to time
+        min_runs (int): fewest timed calls
+        max_runs (int): most timed calls
+        budget_s (float): time budget, in seconds
+
+    Returns:
+        dict[str, Any]: runs, median and p95 in milliseconds, calibration median in milliseconds and the median
+            ratio of each call to its calibration call ("relative")
+    """
+    function()
+    calibration_workload()
+    timings: list[float] = []
+    calibrations: list[float] = []
+    gc.collect()
+    gc.disable()  # As timeit does: a collection landing in one call is noise, not that call's cost
+    try:
+        started: float = time.perf_counter()
+        while len(timings) < min_runs or (len(timings) < max_runs and time.perf_counter() - started < budget_s):
+            start: float = time.perf_counter()
+            function()
+            middle: float = time.perf_counter()
+            calibration_workload()
+            timings.append((middle - start) * 1000)
+            calibrations.append((time.perf_counter() - middle) * 1000)
+    finally:
+        gc.enable()
+    ratios: list[float] = [timing / calibration for timing, calibration in zip(timings, calibrations)]
+    timings.sort()
+    return {
+        "runs": len(timings),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[max(0, int(len(timings) * 0.95) - 1)], 3),
+        "calibration_ms": round(statistics.median(calibrations), 3),
+        "relative": float(f"{statistics.median(ratios):.4g}")
+    }
+
+
+def run(scales: tuple[int, ...], selected: list[str] | None = None) -> tuple[dict[str, Any], float]:
+    """
+    Run every benchmark at every scale
+
+    Args:
+        scales (tuple[int, ...]): scale multipliers
+        selected (list[str] | None): benchmark name prefixes to run (default all)
+
+    Returns:
+        tuple[dict[str, Any], float]: results keyed "name@Nx", each with its median in calibration units
+            ("relative"), and the run's median calibration time in milliseconds
+    """
+    results: dict[str, Any] = {}
+    for scale in scales:
+        scenario: Scenario = Scenario(scale)
+        for name, function in benchmarks(scenario).items():
+            if selected and not any(name.startswith(prefix) for prefix in selected):
+                continue
+            result: dict[str, Any] = measure(function)
+            results[f"{name}@{scale}x"] = result
+            print(f"{name}@{scale}x: {result['median_ms']} ms ({result['relative']} calibrations)", file=sys.stderr)
+
+    calibrations: list[float] = [result["calibration_ms"] for result in results.values()]
+    calibration_ms: float = round(statistics.median(calibrations), 3) if calibrations else 0.0
+    print(f"calibration: {calibration_ms} ms", file=sys.stderr)
+    return results, calibration_ms
+
+
+def compare(results: dict[str, Any], baselines: dict[str, float], calibration_ms: float, threshold: float) -> list[str]:
+    """
+    Find benchmarks whose calibrated median regressed past threshold times their baseline
+
+    Args:
+        results (dict[str, Any]): benchmark results
+        baselines (dict[str, float]): baseline median in calibration units, by benchmark
+        calibration_ms (float): this run's calibration median in milliseconds
+        threshold (float): allowed slowdown factor
+
+    Returns:
+        list[str]: regression descriptions
+    """
+    regressions: list[str] = []
+    for key, result in results.items():
+        baseline: float | None = baselines.get(key)
+        if baseline is None:
+            continue
+        expected_ms: float = baseline * calibration_ms  # The baseline on this machine
+        if result["relative"] > baseline * threshold and result["median_ms"] - expected_ms > NOISE_FLOOR_MS:
+            regressions.append(
+                f"{key}: {result['relative']} vs baseline {baseline} calibration units "
+                f"({result['median_ms']} ms, expected {round(expected_ms, 3)} ms)"
+            )
+    return regressions
+
+
+def load_baselines(path: str) -> dict[str, float]:
+    """
+    Read the baselines: benchmark medians in calibration units
+
+    Args:
+        path (str): baseline file
+
+    Returns:
+        dict[str, float]: baseline, by benchmark (empty if there is no file)
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)["relative"]
+
+
+def write_baselines(path: str, results: dict[str, Any], calibration_ms: float) -> None:
+    """
+    Replace the baselines with a full run's results
+
+    Args:
+        path (str): baseline file
+        results (dict[str, Any]): benchmark results
+        calibration_ms (float): calibration median in milliseconds, kept for reference
+    """
+    document: dict[str, Any] = {
+        "command": BASELINE_COMMAND,
+        "version": git_version(),
+        "calibration_ms": calibration_ms,
+        "relative": {key: result["relative"] for key, result in sorted(results.items())}
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(document, baseline_file, indent=2)
+        baseline_file.write("\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks against synthetic fixtures and in-memory fakes")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)), help="comma-separated multipliers")
+    parser.add_argument("--only", action="append", help="run benchmarks whose name starts with this (repeatable)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown vs baseline")
+    parser.add_argument("--baselines", default=BASELINE_PATH, help="baseline file")
+    parser.add_argument(
+        "--update-baselines", action="store_true", help="replace the baselines with a full run at the default scales"
+    )
+    parser.add_argument("--output", help="append the results as a JSON line to this file")
+    arguments = parser.parse_args(argv)
+
+    scales: tuple[int, ...] = tuple(int(scale) for scale in arguments.scales.split(",") if scale.strip())
+    if arguments.update_baselines and (arguments.only or scales != DEFAULT_SCALES):
+        parser.error(f"baselines come from a full run: {BASELINE_COMMAND}")
+    if arguments.update_baselines and git_version().endswith("-dirty"):  # Baselines must match a commit
+        parser.error("commit your changes first: baselines are recorded from a clean tree")
+    results, calibration_ms = run(scales, arguments.only)
+    print(json.dumps(results, indent=2))
+
+    if arguments.output:
+        os.makedirs(os.path.dirname(arguments.output) or ".", exist_ok=True)
+        with open(arguments.output, "a", encoding="utf-8") as output:
+            output.write(json.dumps(
+                {"version": git_version(), "calibration_ms": calibration_ms, "results": results}
+            ) + "\n")
+
+    if arguments.update_baselines:
+        write_baselines(arguments.baselines, results, calibration_ms)
+        return 0
+
+    regressions: list[str] = compare(results, load_baselines(arguments.baselines), calibration_ms, arguments.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
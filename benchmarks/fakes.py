@@ -0,0 +1,188 @@
+""" In-memory stand-ins for Azure Blob Storage and the ACS email client """
+from contextlib import contextmanager
+import hashlib
+import threading
+from typing import Any, Callable, Iterable, Iterator
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from src.mlb_today.services.blob_codec import EncodedBlob, decompress, encode_document, load_document
+from src.mlb_today.services.storage_service import BLOB_CONTAINER_NAME, payload_size
+
+
+class FakeStorageService:
+    """
+    StorageService with the same methods, backed by a dict. Reads parse the stored bytes every time,
+    as a cold invocation would, and count the bytes moved each way.
+    """
+    def __init__(self):
+        self.blobs: dict[tuple[str, str], bytes] = {}
+        self.bytes_read: int = 0
+        self.bytes_written: int = 0
+        self._lock = threading.Lock()
+
+    def _put(self, blob_filename: str, data: str | bytes, blob_container_name: str) -> None:
+        with self._lock:
+            self.blobs[(blob_container_name, blob_filename)] = data.encode("utf-8") if isinstance(data, str) else data
+            self.bytes_written += payload_size(data)
+
+    def _read(self, blob_filename: str, blob_container_name: str) -> bytes:
+        with self._lock:
+            data: bytes | None = self.blobs.get((blob_container_name, blob_filename))
+            if data is None:
+                raise ResourceNotFoundError(f"{blob_container_name}/{blob_filename} not found")
+            self.bytes_read += len(data)
+            return data
+
+    def etag(self, blob_filename: str, blob_container_name: str = BLOB_CONTAINER_NAME) -> str:
+        """ Content-derived ETag of a stored blob """
+        return f"\"{hashlib.md5(self._read(blob_filename, blob_container_name)).hexdigest()}\""
+
+    # Content settings aren't kept: reads detect compression from the magic bytes instead
+    def save_blob(
+            self,
+            blob_filename: str,
+            data: str | bytes,
+            blob_container_name: str = BLOB_CONTAINER_NAME,
+            settings: Any = None
+    ) -> None:
+        self._put(blob_filename, data, blob_container_name)
+
+    def save_blob_stream(
+            self,
+            blob_filename: str,
+            chunks: Iterable[bytes],
+            blob_container_name: str = BLOB_CONTAINER_NAME,
+            settings: Any = None
+    ) -> None:
+        self._put(blob_filename, b"".join(chunks), blob_container_name)
+
+    def save_blobs(
+            self, blobs: dict[str, str | bytes], blob_container_name: str = BLOB_CONTAINER_NAME, settings: Any = None
+    ) -> None:
+        for blob_filename, data in blobs.items():
+            self._put(blob_filename, data, blob_container_name)
+
+    def save_document(
+            self,
+            blob_filename: str,
+            document: Any,
+            blob_container_name: str = BLOB_CONTAINER_NAME,
+            stream: bool = False
+    ) -> None:
+        encoded: EncodedBlob = encode_document(document, stream=stream)
+        self._put(blob_filename, encoded.data, blob_container_name)
+
+    def save_documents(self, documents: dict[str, Any], blob_container_name: str = BLOB_CONTAINER_NAME) -> None:
+        for blob_filename, document in documents.items():
+            self.save_document(blob_filename, document, blob_container_name)
+
+    def read_blob_versioned(
+            self, blob_filename: str, blob_container_name: str = BLOB_CONTAINER_NAME
+    ) -> tuple[bytes, str] | None:
+        try:
+            data: bytes = self._read(blob_filename, blob_container_name)
+        except ResourceNotFoundError:
+            return None
+        return data, f"\"{hashlib.md5(data).hexdigest()}\""
+
+    def save_blob_if_unchanged(
+            self,
+            blob_filename: str,
+            data: str | bytes,
+            etag: str | None,
+            blob_container_name: str = BLOB_CONTAINER_NAME
+    ) -> bool:
+        with self._lock:  # Check and write atomically, like the conditional upload
+            current: bytes | None = self.blobs.get((blob_container_name, blob_filename))
+            current_etag: str | None = f"\"{hashlib.md5(current).hexdigest()}\"" if current is not None else None
+            if current_etag != etag:
+                return False
+            self.blobs[(blob_container_name, blob_filename)] = data.encode("utf-8") if isinstance(data, str) else data
+            self.bytes_written += payload_size(data)
+        return True
+
+    def append_blob(self, blob_filename: str, data: bytes, blob_container_name: str = BLOB_CONTAINER_NAME) -> None:
+        with self._lock:
+            key: tuple[str, str] = (blob_container_name, blob_filename)
+            self.blobs[key] = self.blobs.get(key, b"") + data
+            self.bytes_written += len(data)
+
+    def read_blob_tail(
+            self, blob_filename: str, offset: int, blob_container_name: str = BLOB_CONTAINER_NAME
+    ) -> tuple[bytes, int]:
+        with self._lock:
+            data: bytes | None = self.blobs.get((blob_container_name, blob_filename))
+            if data is None:
+                raise ResourceNotFoundError(f"{blob_container_name}/{blob_filename} not found")
+            tail: bytes = data[offset:]
+            self.bytes_read += len(tail)
+            return tail, len(data)
+
+    def get_blobs(self, blob_filenames: Iterable[str], blob_container_name: str = BLOB_CONTAINER_NAME) -> dict[str, bytes]:
+        return {blob_filename: self._read(blob_filename, blob_container_name) for blob_filename in blob_filenames}
+
+    def get_parsed_blob(
+            self,
+            blob_filename: str,
+            parser: Callable[[bytes], Any] = load_document,
+            blob_container_name: str = BLOB_CONTAINER_NAME
+    ) -> Any:
+        return parser(decompress(self._read(blob_filename, blob_container_name)))
+
+
+class FakePoller:
+    """ Completed ACS send operation """
+    def __init__(self, message_id: str):
+        self._result: dict[str, Any] = {"id": message_id, "status": "Succeeded", "error": None}
+
+    def result(self, timeout: float | None = None) -> dict[str, Any]:
+        return self._result
+
+    def done(self) -> bool:
+        return True
+
+    def status(self) -> str:
+        return "Succeeded"
+
+
+class FakeEmailClient:
+    """ ACS EmailClient that records messages in a sink instead of sending them """
+    sink: list[dict[str, Any]] = []
+
+    @classmethod
+    def from_connection_string(cls, connection_string: str, **kwargs) -> "FakeEmailClient":
+        return cls()
+
+    def begin_send(self, message: dict[str, Any], **kwargs) -> FakePoller:
+        self.sink.append(message)
+        return FakePoller(f"message-{len(self.sink)}")
+
+
+@contextmanager
+def fake_email_client(sink: list[dict[str, Any]] | None = None) -> Iterator[list[dict[str, Any]]]:
+    """
+    Route EmailService through FakeEmailClient, with placeholder ACS settings
+
+    Args:
+        sink (list[dict[str, Any]] | None): list to collect sent messages in
+
+    Yields:
+        list[dict[str, Any]]: the sink
+    """
+    import src.mlb_today.services.email_service as email_service
+
+    sink = [] if sink is None else sink
+    saved: dict[str, Any] = {
+        name: getattr(email_service, name)
+        for name in ("EmailClient", "ACS_CONNECTION_STRING", "ACS_SENDER_ADDRESS")
+    }
+    client_class: type = type("SinkEmailClient", (FakeEmailClient,), {"sink": sink})
+    email_service.EmailClient = client_class
+    email_service.ACS_CONNECTION_STRING = "endpoint=https://fake.communication.azure.com/;accesskey=ZmFrZQ=="
+    email_service.ACS_SENDER_ADDRESS = "DoNotReply@example.com"
+    try:
+        yield sink
+    finally:
+        for name, value in saved.items():
+            setattr(email_service, name, value)
@@ -0,0 +1,216 @@
+""" Synthetic Fangraphs leaderboard and MLB.com schedule payloads, shaped like the real APIs """
+from datetime import date, datetime, timedelta
+import random
+from typing import Any
+
+# Realistic single-day sizes; benchmarks multiply them by their scale
+GAMES_PER_DAY: int = 15
+BATTERS: int = 1000
+PITCHERS: int = 800
+EXTRA_COLUMNS: int = 40  # Fangraphs returns hundreds of columns we never read
+
+TEAMS: tuple[tuple[str, str, str, str], ...] = (
+    ("ARI", "Arizona Diamondbacks", "Phoenix", "AZ"), ("ATL", "Atlanta Braves", "Atlanta", "GA"),
+    ("BAL", "Baltimore Orioles", "Baltimore", "MD"), ("BOS", "Boston Red Sox", "Boston", "MA"),
+    ("CHC", "Chicago Cubs", "Chicago", "IL"), ("CWS", "Chicago White Sox", "Chicago", "IL"),
+    ("CIN", "Cincinnati Reds", "Cincinnati", "OH"), ("CLE", "Cleveland Guardians", "Cleveland", "OH"),
+    ("COL", "Colorado Rockies", "Denver", "CO"), ("DET", "Detroit Tigers", "Detroit", "MI"),
+    ("HOU", "Houston Astros", "Houston", "TX"), ("KC", "Kansas City Royals", "Kansas City", "MO"),
+    ("LAA", "Los Angeles Angels", "Anaheim", "CA"), ("LAD", "Los Angeles Dodgers", "Los Angeles", "CA"),
+    ("MIA", "Miami Marlins", "Miami", "FL"), ("MIL", "Milwaukee Brewers", "Milwaukee", "WI"),
+    ("MIN", "Minnesota Twins", "Minneapolis", "MN"), ("NYM", "New York Mets", "Queens", "NY"),
+    ("NYY", "New York Yankees", "Bronx", "NY"), ("ATH", "Athletics", "West Sacramento", "CA"),
+    ("PHI", "Philadelphia Phillies", "Philadelphia", "PA"), ("PIT", "Pittsburgh Pirates", "Pittsburgh", "PA"),
+    ("SD", "San Diego Padres", "San Diego", "CA"), ("SF", "San Francisco Giants", "San Francisco", "CA"),
+    ("SEA", "Seattle Mariners", "Seattle", "WA"), ("STL", "St. Louis Cardinals", "St. Louis", "MO"),
+    ("TB", "Tampa Bay Rays", "St. Petersburg", "FL"), ("TEX", "Texas Rangers", "Arlington", "TX"),
+    ("TOR", "Toronto Blue Jays", "Toronto", "ON"), ("WSH", "Washington Nationals", "Washington", "DC")
+)
+
+NATIONAL_NETWORKS: tuple[str, ...] = ("FOX", "FS1", "ESPN", "TBS", "MLBN", "Apple TV+", "Peacock")
+
+BATTER_ID_BASE: int = 600000
+PITCHER_ID_BASE: int = 700000
+
+
+def pitcher_id(number: int) -> int:
+    """ MLBAM id of the nth synthetic pitcher """
+    return PITCHER_ID_BASE + number
+
+
+def _batter_row(rng: random.Random, number: int, extra_columns: int) -> dict[str, Any]:
+    """ One Fangraphs batting leaderboard row """
+    plate_appearances: int = rng.randint(1, 700)
+    avg: float = rng.uniform(0.150, 0.340)
+    obp: float = avg + rng.uniform(0.040, 0.110)
+    slg: float = avg + rng.uniform(0.050, 0.300)
+    row: dict[str, Any] = {
+        "Name": f"<a href=\"statss.aspx?playerid={number}\">Batter {number}</a>",
+        "Team": f"<a href=\"leaders.aspx?team={number % 30}\">{TEAMS[number % 30][0]}</a>",
+        "PlayerName": f"Batter {number}",
+        "TeamNameAbb": TEAMS[number % 30][0],
+        "playerid": number,
+        "xMLBAMID": BATTER_ID_BASE + number,
+        "PA": plate_appearances,
+        "AVG": round(avg, 6),
+        "HR": rng.randint(0, 45),
+        "OBP": round(obp, 6),
+        "SLG": round(slg, 6),
+        "OPS": round(obp + slg, 6),
+        "BABIP": round(rng.uniform(0.220, 0.380), 6),
+        "K%": round(rng.uniform(0.08, 0.35), 6),
+        "WAR": round(rng.uniform(-1.5, 9.0), 6)
+    }
+    for column in range(extra_columns):
+        row[f"Stat{column}"] = round(rng.random() * 100, 6)
+    return row
+
+
+def _pitcher_row(rng: random.Random, number: int, extra_columns: int) -> dict[str, Any]:
+    """ One Fangraphs pitching leaderboard row """
+    row: dict[str, Any] = {
+        "Name": f"<a href=\"statss.aspx?playerid={number}\">Pitcher {number}</a>",
+        "Team": f"<a href=\"leaders.aspx?team={number % 30}\">{TEAMS[number % 30][0]}</a>",
+        "PlayerName": f"Pitcher {number}",
+        "TeamNameAbb": TEAMS[number % 30][0],
+        "playerid": number,
+        "xMLBAMID": pitcher_id(number),
+        "IP": round(rng.uniform(0.1, 200.0), 1),
+        "W": rng.randint(0, 18),
+        "L": rng.randint(0, 14),
+        "ERA": round(rng.uniform(1.5, 7.5), 6),
+        "xFIP": round(rng.uniform(2.5, 6.0), 6),
+        "K%": round(rng.uniform(0.12, 0.38), 6),
+        "WAR": round(rng.uniform(-1.0, 7.0), 6)
+    }
+    for column in range(extra_columns):
+        row[f"Stat{column}"] = round(rng.random() * 100, 6)
+    return row
+
+
+def fangraphs_leaderboard(
+        stats_type: str, players: int, extra_columns: int = EXTRA_COLUMNS, seed: int = 0
+) -> dict[str, Any]:
+    """
+    Fangraphs leaderboard response, sorted by WAR like the ingest requests it
+
+    Args:
+        stats_type (str): "bat" or "pit"
+        players (int): rows
+        extra_columns (int): unused stat columns per row, on top of the ones we read
+        seed (int): random seed
+
+    Returns:
+        dict[str, Any]: response body with "data" and "totalCount"
+    """
+    rng: random.Random = random.Random(seed)
+    make_row = _batter_row if stats_type == "bat" else _pitcher_row
+    rows: list[dict[str, Any]] = [make_row(rng, number, extra_columns) for number in range(players)]
+    rows.sort(key=lambda row: row["WAR"], reverse=True)
+    return {"data": rows, "totalCount": players}
+
+
+def _broadcasts(rng: random.Random, away: str, home: str) -> list[dict[str, Any]]:
+    """ Broadcast list for one game: home and away TV and radio, sometimes national TV """
+    broadcasts: list[dict[str, Any]] = [
+        {"id": rng.randint(1, 9999), "name": f"{home} TV", "type": "TV", "callSign": f"{home}-TV",
+         "homeAway": "home", "isNational": False, "language": "en"},
+        {"id": rng.randint(1, 9999), "name": f"{away} TV", "type": "TV", "callSign": f"{away}-TV",
+         "homeAway": "away", "isNational": False, "language": "en"},
+        {"id": rng.randint(1, 9999), "name": f"{home} Radio", "type": "AM", "callSign": f"{home}-AM",
+         "homeAway": "home", "isNational": False, "language": "en"},
+        {"id": rng.randint(1, 9999), "name": f"{away} Radio", "type": "FM", "callSign": f"{away}-FM",
+         "homeAway": "away", "isNational": False, "language": "en"}
+    ]
+    if rng.random() < 0.3:
+        network: str = rng.choice(NATIONAL_NETWORKS)
+        for home_away in ("home", "away"):  # National games are listed once per side
+            broadcasts.append({"id": rng.randint(1, 9999), "name": network, "type": "TV", "callSign": network,
+                               "homeAway": home_away, "isNational": True, "language": "en"})
+    if rng.random() < 0.2:
+        broadcasts.append({"id": rng.randint(1, 9999), "name": "MLB.TV", "type": "TV", "callSign": "MLBTV",
+                           "homeAway": "", "isNational": False, "language": "es"})
+    return broadcasts
+
+
+def _schedule_side(rng: random.Random, team: int, pitchers: int) -> dict[str, Any]:
+    """ One team in a scheduled game, with a probable pitcher most of the time """
+    abbreviation, name, _, _ = TEAMS[team % 30]
+    wins: int = rng.randint(30, 100)
+    losses: int = rng.randint(30, 100)
+    side: dict[str, Any] = {
+        "team": {"id": 108 + team % 30, "name": name, "abbreviation": abbreviation, "link": f"/api/v1/teams/{team}"},
+        "leagueRecord": {"wins": wins, "losses": losses, "pct": f"{wins / (wins + losses):.3f}"},
+        "splitSquad": False,
+        "seriesNumber": rng.randint(1, 52)
+    }
+    if rng.random() < 0.9:  # Some starters are still TBD
+        number: int = rng.randrange(pitchers)
+        side["probablePitcher"] = {"id": pitcher_id(number), "fullName": f"Pitcher {number}",
+                                   "link": f"/api/v1/people/{pitcher_id(number)}"}
+    return side
+
+
+def _schedule_game(rng: random.Random, day: date, number: int, pitchers: int, game_number: int = 1) -> dict[str, Any]:
+    """ One game of an MLB.com schedule, hydrated like the probables request """
+    away: int = (number * 2) % 30
+    home: int = (number * 2 + 1) % 30
+    start: datetime = datetime(day.year, day.month, day.day, 17 + number % 6, 5)
+    if game_number == 2:
+        start += timedelta(hours=4)
+    abbreviation, name, city, state = TEAMS[home]
+    return {
+        "gamePk": 700000 + day.toordinal() % 1000 * 100 + number * 2 + game_number,
+        "gameType": "R",
+        "season": str(day.year),
+        "gameDate": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "officialDate": day.isoformat(),
+        "status": {"abstractGameState": "Preview", "detailedState": "Scheduled", "statusCode": "S"},
+        "teams": {
+            "away": _schedule_side(rng, away, pitchers),
+            "home": _schedule_side(rng, home, pitchers)
+        },
+        "venue": {
+            "id": 1 + home,
+            "name": f"{name} Park",
+            "location": {"city": city, "state": state, "stateAbbrev": state, "country": "USA"}
+        },
+        "broadcasts": _broadcasts(rng, TEAMS[away][0], abbreviation),
+        "doubleHeader": "Y" if game_number == 2 else "N",
+        "gameNumber": game_number,
+        "dayNight": "night" if start.hour >= 17 else "day"
+    }
+
+
+def mlb_schedule(
+        games: int, day: date | None = None, pitchers: int = PITCHERS, doubleheaders: int = 0, seed: int = 0
+) -> dict[str, Any]:
+    """
+    MLB.com schedule response for one date
+
+    Args:
+        games (int): games on the date, not counting second games of doubleheaders
+        day (date | None): date (default 2025-07-04)
+        pitchers (int): size of the pitcher pool probable pitchers are drawn from
+        doubleheaders (int): games that get a second game the same day
+        seed (int): random seed
+
+    Returns:
+        dict[str, Any]: response body with one entry in "dates", or none if there are no games
+    """
+    rng: random.Random = random.Random(seed)
+    day = day or date(2025, 7, 4)
+    slate: list[dict[str, Any]] = []
+    for number in range(games):
+        slate.append(_schedule_game(rng, day, number, pitchers))
+        if number < doubleheaders:
+            slate[-1]["doubleHeader"] = "Y"
+            slate.append(_schedule_game(rng, day, number, pitchers, game_number=2))
+
+    if not slate:
+        return {"totalItems": 0, "totalGames": 0, "dates": []}
+    return {
+        "totalItems": len(slate),
+        "totalGames": len(slate),
+        "dates": [{"date": day.isoformat(), "totalItems": len(slate), "totalGames": len(slate), "games": slate}]
+    }
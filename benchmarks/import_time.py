@@ -0,0 +1,108 @@
+""" Cold-start import profile for function_app, built on python -X importtime, with an enforced budget """
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Any
+
+# Heavy SDKs the blueprints must only import inside function bodies
+DEFERRED_MODULES: tuple[str, ...] = (
+    "azure.communication.email",
+    "azure.storage.blob",
+    "jinja2",
+    "requests"
+)
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def profile_imports(module: str = "function_app") -> list[dict[str, Any]]:
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Args:
+        module (str): module to import
+
+    Returns:
+        list[dict[str, Any]]: one record per imported module, with self/cumulative microseconds and depth
+    """
+    environment: dict[str, str] = dict(os.environ)
+    environment.setdefault("LOG_DIRECTORY", tempfile.gettempdir())  # logger.py needs a log directory
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=environment, check=False
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+
+    records: list[dict[str, Any]] = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append({
+                "module": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": len(indent) // 2
+            })
+    return records
+
+
+def top_level_costs(records: list[dict[str, Any]]) -> dict[str, int]:
+    """
+    Total self time per top-level package (azure.* split one level further)
+
+    Args:
+        records (list[dict[str, Any]]): import records
+
+    Returns:
+        dict[str, int]: microseconds, by package
+    """
+    costs: dict[str, int] = {}
+    for record in records:
+        parts: list[str] = record["module"].split(".")
+        if parts[0] == "src":  # Our own modules, e.g. src.mlb_today.services.storage_service
+            package: str = ".".join(parts[:4])
+        elif parts[0] == "azure":  # One entry per SDK
+            package = ".".join(parts[:2])
+        else:
+            package = parts[0]
+        costs[package] = costs.get(package, 0) + record["self_us"]
+    return dict(sorted(costs.items(), key=lambda item: item[1], reverse=True))
+
+
+def main() -> int:
+    """ Print the import profile and return a non-zero exit code if the budget is exceeded """
+    parser = argparse.ArgumentParser(description="Report and enforce the function_app cold-start import budget")
+    parser.add_argument("--module", default="function_app")
+    parser.add_argument("--budget-ms", type=float, default=400.0, help="fail if the import takes longer")
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    arguments = parser.parse_args()
+
+    records: list[dict[str, Any]] = profile_imports(arguments.module)
+    total_ms: float = next(r["cumulative_us"] for r in records if r["module"] == arguments.module) / 1000
+
+    print(f"import {arguments.module}: {total_ms:.1f} ms (budget {arguments.budget_ms:.0f} ms)")
+    print(f"{'package':<48} {'self ms':>9}")
+    for package, microseconds in list(top_level_costs(records).items())[:arguments.top]:
+        print(f"{package:<48} {microseconds / 1000:>9.1f}")
+
+    failures: list[str] = []
+    imported: set[str] = {record["module"] for record in records}
+    for module in DEFERRED_MODULES:
+        if module in imported:
+            failures.append(f"{module} is imported at startup; import it inside the function that needs it")
+    if total_ms > arguments.budget_ms:
+        failures.append(f"import {arguments.module} took {total_ms:.1f} ms, over the {arguments.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
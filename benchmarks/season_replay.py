@@ -0,0 +1,411 @@
+""" Replay a season of dates through the functions in-process, against synthetic fixtures and in-memory fakes """
+import argparse
+import asyncio
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, timedelta, tzinfo
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+os.environ.setdefault("METRICS_EXPORTER", "none")  # Keep the replay's own timings free of metrics file writes
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+for name, value in (("BLOB_CONTAINER_NAME", "stats"), ("EMAIL_BLOB_CONTAINER_NAME", "email")):
+    os.environ.setdefault(name, value)
+for name in ("SCHEDULE_CRON", "BATTING_CRON", "PITCHING_CRON", "PROBABLES_POLL_CRON"):
+    os.environ.setdefault(name, "0 0 12 * * *")  # Never fires; the replay calls the functions itself
+
+from benchmarks.bench_render import git_version
+from benchmarks.fakes import FakeStorageService, fake_email_client
+from benchmarks.fixtures import BATTERS, GAMES_PER_DAY, PITCHERS, fangraphs_leaderboard, mlb_schedule
+import src.mlb_today.config as config
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+SEASON_START: date = date(2025, 3, 27)
+SEASON_END: date = date(2025, 9, 28)
+ALL_STAR_BREAK: tuple[date, date] = (date(2025, 7, 14), date(2025, 7, 17))
+EASTERN: ZoneInfo = ZoneInfo("America/New_York")
+
+# Simulated Eastern time each function runs at
+STAGE_TIMES: dict[str, tuple[int, int]] = {
+    "schedule": (8, 0), "batting": (9, 0), "pitching": (9, 5), "probables_poll": (9, 10), "probables": (12, 35),
+    "email": (12, 36)
+}
+
+
+class SeasonFixtures:
+    """ Deterministic schedules and Fangraphs leaderboards for every day of a simulated season """
+    def __init__(self, start: date = SEASON_START, end: date = SEASON_END, seed: int = 0):
+        self.start = start
+        self.end = end
+        self.seed = seed
+        # Per-instance caches of recent days; functools.lru_cache on a method would keep every instance alive
+        self._schedules: dict[date, dict[str, Any]] = {}
+        self._leaderboards: dict[tuple[str, date], bytes] = {}
+
+    @staticmethod
+    def _cached(cache: dict[Any, Any], key: Any, size: int, build: Callable[[], Any]) -> Any:
+        """ Helper method to look up or build a value, dropping the oldest entry past size """
+        if key not in cache:
+            cache[key] = build()
+            if len(cache) > size:
+                del cache[next(iter(cache))]
+        return cache[key]
+
+    def slate(self, day: date) -> tuple[int, int]:
+        """
+        Games and doubleheaders on a day: none over the All-Star break, light Mondays and Thursdays,
+        and doubleheaders to make up rainouts, mostly in September
+
+        Args:
+            day (date): simulated date
+
+        Returns:
+            tuple[int, int]: games, of which this many are doubleheaders
+        """
+        if ALL_STAR_BREAK[0] <= day <= ALL_STAR_BREAK[1] or not self.start <= day <= self.end:
+            return 0, 0
+        rng: random.Random = random.Random(self.seed * 100003 + day.toordinal())
+        games: int = rng.randint(8, 11) if day.weekday() in (0, 3) else GAMES_PER_DAY
+        doubleheaders: int = 0
+        if day.month == 9:
+            doubleheaders = rng.choice((0, 0, 1, 1, 2))
+        elif rng.random() < 0.05:
+            doubleheaders = 1
+        return games, doubleheaders
+
+    def progress(self, day: date) -> float:
+        """ Fraction of the season played by a day """
+        return min(1.0, max(0.0, (day - self.start).days / max(1, (self.end - self.start).days)))
+
+    def schedule(self, day: date) -> dict[str, Any]:
+        """ MLB.com schedule response for one day """
+        def build() -> dict[str, Any]:
+            games, doubleheaders = self.slate(day)
+            return mlb_schedule(games, day=day, doubleheaders=doubleheaders, seed=self.seed + day.toordinal())
+        return self._cached(self._schedules, day, 8, build)
+
+    def schedule_range(self, start: date, end: date) -> dict[str, Any]:
+        """ MLB.com schedule response for a date range, one "dates" entry per day with games """
+        dates: list[dict[str, Any]] = []
+        day: date = start
+        while day <= end:
+            dates.extend(self.schedule(day)["dates"])
+            day += timedelta(days=1)
+        total: int = sum(entry["totalGames"] for entry in dates)
+        return {"totalItems": total, "totalGames": total, "dates": dates}
+
+    def leaderboard_bytes(self, stats_type: str, day: date) -> bytes:
+        """ Fangraphs leaderboard response body for a day; the player pool grows as the season goes on """
+        def build() -> bytes:
+            full: int = BATTERS if stats_type == "bat" else PITCHERS
+            players: int = int(full * (0.35 + 0.65 * self.progress(day)))
+            response: dict[str, Any] = fangraphs_leaderboard(stats_type, players, seed=self.seed + day.toordinal())
+            return json.dumps(response).encode("utf-8")
+        return self._cached(self._leaderboards, (stats_type, day), 4, build)
+
+
+class SimulatedClock:
+    """ Current simulated time, read by the functions through SimulatedDatetime """
+    now: datetime = datetime(SEASON_START.year, SEASON_START.month, SEASON_START.day, tzinfo=EASTERN)
+
+    @classmethod
+    def set(cls, day: date, hour: int, minute: int) -> None:
+        cls.now = datetime(day.year, day.month, day.day, hour, minute, tzinfo=EASTERN)
+
+
+class SimulatedDatetime(datetime):
+    """ datetime whose now() is the simulated clock """
+    @classmethod
+    def now(cls, tz: tzinfo | None = None) -> datetime:
+        current: datetime = SimulatedClock.now
+        return current.astimezone(tz) if tz else current.astimezone().replace(tzinfo=None)
+
+
+def select_fields(value: Any, fields: set[str]) -> Any:
+    """ Keep only the named keys at any depth, like statsapi's fields parameter """
+    if isinstance(value, dict):
+        return {key: select_fields(item, fields) for key, item in value.items() if key in fields}
+    if isinstance(value, list):
+        return [select_fields(item, fields) for item in value]
+    return value
+
+
+class ReplayHttpClient:
+    """ HttpClient stand-in serving the simulated day's fixtures, counting the bytes it serves """
+    def __init__(self, fixtures: SeasonFixtures):
+        self.fixtures = fixtures
+        self.day: date = fixtures.start
+        self.bytes_served: int = 0
+
+    def get_json(self, url: str, params: dict[str, Any] | None = None) -> Any:
+        params = params or {}
+        if "stats" in params:  # Fangraphs leaderboard
+            body: bytes = self.fixtures.leaderboard_bytes(params["stats"], self.day)
+            self.bytes_served += len(body)
+            return json.loads(body)
+
+        start: date = date.fromisoformat(params.get("startDate") or self.day.isoformat())  # MLB.com schedule
+        end: date = date.fromisoformat(params.get("endDate") or start.isoformat())
+        schedule: dict[str, Any] = self.fixtures.schedule_range(start, end)
+        if params.get("fields"):
+            schedule = select_fields(schedule, set(params["fields"].split(",")))
+        self.bytes_served += len(json.dumps(schedule))
+        return schedule
+
+    def iter_bytes(self, url: str, params: dict[str, Any] | None = None, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        body: bytes = self.fixtures.leaderboard_bytes((params or {}).get("stats", "bat"), self.day)
+        for start in range(0, len(body), chunk_size):
+            self.bytes_served += len(body[start:start + chunk_size])
+            yield body[start:start + chunk_size]
+
+
+class InvocationContext:
+    """ Minimal func.Context """
+    def __init__(self, function_name: str, day: date):
+        self.function_name = function_name
+        self.invocation_id = f"replay-{day.isoformat()}-{function_name}"
+
+
+class ReplayBlob:
+    """ Minimal func.InputStream over a stored blob """
+    def __init__(self, name: str, data: bytes):
+        self.name = name
+        self._data = data
+
+    def read(self, size: int = -1) -> bytes:
+        return self._data
+
+
+@contextmanager
+def replay_environment(fixtures: SeasonFixtures) -> Iterator[dict[str, Any]]:
+    """
+    Point the services at the fixtures and fakes: HTTP client, blob storage, app settings, ACS and the clock
+
+    Args:
+        fixtures (SeasonFixtures): season fixtures
+
+    Yields:
+        dict[str, Any]: the http client, storage and email sink
+    """
+    import src.mlb_today.blueprints.bp_batting as bp_batting
+    import src.mlb_today.blueprints.bp_email as bp_email
+    import src.mlb_today.blueprints.bp_pitching as bp_pitching
+    import src.mlb_today.blueprints.bp_probables as bp_probables
+    import src.mlb_today.blueprints.bp_schedule as bp_schedule
+    import src.mlb_today.services.email_ledger_service as email_ledger_service
+    import src.mlb_today.services.run_schedule_service as run_schedule_service
+    import src.mlb_today.services.schedule_cache_service as schedule_cache_service
+    import src.mlb_today.services.http_client as http_client
+    import src.mlb_today.services.storage_service as storage_service
+    import src.mlb_today.services.probables_service  # noqa: F401 - import with the real StorageService in
+    import src.mlb_today.services.archive_service  # noqa: F401 - as snapshot_service below
+    import src.mlb_today.services.snapshot_service  # noqa: F401 - annotations, before it is replaced below
+
+    http: ReplayHttpClient = ReplayHttpClient(fixtures)
+    storage: FakeStorageService = FakeStorageService()
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(http_client, "_http_client", http))
+        for module in (
+                bp_batting, bp_email, bp_pitching, bp_probables, bp_schedule, email_ledger_service,
+                run_schedule_service, schedule_cache_service
+        ):
+            stack.enter_context(mock.patch.object(module, "datetime", SimulatedDatetime))
+        real_storage_service: type = storage_service.StorageService
+        for module in list(sys.modules.values()):  # Every module that bound the class, for services' defaults
+            if getattr(module, "__name__", "").startswith("src.mlb_today") and \
+                    getattr(module, "StorageService", None) is real_storage_service:
+                stack.enter_context(mock.patch.object(module, "StorageService", lambda: storage))
+        stack.enter_context(mock.patch.object(bp_email, "EMAIL_RECIPIENTS", "reader@example.com"))
+        stack.enter_context(mock.patch.object(bp_email, "DISABLE_EMAIL_SENDING", False))
+        sink: list[dict[str, Any]] = stack.enter_context(fake_email_client())
+        yield {"http": http, "storage": storage, "sink": sink}
+
+
+def peak_rss_mb() -> float | None:
+    """ Process peak resident set size so far, in MB """
+    if resource is None:
+        return None
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)  # Bytes on macOS, KB elsewhere
+
+
+def replay_day(day: date, functions: dict[str, Callable], replay: dict[str, Any], trace_memory: bool) -> dict[str, Any]:
+    """
+    Run one simulated day: schedule, batting and pitching ingest, probables, then the email blob trigger
+
+    Args:
+        day (date): simulated date
+        functions (dict[str, Callable]): function entry points, by function name
+        replay (dict[str, Any]): replay environment
+        trace_memory (bool): also report the peak Python heap for the day
+
+    Returns:
+        dict[str, Any]: day report
+    """
+    http: ReplayHttpClient = replay["http"]
+    storage: FakeStorageService = replay["storage"]
+    sink: list[dict[str, Any]] = replay["sink"]
+    http.day = day
+    for stats_type in ("bat", "pit"):  # Generate the day's fixtures before anything is timed
+        http.fixtures.leaderboard_bytes(stats_type, day)
+    http.fixtures.schedule(day)
+
+    bytes_before: tuple[int, int, int] = (http.bytes_served, storage.bytes_read, storage.bytes_written)
+    messages_before: int = len(sink)
+    if trace_memory:
+        tracemalloc.reset_peak()
+
+    stages: dict[str, float] = {}
+    errors: dict[str, str] = {}
+
+    def run_stage(name: str, invoke: Callable[[], Any]) -> None:
+        SimulatedClock.set(day, *STAGE_TIMES[name])
+        start: float = time.perf_counter()
+        try:
+            invoke()
+        except Exception as err:  # The Functions host logs a failed invocation and carries on; so do we
+            errors[name] = f"{type(err).__name__}: {err}"
+        stages[name] = round((time.perf_counter() - start) * 1000, 3)
+
+    email_blob_key: tuple[str, str] = (config.EMAIL_BLOB_CONTAINER_NAME, "email_data.json")
+    storage.blobs.pop(email_blob_key, None)  # The email trigger only fires when probables writes today's blob
+
+    run_stage("schedule", lambda: functions["earliest_game_time"](None, InvocationContext("earliest_game_time", day)))
+    run_stage("batting", lambda: functions["get_batting_stats"](None, InvocationContext("get_batting_stats", day)))
+    run_stage("pitching", lambda: functions["get_pitching_stats"](None, InvocationContext("get_pitching_stats", day)))
+    run_stage("probables_poll", lambda: asyncio.run(  # A timer tick before the scheduled run time: a no-op
+        functions["get_probables"](None, InvocationContext("get_probables", day))
+    ))
+    run_stage("probables", lambda: asyncio.run(
+        functions["get_probables"](None, InvocationContext("get_probables", day))
+    ))
+    email_data: bytes | None = storage.blobs.get(email_blob_key)
+    if email_data is not None:
+        run_stage("email", lambda: functions["create_and_send_email"](
+            ReplayBlob(f"{email_blob_key[0]}/{email_blob_key[1]}", email_data),
+            InvocationContext("create_and_send_email", day)
+        ))
+
+    games, doubleheaders = http.fixtures.slate(day)
+    rendered: list[str] = [message["content"]["html"] for message in sink[messages_before:]]
+    report: dict[str, Any] = {
+        "date": day.isoformat(),
+        "games": games + doubleheaders,
+        "doubleheaders": doubleheaders,
+        "wall_ms": round(sum(stages.values()), 3),
+        "stages_ms": stages,
+        "http_bytes": http.bytes_served - bytes_before[0],
+        "blob_bytes_read": storage.bytes_read - bytes_before[1],
+        "blob_bytes_written": storage.bytes_written - bytes_before[2],
+        "emails": len(rendered),
+        "render_bytes": sum(len(html.encode("utf-8")) for html in rendered),
+        "peak_rss_mb": peak_rss_mb(),
+        "errors": errors
+    }
+    if trace_memory:
+        report["peak_heap_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+    return report
+
+
+def summarize(days: list[dict[str, Any]]) -> dict[str, Any]:
+    """ Season totals and the heaviest days """
+    if not days:
+        return {"days": 0}
+    slowest: dict[str, Any] = max(days, key=lambda report: report["wall_ms"])
+    largest: dict[str, Any] = max(days, key=lambda report: report["render_bytes"])
+    return {
+        "days": len(days),
+        "games": sum(report["games"] for report in days),
+        "doubleheaders": sum(report["doubleheaders"] for report in days),
+        "wall_ms": round(sum(report["wall_ms"] for report in days), 3),
+        "http_bytes": sum(report["http_bytes"] for report in days),
+        "blob_bytes_read": sum(report["blob_bytes_read"] for report in days),
+        "blob_bytes_written": sum(report["blob_bytes_written"] for report in days),
+        "emails": sum(report["emails"] for report in days),
+        "failed_days": [report["date"] for report in days if report["errors"]],
+        "slowest_day": {"date": slowest["date"], "wall_ms": slowest["wall_ms"]},
+        "largest_email": {"date": largest["date"], "render_bytes": largest["render_bytes"]},
+        "peak_rss_mb": days[-1]["peak_rss_mb"]
+    }
+
+
+def replay(fixtures: SeasonFixtures, start: date, end: date, trace_memory: bool = False) -> Iterator[dict[str, Any]]:
+    """
+    Replay every date from start to end
+
+    Args:
+        fixtures (SeasonFixtures): season fixtures
+        start (date): first simulated date
+        end (date): last simulated date
+        trace_memory (bool): also report the peak Python heap per day (slower)
+
+    Returns:
+        Iterator[dict[str, Any]]: one report per day
+    """
+    from function_app import app  # Imported here so the environment defaults above apply first
+
+    functions: dict[str, Callable] = {
+        function.get_function_name(): function.get_user_function() for function in app.get_functions()
+    }
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with replay_environment(fixtures) as environment:
+            day: date = start
+            while day <= end:
+                yield replay_day(day, functions, environment, trace_memory)
+                day += timedelta(days=1)
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a season through the functions against local fixtures")
+    parser.add_argument("--start", type=date.fromisoformat, default=SEASON_START, help="first date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=SEASON_END, help="last date (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, help="stop after this many dates")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true", help="report each day's peak Python heap (slower)")
+    parser.add_argument("--output", help="write one JSON line per day, then the summary, to this file")
+    arguments = parser.parse_args(argv)
+
+    end: date = arguments.end
+    if arguments.days:
+        end = min(end, arguments.start + timedelta(days=arguments.days - 1))
+
+    fixtures: SeasonFixtures = SeasonFixtures(SEASON_START, SEASON_END, arguments.seed)
+    days: list[dict[str, Any]] = []
+    for report in replay(fixtures, arguments.start, end, arguments.trace_memory):
+        days.append(report)
+        print(
+            f"{report['date']}: {report['games']:>2} games, {report['wall_ms']:>9.1f} ms, "
+            f"{report['render_bytes']:>7} email bytes, peak RSS {report['peak_rss_mb']} MB"
+            + "".join(f", {stage} failed ({error})" for stage, error in report["errors"].items()),
+            file=sys.stderr
+        )
+
+    summary: dict[str, Any] = {"version": git_version(), **summarize(days)}
+    print(json.dumps(summary, indent=2))
+    if arguments.output:
+        os.makedirs(os.path.dirname(arguments.output) or ".", exist_ok=True)
+        with open(arguments.output, "w", encoding="utf-8") as output:
+            for report in days:
+                output.write(json.dumps(report) + "\n")
+            output.write(json.dumps({"summary": summary}) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ from src.mlb_today.blueprints.bp_batting import bp as bp_batting
 from src.mlb_today.blueprints.bp_probables import bp as bp_probables
 from src.mlb_today.blueprints.bp_schedule import bp as bp_schedule
 from src.mlb_today.blueprints.bp_email import bp as bp_email
+from src.mlb_today.blueprints.bp_api import bp as bp_api
 
 app = func.FunctionApp()
 
@@ -14,3 +15,4 @@ app.register_blueprint(bp_batting)
 app.register_blueprint(bp_probables)
 app.register_blueprint(bp_schedule)
 app.register_blueprint(bp_email)
+app.register_blueprint(bp_api)
@@ -0,0 +1,132 @@
+""" Azure Functions serving today's matchups and leaderboards as JSON """
+import json
+from functools import cache
+from typing import TYPE_CHECKING, Callable
+
+import azure.functions as func
+
+import src.mlb_today.config as config
+from src.mlb_today.logger import bind_invocation
+from src.mlb_today.metrics import timed
+
+if TYPE_CHECKING:
+    from src.mlb_today.read_api import ApiResponse, ReadApi
+
+bp = func.Blueprint()
+
+API_CACHE_TTL_SECONDS: float = config.API_CACHE_TTL_SECONDS
+
+
+@cache
+def get_read_api() -> "ReadApi":
+    """ Read API whose blob and response caches live as long as the worker """
+    from src.mlb_today.read_api import ReadApi  # Deferred so the timer functions don't load it
+    return ReadApi()
+
+
+def _error(status_code: int, message: str) -> func.HttpResponse:
+    """ Helper function for a JSON error response """
+    return func.HttpResponse(
+        json.dumps({"error": message}), status_code=status_code, mimetype="application/json"
+    )
+
+
+def respond(req: func.HttpRequest, view: Callable[[], "ApiResponse"]) -> func.HttpResponse:
+    """
+    Serve a read API view with conditional GET and gzip support
+
+    Args:
+        req (func.HttpRequest): HTTP request
+        view (Callable[[], ApiResponse]): view to serve
+
+    Returns:
+        func.HttpResponse: 200 with the view, 304 if the client's copy is current, or a JSON error
+    """
+    from src.mlb_today.read_api import NotFound
+
+    try:
+        response: ApiResponse = view()
+    except NotFound as err:
+        return _error(404, str(err))
+
+    accept_encoding: str | None = req.headers.get("Accept-Encoding")
+    headers: dict[str, str] = {
+        "ETag": response.etag_for(response.content_encoding(accept_encoding)),
+        # Private: responses are behind a function key, so shared caches mustn't store them
+        "Cache-Control": f"private, max-age={int(API_CACHE_TTL_SECONDS)}",
+        "Vary": "Accept-Encoding"
+    }
+    if response.matches(req.headers.get("If-None-Match")):
+        return func.HttpResponse(status_code=304, headers=headers)
+
+    body, content_encoding = response.encoded(accept_encoding)
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return func.HttpResponse(body, status_code=200, headers=headers, mimetype="application/json")
+
+
+@bp.function_name(name="api_games")
+@bp.route(route="games", methods=[func.HttpMethod.GET], auth_level=func.AuthLevel.FUNCTION)
+@timed("function.api_games")
+def api_games(req: func.HttpRequest, context: func.Context) -> func.HttpResponse:
+    """
+    Today's games, e.g. GET /api/games?fields=date,away.abbr,home.abbr
+
+    Args:
+        req (func.HttpRequest): HTTP request
+        context (func.Context): invocation context
+    """
+    bind_invocation(context)  # Tag this invocation's log records
+    return respond(req, lambda: get_read_api().games(req.params.get("fields")))
+
+
+@bp.function_name(name="api_game")
+@bp.route(route="games/{number:int}", methods=[func.HttpMethod.GET], auth_level=func.AuthLevel.FUNCTION)
+@timed("function.api_game")
+def api_game(req: func.HttpRequest, context: func.Context) -> func.HttpResponse:
+    """
+    One of today's games by its position in the email, e.g. GET /api/games/0
+
+    Args:
+        req (func.HttpRequest): HTTP request
+        context (func.Context): invocation context
+    """
+    bind_invocation(context)  # Tag this invocation's log records
+    try:
+        number: int = int(req.route_params.get("number", ""))
+    except ValueError:
+        return _error(400, "Game number must be an integer")
+    return respond(req, lambda: get_read_api().game(number, req.params.get("fields")))
+
+
+@bp.function_name(name="api_team")
+@bp.route(route="teams/{abbr}", methods=[func.HttpMethod.GET], auth_level=func.AuthLevel.FUNCTION)
+@timed("function.api_team")
+def api_team(req: func.HttpRequest, context: func.Context) -> func.HttpResponse:
+    """
+    A team's games today, e.g. GET /api/teams/NYY
+
+    Args:
+        req (func.HttpRequest): HTTP request
+        context (func.Context): invocation context
+    """
+    bind_invocation(context)  # Tag this invocation's log records
+    abbr: str = req.route_params.get("abbr", "")
+    return respond(req, lambda: get_read_api().team(abbr, req.params.get("fields")))
+
+
+@bp.function_name(name="api_leaders")
+@bp.route(route="leaders/{group}/{stat}", methods=[func.HttpMethod.GET], auth_level=func.AuthLevel.FUNCTION)
+@timed("function.api_leaders")
+def api_leaders(req: func.HttpRequest, context: func.Context) -> func.HttpResponse:
+    """
+    A leaderboard, e.g. GET /api/leaders/pitching/xFIP?fields=PlayerName,xFIP
+
+    Args:
+        req (func.HttpRequest): HTTP request
+        context (func.Context): invocation context
+    """
+    bind_invocation(context)  # Tag this invocation's log records
+    group: str = req.route_params.get("group", "")
+    stat: str = req.route_params.get("stat", "")
+    return respond(req, lambda: get_read_api().leaders(group, stat, req.params.get("fields")))
@@ -1,17 +1,18 @@
 """ Retrieve batting stats from Fangraphs """
 from datetime import datetime
-import json
 from typing import Any
 
 import azure.functions as func
 
 import src.mlb_today.config as config
-from src.mlb_today.services.fangraphs_service import FangraphsService
-from src.mlb_today.services.storage_service import StorageService
+from src.mlb_today.logger import bind_invocation, logger
+from src.mlb_today.metrics import timed
 
 bp: func.Blueprint = func.Blueprint()
 
 BATTING_CRON: str = config.BATTING_CRON
+BATTING_COLUMNS: list[str] = config.BATTING_COLUMNS
+BATTING_LEADERBOARDS: list[str] = config.BATTING_LEADERBOARDS
 
 
 # noinspection PyUnusedLocal
@@ -21,26 +22,67 @@ BATTING_CRON: str = config.BATTING_CRON
     schedule=BATTING_CRON,
     run_on_startup=False
 )
-def main(battingarg: func.TimerRequest) -> None:
+@timed("function.get_batting_stats")
+def main(battingarg: func.TimerRequest, context: func.Context) -> None:
     """
     Azure Function to retrieve batting stats from Fangraphs
 
     Args:
         battingarg (func.TimerRequest): timer trigger
+        context (func.Context): invocation context
     """
+    bind_invocation(context)  # Tag this invocation's log records
+
+    # Fangraphs client (requests), blob storage and the season archive
+    from src.mlb_today.services.archive_service import ArchiveService
+    from src.mlb_today.services.fangraphs_service import FangraphsService
+    from src.mlb_today.services.leaderboards import (
+        BATTING_LEADERBOARD_SPECS, BATTING_QUALIFIER, compute_leaderboards, select_specs
+    )
+    from src.mlb_today.services.snapshot_service import SnapshotService
+    from src.mlb_today.services.storage_service import StorageService
+
     fangraphs_service: FangraphsService = FangraphsService()  # Create FangraphsService instance
-    batting: dict[str, Any] = fangraphs_service.get_data(  # Get batting stats from Fangraphs
+    batting: dict[str, Any] | None = fangraphs_service.stream_data(  # Stream batting stats from Fangraphs
         position="all",
         stats_type="bat",
         year=datetime.now().strftime("%Y"),
+        columns=BATTING_COLUMNS,
         sort_dir="default",
         sort_stat="WAR"
     )
 
+    if not batting:  # If Fangraphs request failed, keep yesterday's blob
+        logger.error("Failed to retrieve batting stats from Fangraphs")
+        return
+    if not batting["rows"]:  # An empty leaderboard (outage, early preseason) mustn't replace yesterday's
+        logger.error("Fangraphs returned no batting stats; keeping the stored snapshot")
+        return
+
     storage_service: StorageService = StorageService()  # Create StorageService instance
-    storage_service.save_blob(  # Store batting stats in Azure Blob
+    snapshot_service: SnapshotService = SnapshotService(storage_service)  # Create SnapshotService instance
+    saved: bool = snapshot_service.save_snapshot(  # Store batting stats in Azure Blob, skipped if unchanged
         blob_filename="batting.json",
-        data=json.dumps(batting)
+        document=batting
     )
 
+    # Rebuilt even when the snapshot is unchanged: the leaderboard settings may have changed, or the last upload failed
+    leaderboards: dict[str, list[dict[str, Any]]] = compute_leaderboards(  # Rank every configured stat at once
+        document=batting,
+        specs=select_specs(BATTING_LEADERBOARDS, BATTING_LEADERBOARD_SPECS),
+        qualifier=BATTING_QUALIFIER
+    )
+    storage_service.save_document(  # Store leaderboards in Azure Blob
+        blob_filename="batting.leaders.json",
+        document=leaderboards
+    )
+
+    archive_service: ArchiveService = ArchiveService(storage_service)  # Create ArchiveService instance
+    try:  # Archive today's snapshot (if unchanged, only when today is missing); the email doesn't depend on it
+        archive_service.append_snapshot(
+            kind="batting", day=datetime.now().strftime("%Y-%m-%d"), document=batting, if_missing=not saved
+        )
+    except Exception as err:
+        logger.warning(f"Failed to archive batting stats: {err}")
+
     return
@@ -1,46 +1,41 @@
 """ Azure Function to send email """
 import json
-import os
 from datetime import datetime
+from functools import cache
+from typing import TYPE_CHECKING
 
 import azure.functions as func
-from jinja2 import Environment, FileSystemLoader, select_autoescape, Template
 
 import src.mlb_today.config as config
-from src.mlb_today.logger import logger
-from src.mlb_today.services.email_service import EmailService
+from src.mlb_today.logger import bind_invocation, logger
+from src.mlb_today.metrics import span, timed
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+    from src.mlb_today.composer import EmailComposer
 
 bp = func.Blueprint()
 
 DISABLE_EMAIL_SENDING: bool = config.DISABLE_EMAIL_SENDING
 
 EMAIL_RECIPIENTS: str = config.PROBABLES_TO_EMAIL_STR
+EMAIL_RECIPIENT_PREFERENCES: str | None = config.EMAIL_RECIPIENT_PREFERENCES
 EMAIL_BLOB_CONTAINER_NAME: str = config.EMAIL_BLOB_CONTAINER_NAME
 
 
-def format_time_ampm(iso_string: str) -> str:
-    """Jinja2 filter to convert an ISO datetime string to a 12-hour AM/PM format."""
-    if not iso_string:
-        return ""
-    try:
-        dt_object = datetime.fromisoformat(iso_string)
-        # Format to 12-hour with AM/PM
-        formatted_time = dt_object.strftime("%I:%M %p")
-        # Remove leading zero for hours like '02:40 PM' -> '2:40 PM'
-        if formatted_time.startswith('0'):
-            return formatted_time[1:]
-        return formatted_time
-    except (ValueError, TypeError):
-        return iso_string  # Return original string on error
-
-
-template_path: str = os.path.join(os.path.dirname(__file__), '..', 'templates')
-jinja_env: Environment = Environment(
-    loader=FileSystemLoader(template_path),
-    autoescape=select_autoescape(['html', 'xml'])
-)
+@cache
+def get_jinja_env() -> "Environment":
+    """ Jinja2 environment, created on first render: precompiled templates when built, else minified source """
+    from src.mlb_today.rendering import create_environment  # Deferred: jinja2 is only needed to render
+    return create_environment()
 
-jinja_env.filters['to_ampm'] = format_time_ampm
+
+@cache
+def get_composer() -> "EmailComposer":
+    """ Email composer whose fragment cache lives as long as the worker """
+    from src.mlb_today.composer import EmailComposer
+    return EmailComposer(get_jinja_env())
 
 
 @bp.blob_trigger(
@@ -50,26 +45,26 @@ jinja_env.filters['to_ampm'] = format_time_ampm
     path=f"{EMAIL_BLOB_CONTAINER_NAME}/{{name}}",
     connection="STORAGE_CONNECTION_STRING"
 )
-def create_and_send_email(emailblob: func.InputStream) -> None:
+@timed("function.create_and_send_email")
+def create_and_send_email(emailblob: func.InputStream, context: func.Context) -> None:
     """
     Triggers when a blob is created/updated, generates an HTML email body
     from a Jinja2 template, and sends the email.
     """
+    bind_invocation(context)  # Tag this invocation's log records
     logger.info(f"Blob trigger processed blob: {emailblob.name}")
 
+    # ACS email client, jinja2 rendering and the ledger's blob storage
+    from src.mlb_today.composer import parse_recipient_preferences
+    from src.mlb_today.rendering import prepare_email_data
+    from src.mlb_today.services.blob_codec import decompress, load_document
+    from src.mlb_today.services.email_ledger_service import EmailLedgerService, ledger_key
+    from src.mlb_today.services.email_service import EmailService
+
     if not DISABLE_EMAIL_SENDING:
 
         try:
-            blob_data_str: str = emailblob.read().decode()  # Convert blob bytes to string
-            email_data: dict[str, list[dict[str, str]]] = json.loads(blob_data_str)  # Convert JSON to dict
-
-            template: Template = jinja_env.get_template("email.jinja2")  # Load the Jinja2 template
-
-            html_body = template.render(  # Render the template with the data
-                probables=email_data.get("probables"),
-                batting=email_data.get("batting"),
-                pitching=email_data.get("pitching")
-            )
+            blob_data: bytes = decompress(emailblob.read())  # The trigger doesn't undo BLOB_COMPRESSION
 
             email_service = EmailService()  # Create an instance of EmailService
             to_recipients = email_service.create_email_recipients(EMAIL_RECIPIENTS)  # Create recipients
@@ -78,15 +73,44 @@ def create_and_send_email(emailblob: func.InputStream) -> None:
                 logger.warning("No email recipients configured. Skipping email send.")
                 return
 
-            subject = f"MLB Today for {datetime.now().strftime('%B %d, %Y')}"  # Create subject
-
-            email_service.send_email_with_acs(  # Send the email
-                subject=subject,
-                html_body=html_body,
-                to_recipients=to_recipients
-            )
-
-            logger.info("Successfully generated and sent email.")
+            # Skip data this recipient set already got, e.g. probables re-run or the trigger replayed
+            ledger = EmailLedgerService()
+            addresses = [recipient["address"] for recipient in to_recipients]
+            key = ledger_key(blob_data, addresses, EMAIL_RECIPIENT_PREFERENCES)
+            delivered = ledger.claim(key)  # Addresses an earlier, partly failed send reached
+            if delivered is None:
+                return
+            pending = [recipient for recipient in to_recipients if recipient["address"].lower() not in delivered]
+
+            try:
+                email_data: dict[str, list[dict[str, str]]] = load_document(blob_data)  # JSON or MessagePack to dict
+                preferences = parse_recipient_preferences(EMAIL_RECIPIENT_PREFERENCES)
+
+                with span("email.render") as render_span:
+                    # Fragments are rendered once; each distinct set of preferences only costs an assembly
+                    edition = get_composer().edition(prepare_email_data(email_data))
+                    bodies: dict[str, list[dict[str, str]]] = {}
+                    for recipient in pending:
+                        html_body = edition.assemble(preferences.get(recipient["address"].lower()))
+                        bodies.setdefault(html_body, []).append(recipient)
+                    render_span.add_bytes(sum(len(html_body.encode("utf-8")) for html_body in bodies))
+
+                subject = f"MLB Today for {datetime.now().strftime('%B %d, %Y')}"  # Create subject
+
+                results = email_service.send_personalized_with_acs(  # Send each body to its recipients
+                    subject=subject,
+                    bodies=list(bodies.items())
+                )
+
+                sent = sum(result.succeeded for result in results)
+                logger.info(f"Generated email and sent {sent} of {len(results)} messages.")
+                delivered.update(
+                    recipient["address"].lower()
+                    for result in results if result.succeeded for recipient in result.recipients
+                )
+            finally:
+                # Only the recipients who got it are recorded; a retry sends to the rest
+                ledger.complete(key, delivered, finished=all(address.lower() in delivered for address in addresses))
 
         except json.JSONDecodeError:  # Handle JSON decoding errors
             logger.error(f"Failed to parse JSON from blob: {emailblob.name}", exc_info=True)
@@ -1,17 +1,18 @@
 """ Retrieve pitching stats from Fangraphs """
 from datetime import datetime
-import json
 from typing import Any
 
 import azure.functions as func
 
 import src.mlb_today.config as config
-from src.mlb_today.services.fangraphs_service import FangraphsService
-from src.mlb_today.services.storage_service import StorageService
+from src.mlb_today.logger import bind_invocation, logger
+from src.mlb_today.metrics import timed
 
 bp: func.Blueprint = func.Blueprint()
 
 PITCHING_CRON: str = config.PITCHING_CRON
+PITCHING_COLUMNS: list[str] = config.PITCHING_COLUMNS
+PITCHING_LEADERBOARDS: list[str] = config.PITCHING_LEADERBOARDS
 
 
 # noinspection PyUnusedLocal
@@ -21,23 +22,64 @@ PITCHING_CRON: str = config.PITCHING_CRON
     schedule=PITCHING_CRON,
     run_on_startup=False
 )
-def main(pitchingarg: func.TimerRequest) -> None:
+@timed("function.get_pitching_stats")
+def main(pitchingarg: func.TimerRequest, context: func.Context) -> None:
     """
     Azure Function to retrieve pitching stats from Fangraphs
 
     Args:
         pitchingarg (func.TimerRequest): Timer Trigger
+        context (func.Context): invocation context
     """
+    bind_invocation(context)  # Tag this invocation's log records
+
+    # Fangraphs client (requests), blob storage and the season archive
+    from src.mlb_today.services.archive_service import ArchiveService
+    from src.mlb_today.services.fangraphs_service import FangraphsService
+    from src.mlb_today.services.leaderboards import (
+        PITCHING_LEADERBOARD_SPECS, PITCHING_QUALIFIER, compute_leaderboards, select_specs
+    )
+    from src.mlb_today.services.snapshot_service import SnapshotService
+    from src.mlb_today.services.storage_service import StorageService
+
     fangraphs_service: FangraphsService = FangraphsService()  # Create FangraphsService instance
-    pitching: dict[str, Any] = fangraphs_service.get_data(  # Get pitching stats from Fangraphs
+    pitching: dict[str, Any] | None = fangraphs_service.stream_data(  # Stream pitching stats from Fangraphs
         position="all",
         stats_type="pit",
         year=datetime.now().strftime("%Y"),
+        columns=PITCHING_COLUMNS,
         sort_dir="default",
         sort_stat="WAR")
 
+    if not pitching:  # If Fangraphs request failed, keep yesterday's blob
+        logger.error("Failed to retrieve pitching stats from Fangraphs")
+        return
+    if not pitching["rows"]:  # An empty leaderboard (outage, early preseason) mustn't replace yesterday's
+        logger.error("Fangraphs returned no pitching stats; keeping the stored snapshot")
+        return
+
     storage_service: StorageService = StorageService()  # Create StorageService instance
-    storage_service.save_blob(  # Store pitching stats in Azure Blob
+    snapshot_service: SnapshotService = SnapshotService(storage_service)  # Create SnapshotService instance
+    saved: bool = snapshot_service.save_snapshot(  # Store pitching stats in Azure Blob, skipped if unchanged
         blob_filename="pitching.json",
-        data=json.dumps(pitching)
+        document=pitching
     )
+
+    # Rebuilt even when the snapshot is unchanged: the leaderboard settings may have changed, or the last upload failed
+    leaderboards: dict[str, list[dict[str, Any]]] = compute_leaderboards(  # Rank every configured stat at once
+        document=pitching,
+        specs=select_specs(PITCHING_LEADERBOARDS, PITCHING_LEADERBOARD_SPECS),
+        qualifier=PITCHING_QUALIFIER
+    )
+    storage_service.save_document(  # Store leaderboards in Azure Blob
+        blob_filename="pitching.leaders.json",
+        document=leaderboards
+    )
+
+    archive_service: ArchiveService = ArchiveService(storage_service)  # Create ArchiveService instance
+    try:  # Archive today's snapshot (if unchanged, only when today is missing); the email doesn't depend on it
+        archive_service.append_snapshot(
+            kind="pitching", day=datetime.now().strftime("%Y-%m-%d"), document=pitching, if_missing=not saved
+        )
+    except Exception as err:
+        logger.warning(f"Failed to archive pitching stats: {err}")
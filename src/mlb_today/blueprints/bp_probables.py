@@ -1,20 +1,21 @@
 """ Retrieve pitching probables from MLB.com """
-import json
-from datetime import datetime
-from typing import Any
+import asyncio
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
 import azure.functions as func
 
 import src.mlb_today.config as config
-from src.mlb_today.logger import logger
-from src.mlb_today.services.mlbdotcom_service import MlbDotComService
-from src.mlb_today.services.probables_service import ProbablesService
-from src.mlb_today.services.storage_service import StorageService
+from src.mlb_today.logger import bind_invocation, logger
+from src.mlb_today.metrics import timed, untimed
+
+if TYPE_CHECKING:
+    from src.mlb_today.services.storage_service import StorageService
 
 bp: func.Blueprint = func.Blueprint()
 
-PROBABLES_CRON: str = config.PROBABLES_CRON
+PROBABLES_POLL_CRON: str = config.PROBABLES_POLL_CRON
 EMAIL_BLOB_CONTAINER_NAME: str = config.EMAIL_BLOB_CONTAINER_NAME
 
 
@@ -22,46 +23,87 @@ EMAIL_BLOB_CONTAINER_NAME: str = config.EMAIL_BLOB_CONTAINER_NAME
 @bp.function_name(name="get_probables")
 @bp.timer_trigger(
     arg_name="probablesarg",
-    schedule=PROBABLES_CRON,
+    schedule=PROBABLES_POLL_CRON,
     run_on_startup=False
 )
-def main(probablesarg: func.TimerRequest) -> None:
+async def main(probablesarg: func.TimerRequest, context: func.Context) -> None:
     """
     Azure Function to retrieve pitching probables from MLB.com
 
+    The timer fires every few minutes; each tick is one conditional blob read until the run time
+    earliest_game_time stored for today arrives, and exactly one tick then claims and does the run.
+    Only the run is timed, so the no-op ticks don't bury its timings or export metrics.
+
     Args:
         probablesarg (func.TimerRequest): timer trigger
+        context (func.Context): invocation context
     """
+    bind_invocation(context)  # Tag this invocation's log records
+
+    # Blob storage for the run schedule; run_probables imports what a run needs
+    from src.mlb_today.services.run_schedule_service import PROBABLES_JOB, RunScheduleService
+    from src.mlb_today.services.storage_service import StorageService
+
     eastern_tz = ZoneInfo("America/New_York")
     today_eastern_str = datetime.now(eastern_tz).strftime("%Y-%m-%d")
+
+    storage_service: StorageService = StorageService()  # Create StorageService instance
+    run_schedule_service: RunScheduleService = RunScheduleService(storage_service)
+    with untimed():
+        claimed: bool = run_schedule_service.claim_due(PROBABLES_JOB, today_eastern_str, datetime.now(timezone.utc))
+    if not claimed:
+        return  # Not time yet, or today's run is done
+
+    succeeded: bool = False
+    try:
+        await run_probables(today_eastern_str, storage_service)
+        succeeded = True
+    finally:
+        with untimed():
+            run_schedule_service.finish(PROBABLES_JOB, succeeded)  # A failed run is retried on a later tick
+
+
+@timed("function.get_probables")
+async def run_probables(today_eastern_str: str, storage_service: "StorageService") -> None:
+    """
+    Retrieve today's probables and stats, and save the email data that triggers the email
+
+    The schedule lookup and both stats blob downloads run concurrently, so the run
+    waits on the slowest of them rather than their sum.
+
+    Args:
+        today_eastern_str (str): today's date in YYYY-MM-DD format (Eastern Time)
+        storage_service (StorageService): storage service shared by the run's reads and writes
+    """
+    from src.mlb_today.models import EmailData
+    from src.mlb_today.services.probables_service import ProbablesService
+    from src.mlb_today.services.schedule_cache_service import ScheduleCacheService
+
     logger.info(f"Checking for games on {today_eastern_str} (Eastern Time).")
 
-    mlbdotcom_service: MlbDotComService = MlbDotComService()  # Create MlbDotComService instance
-    probables: list[dict[str, str]] | None = mlbdotcom_service.get_schedule(  # Get today's games
-        date=today_eastern_str
+    schedule_cache_service: ScheduleCacheService = ScheduleCacheService(storage_service)  # Cached by earliest_game_time
+    probables_service: ProbablesService = ProbablesService(storage_service)  # Share the storage service's reads
+
+    probables: list[dict[str, str]] | None
+    probables, _ = await asyncio.gather(
+        asyncio.to_thread(schedule_cache_service.get_games, day=today_eastern_str),  # Get today's games
+        probables_service.prefetch_stats()  # Download batting and pitching stats meanwhile
     )
 
     if not probables:  # If no probables found, log and return
         logger.info("No probables found for today")
         return
 
-    probables_service: ProbablesService = ProbablesService()  # Create ProbablesService instance
-    probables_data: list[dict[str, Any]] | None = probables_service.get_probables_data(  # Get probables data
-        probables=probables
+    email_data: EmailData = EmailData(
+        probables=probables_service.get_probables_data(probables=probables),  # Get probables data
+        batting=probables_service.get_off_war_leaders(),  # Get batting data
+        pitching=probables_service.get_pitching_war_leaders()  # Get pitching data
     )
-    batting_data: list[dict[str, Any]] | None = probables_service.get_off_war_leaders()  # Get batting data
-    pitching_data: list[dict[str, Any]] | None = probables_service.get_pitching_war_leaders()  # Get pitching data
 
-    email_data: dict[str, Any] = {  # Create email data
-        "probables": probables_data,
-        "batting": batting_data,
-        "pitching": pitching_data
-    }
-
-    storage_service: StorageService = StorageService()  # Create StorageService instance
     logger.info(f"Saving email data to {EMAIL_BLOB_CONTAINER_NAME}/email_data.json")
-    storage_service.save_blob(  # Store email data in Azure Blob
+    await asyncio.to_thread(
+        storage_service.save_document,  # Store email data in Azure Blob
         blob_filename="email_data.json",  # Use a consistent filename
-        data=json.dumps(email_data, indent=4),  # Use indent for readability
+        document=email_data.to_dict(),
         blob_container_name=EMAIL_BLOB_CONTAINER_NAME
     )
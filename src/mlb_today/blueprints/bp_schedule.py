@@ -5,10 +5,8 @@ from zoneinfo import ZoneInfo
 import azure.functions as func
 
 import src.mlb_today.config as config
-from src.mlb_today.logger import logger
-from src.mlb_today.services.app_setting_service import AppSettingService, get_azure_app_info
-from src.mlb_today.services.mlbdotcom_service import MlbDotComService
-from src.mlb_today.services.schedule_service import ScheduleService
+from src.mlb_today.logger import bind_invocation, logger
+from src.mlb_today.metrics import timed
 
 bp: func.Blueprint = func.Blueprint()
 
@@ -22,20 +20,31 @@ SCHEDULE_CRON: str = config.SCHEDULE_CRON
     schedule=SCHEDULE_CRON,
     run_on_startup=False
 )
-def main(schedulearg: func.TimerRequest) -> None:
+@timed("function.earliest_game_time")
+def main(schedulearg: func.TimerRequest, context: func.Context) -> None:
     """
-    Azure function to set schedule for bp_probables based on earliest game start time
+    Azure function to schedule today's bp_probables run based on earliest game start time.
+    The run time is stored in blob storage, where bp_probables' frequent timer picks it up,
+    so rescheduling doesn't rewrite an app setting (which restarts the Function App).
 
     Args:
         schedulearg (func.TimerRequest): timer trigger
+        context (func.Context): invocation context
     """
+    bind_invocation(context)  # Tag this invocation's log records
+
+    # Blob storage and the MLB.com schedule client (requests)
+    from src.mlb_today.services.run_schedule_service import PROBABLES_JOB, RunScheduleService
+    from src.mlb_today.services.schedule_cache_service import ScheduleCacheService
+    from src.mlb_today.services.schedule_service import ScheduleService
+
     eastern_tz = ZoneInfo("America/New_York")
     today_eastern_str = datetime.now(eastern_tz).strftime("%Y-%m-%d")
     logger.info(f"Checking for games on {today_eastern_str} (Eastern Time).")
 
-    mlbdotcom_service: MlbDotComService = MlbDotComService()  # Create MlbDotComService instance
-    games: list[dict[str, str]] | None = mlbdotcom_service.get_schedule(  # Get today's games
-        date=today_eastern_str
+    schedule_cache_service: ScheduleCacheService = ScheduleCacheService()  # Create ScheduleCacheService instance
+    games: list[dict[str, str]] | None = schedule_cache_service.get_games(  # Get today's games, caching the week
+        day=today_eastern_str
     )
 
     if not games:  # If no games found, log and return
@@ -43,20 +52,13 @@ def main(schedulearg: func.TimerRequest) -> None:
         return
 
     schedule_service: ScheduleService = ScheduleService()  # Create ScheduleService instance
-    new_cron_schedule: str | None = schedule_service.create_new_cron_schedule(games)  # Get new cron schedule
+    run_at: datetime | None = schedule_service.get_next_run_time(games)  # Get probables run time
 
-    if not new_cron_schedule:  # If no new cron schedule, log and return
-        logger.warning("Failed to generate a new CRON schedule")
+    if not run_at:  # If no run time, log and return
+        logger.warning("Failed to compute the probables run time")
         return
 
-    app_info = get_azure_app_info()
-
-    app_settings_service: AppSettingService = AppSettingService(  # Create AppSettingService instance
-        subscription_id=app_info.get("subscription_id"),
-        target_resource_group=app_info.get("resource_group_name"),
-        target_function_app_name=app_info.get("app_name"),
-        target_slot_name=app_info.get("slot_name")  # <-- Pass the slot name here
-    )
-    app_settings_service.update_setting("PROBABLES_CRON", new_cron_schedule)  # Update app setting
-    logger.info(f"NCronTab schedule updated to {new_cron_schedule}")
+    run_schedule_service: RunScheduleService = RunScheduleService(schedule_cache_service.storage_service)
+    run_schedule_service.schedule(PROBABLES_JOB, day=today_eastern_str, run_at=run_at)  # Store run time
+    logger.info(f"get_probables scheduled for {run_at.isoformat()}")
     return
@@ -0,0 +1,224 @@
+""" Personalized emails assembled from fragments rendered once and cached by data hash """
+from collections import OrderedDict
+import hashlib
+from itertools import groupby
+import json
+from typing import Any
+
+from jinja2 import Environment
+from markupsafe import Markup
+
+import src.mlb_today.config as config
+from src.mlb_today.logger import logger
+
+EMAIL_FRAGMENT_CACHE_ENTRIES: int = config.EMAIL_FRAGMENT_CACHE_ENTRIES
+
+TEMPLATE_NAME: str = "email.jinja2"
+SECTIONS: tuple[str, ...] = ("probables", "batting", "pitching")
+_SLOT: str = "\x00fragment:{}\x00"  # Placeholder the layout is rendered around, never present in real data
+
+
+def data_hash(data: Any) -> str:
+    """
+    Stable hash of JSON-serializable data, used as a fragment cache key
+
+    Args:
+        data (Any): data a fragment is rendered from
+
+    Returns:
+        str: hex digest
+    """
+    encoded: bytes = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _date_key(game: dict[str, Any]) -> Any:
+    """ Sort/group key matching Jinja's case-insensitive groupby('date') """
+    value: Any = game.get("date")
+    return value.lower() if isinstance(value, str) else value
+
+
+class RecipientPreferences:
+    """ What one recipient wants: favorite teams highlighted, and optionally only their games """
+    __slots__ = ("teams", "only_teams")
+
+    def __init__(self, teams: list[str] | None = None, only_teams: bool = False):
+        self.teams: frozenset[str] = frozenset(team.strip().upper() for team in teams or [] if team.strip())
+        self.only_teams = only_teams and bool(self.teams)
+
+    def key(self) -> tuple[frozenset[str], bool]:
+        """ Recipients with equal keys get the same email """
+        return self.teams, self.only_teams
+
+
+def parse_recipient_preferences(raw: str | None) -> dict[str, RecipientPreferences]:
+    """
+    Parse EMAIL_RECIPIENT_PREFERENCES, e.g. {"fan@example.com": {"teams": ["NYY"], "only_teams": true}}
+
+    Args:
+        raw (str | None): JSON object of preferences by email address
+
+    Returns:
+        dict[str, RecipientPreferences]: preferences by lower-cased email address (empty if unset or invalid)
+    """
+    if not raw:
+        return {}
+    try:
+        parsed: dict[str, dict[str, Any]] = json.loads(raw)
+        return {
+            address.strip().lower(): RecipientPreferences(settings.get("teams"), bool(settings.get("only_teams")))
+            for address, settings in parsed.items()
+        }
+    except (ValueError, AttributeError, TypeError) as err:
+        logger.warning(f"Ignoring invalid EMAIL_RECIPIENT_PREFERENCES: {err}")
+        return {}
+
+
+class FragmentCache:
+    """ LRU of rendered HTML fragments, kept across warm invocations """
+    def __init__(self, max_entries: int = EMAIL_FRAGMENT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[tuple[str, ...], str] = OrderedDict()
+
+    def render(self, environment: Environment, template_name: str, key: tuple[str, ...], **context: Any) -> str:
+        """
+        Get a fragment, rendering it on a miss
+
+        Args:
+            environment (Environment): Jinja2 environment
+            template_name (str): fragment template
+            key (tuple[str, ...]): cache key (the template name is added)
+            **context: template variables
+
+        Returns:
+            str: rendered fragment
+        """
+        full_key: tuple[str, ...] = (template_name, *key)
+        html: str | None = self._entries.get(full_key)
+        if html is not None:
+            self.hits += 1
+            self._entries.move_to_end(full_key)
+            return html
+
+        self.misses += 1
+        html = environment.get_template(template_name).render(**context)
+        self._entries[full_key] = html
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return html
+
+
+class Edition:
+    """ One day's email, ready to assemble per recipient from cached fragments """
+    def __init__(self, composer: "EmailComposer", email_data: dict[str, Any]):
+        self.composer = composer
+        self._fragments: dict[tuple[str, ...], str] = {}  # This edition's fragments, even if the LRU evicts them
+        render = self.render_fragment
+
+        self.games: list[tuple[dict[str, Any], str]] = [
+            (game, data_hash(game)) for game in sorted(email_data.get("probables") or [], key=_date_key)
+        ]
+        self.batting: str = render("fragments/batting.jinja2", data_hash(email_data.get("batting")),
+                                   batting=email_data.get("batting") or [])
+        self.pitching: str = render("fragments/pitching.jinja2", data_hash(email_data.get("pitching")),
+                                    pitching=email_data.get("pitching") or [])
+        self._bodies: dict[tuple[frozenset[str], bool], str] = {}
+
+    def render_fragment(self, template_name: str, *key: str, **context: Any) -> str:
+        """ A fragment of this edition, from the edition itself, the shared cache or a fresh render """
+        full_key: tuple[str, ...] = (template_name, *key)
+        html: str | None = self._fragments.get(full_key)
+        if html is None:
+            html = self._fragments[full_key] = self.composer.render_fragment(template_name, *key, **context)
+        return html
+
+    def _probables(self, preferences: RecipientPreferences) -> str:
+        """ The probables section: time headers and game cards, favorites highlighted or filtered """
+        render = self.render_fragment
+        games: list[tuple[dict[str, Any], str]] = self.games
+        if preferences.only_teams:
+            favorites = [entry for entry in games if self._is_favorite(entry[0], preferences)]
+            games = favorites or games  # Nothing for their teams today: show the full slate
+
+        parts: list[str] = []
+        for _, group in groupby(games, key=lambda entry: _date_key(entry[0])):
+            group = list(group)
+            time: Any = group[0][0].get("date")
+            parts.append(render("fragments/game_time.jinja2", str(time), time=time))
+            for game, game_hash in group:
+                highlight: bool = self._is_favorite(game, preferences)
+                parts.append(render("fragments/game.jinja2", game_hash, str(highlight), game=game, highlight=highlight))
+        return "".join(parts)
+
+    @staticmethod
+    def _is_favorite(game: dict[str, Any], preferences: RecipientPreferences) -> bool:
+        teams: frozenset[str] = preferences.teams
+        if not teams:
+            return False
+        return any(str((game.get(side) or {}).get("abbr", "")).upper() in teams for side in ("away", "home"))
+
+    def assemble(self, preferences: RecipientPreferences | None = None) -> str:
+        """
+        Assemble the email for one recipient
+
+        Args:
+            preferences (RecipientPreferences | None): recipient's preferences (None for the standard email)
+
+        Returns:
+            str: HTML body
+        """
+        preferences = preferences or RecipientPreferences()
+        key: tuple[frozenset[str], bool] = preferences.key()
+        body: str | None = self._bodies.get(key)
+        if body is None:
+            sections: dict[str, str] = {
+                "probables": self._probables(preferences), "batting": self.batting, "pitching": self.pitching
+            }
+            layout: list[str] = self.composer.layout()
+            body = layout[0] + "".join(sections[name] + layout[index + 1] for index, name in enumerate(SECTIONS))
+            self._bodies[key] = body
+        return body
+
+
+class EmailComposer:
+    """ Renders the email's fragments once and assembles personalized copies from them """
+    def __init__(self, environment: Environment, cache: FragmentCache | None = None):
+        self.environment = environment
+        self.cache = cache or FragmentCache()
+        self._layout: list[str] | None = None
+
+    def render_fragment(self, template_name: str, *key: str, **context: Any) -> str:
+        """ Render a fragment template, or reuse the cached copy for the same key """
+        return self.cache.render(self.environment, template_name, key, **context)
+
+    def layout(self) -> list[str]:
+        """
+        The static markup around the sections, rendered once: len(SECTIONS) + 1 pieces
+
+        Returns:
+            list[str]: markup before the first section, between sections, and after the last
+        """
+        if self._layout is None:
+            slots: dict[str, Markup] = {name: Markup(_SLOT.format(name)) for name in SECTIONS}
+            html: str = self.environment.get_template(TEMPLATE_NAME).render(fragments=slots)
+            pieces: list[str] = []
+            for name in SECTIONS:
+                before, html = html.split(_SLOT.format(name), 1)
+                pieces.append(before)
+            pieces.append(html)
+            self._layout = pieces
+        return self._layout
+
+    def edition(self, email_data: dict[str, Any]) -> Edition:
+        """
+        Render (or reuse) the fragments for a day's display-formatted email data
+
+        Args:
+            email_data (dict[str, Any]): output of prepare_email_data
+
+        Returns:
+            Edition: email ready to assemble per recipient
+        """
+        return Edition(self, email_data)
@@ -4,27 +4,91 @@ import os
 STORAGE_CONNECTION_STRING = os.getenv("STORAGE_CONNECTION_STRING")
 BLOB_CONTAINER_NAME = os.getenv("BLOB_CONTAINER_NAME")
 EMAIL_BLOB_CONTAINER_NAME = os.getenv("EMAIL_BLOB_CONTAINER_NAME")
+BLOB_MAX_CONCURRENCY: int = int(os.getenv("BLOB_MAX_CONCURRENCY", "4"))
 
-SUBSCRIPTION_ID = os.getenv("SUBSCRIPTION_ID")
-TARGET_RESOURCE_GROUP_NAME = os.getenv("TARGET_RESOURCE_GROUP_NAME")
-TARGET_FUNCTION_APP_NAME = os.getenv("TARGET_FUNCTION_APP_NAME")
+# Parsed blobs kept in memory across warm invocations, plus an optional on-disk spill tier (e.g. /tmp/mlb-today)
+BLOB_CACHE_MAX_BYTES: int = int(os.getenv("BLOB_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+BLOB_CACHE_SPILL_DIRECTORY: str | None = os.getenv("BLOB_CACHE_SPILL_DIRECTORY")
+
+# How data blobs are stored: json, orjson or msgpack, and none, gzip or zstd (reads detect either)
+BLOB_CODEC: str = os.getenv("BLOB_CODEC", "json")
+BLOB_COMPRESSION: str = os.getenv("BLOB_COMPRESSION", "none")
+
+# Local copies of the season stats archives, memory-mapped for reads (default: <temp dir>/mlb-today/archive)
+ARCHIVE_DIRECTORY: str | None = os.getenv("ARCHIVE_DIRECTORY")
 
 ACS_CONNECTION_STRING = os.getenv("ACS_CONNECTION_STRING")
 ACS_SENDER_ADDRESS = os.getenv("ACS_SENDER_ADDRESS")
+# Recipients per message (1 sends each recipient their own), parallel sends, and retries when ACS throttles
+EMAIL_BATCH_SIZE: int = int(os.getenv("EMAIL_BATCH_SIZE", "1"))
+EMAIL_MAX_CONCURRENCY: int = int(os.getenv("EMAIL_MAX_CONCURRENCY", "8"))
+EMAIL_MAX_RETRIES: int = int(os.getenv("EMAIL_MAX_RETRIES", "5"))
+EMAIL_BACKOFF_FACTOR: float = float(os.getenv("EMAIL_BACKOFF_FACTOR", "1.0"))
+EMAIL_POLL_INTERVAL: float = float(os.getenv("EMAIL_POLL_INTERVAL", "1.0"))
+EMAIL_SEND_TIMEOUT: float = float(os.getenv("EMAIL_SEND_TIMEOUT", "120"))
 
 PROBABLES_TO_EMAIL_STR = os.getenv("PROBABLES_TO_EMAIL_STR")
+# Per-recipient favorite teams as JSON, e.g. {"fan@example.com": {"teams": ["NYY"], "only_teams": true}}
+EMAIL_RECIPIENT_PREFERENCES: str | None = os.getenv("EMAIL_RECIPIENT_PREFERENCES")
+# How long sent email data is remembered, and how long an unfinished send blocks duplicate triggers
+EMAIL_LEDGER_TTL_HOURS: float = float(os.getenv("EMAIL_LEDGER_TTL_HOURS", "72"))
+EMAIL_LEDGER_LEASE_MINUTES: float = float(os.getenv("EMAIL_LEDGER_LEASE_MINUTES", "15"))
+EMAIL_FRAGMENT_CACHE_ENTRIES: int = int(os.getenv("EMAIL_FRAGMENT_CACHE_ENTRIES", "512"))
+
+# Read API: how long a loaded blob is served before its ETag is checked again, and encoded responses kept
+API_CACHE_TTL_SECONDS: float = float(os.getenv("API_CACHE_TTL_SECONDS", "30"))
+API_CACHE_ENTRIES: int = int(os.getenv("API_CACHE_ENTRIES", "256"))
 
 PITCHING_CRON = os.getenv("PITCHING_CRON")
 BATTING_CRON = os.getenv("BATTING_CRON")
-PROBABLES_CRON = os.getenv("PROBABLES_CRON")
+# How often get_probables checks for the run time earliest_game_time stored (it runs once a day)
+PROBABLES_POLL_CRON: str = os.getenv("PROBABLES_POLL_CRON", "0 */5 * * * *")
+RUN_MAX_ATTEMPTS: int = int(os.getenv("RUN_MAX_ATTEMPTS", "3"))
 SCHEDULE_CRON = os.getenv("SCHEDULE_CRON")
 
 
 SCHEDULE_ENDPOINT = os.getenv("SCHEDULE_ENDPOINT")
+# Days fetched per schedule request, and how long a cached day is used before probable pitchers are refreshed
+SCHEDULE_FETCH_DAYS: int = int(os.getenv("SCHEDULE_FETCH_DAYS", "7"))
+SCHEDULE_CACHE_MAX_AGE_MINUTES: float = float(os.getenv("SCHEDULE_CACHE_MAX_AGE_MINUTES", "60"))
 STATS_ENDPOINT = "https://www.fangraphs.com/api/leaders/major-league/data"
 
+# Leaderboards precomputed at ingest (comma-separated stats), and the playing time needed for rate-stat boards
+BATTING_LEADERBOARDS: list[str] = [
+    stat.strip() for stat in os.getenv("BATTING_LEADERBOARDS", "WAR,OPS,HR,AVG,K%").split(",") if stat.strip()
+]
+PITCHING_LEADERBOARDS: list[str] = [
+    stat.strip() for stat in os.getenv("PITCHING_LEADERBOARDS", "WAR,ERA,xFIP,K%,W").split(",") if stat.strip()
+]
+LEADERBOARD_SIZE: int = int(os.getenv("LEADERBOARD_SIZE", "25"))
+QUALIFIED_MIN_PA: float = float(os.getenv("QUALIFIED_MIN_PA", "100"))
+QUALIFIED_MIN_IP: float = float(os.getenv("QUALIFIED_MIN_IP", "30"))
+
+HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "30"))
+HTTP_MAX_RETRIES: int = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_FACTOR: float = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+HTTP_POOL_MAXSIZE: int = int(os.getenv("HTTP_POOL_MAXSIZE", "4"))
+HTTP_CACHE_ENTRIES: int = int(os.getenv("HTTP_CACHE_ENTRIES", "8"))
+
+# Fangraphs columns kept in batting.json / pitching.json (comma-separated to override)
+BATTING_COLUMNS: list[str] = [
+    column.strip() for column in os.getenv(
+        "BATTING_COLUMNS", "xMLBAMID,PlayerName,TeamNameAbb,PA,AVG,HR,OBP,SLG,OPS,BABIP,K%,WAR"
+    ).split(",") if column.strip()
+]
+PITCHING_COLUMNS: list[str] = [
+    column.strip() for column in os.getenv(
+        "PITCHING_COLUMNS", "xMLBAMID,PlayerName,TeamNameAbb,IP,W,L,ERA,xFIP,K%,WAR"
+    ).split(",") if column.strip()
+]
+
 LOG_DIRECTORY = os.getenv("LOG_DIRECTORY")
 LOG_LEVEL = os.getenv("LOG_LEVEL")
+LOG_BATCH_SIZE: int = int(os.getenv("LOG_BATCH_SIZE", "100"))
+LOG_DEBUG_SAMPLE_RATE: float = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
+METRICS_EXPORTER: str | None = os.getenv("METRICS_EXPORTER")  # otel, json or none; default picks for you
+METRICS_FILE: str | None = os.getenv("METRICS_FILE")
 
 DISABLE_EMAIL_SENDING: bool = False
 
@@ -1,20 +1,188 @@
 """ Application Logging Configuration """
+import atexit
+import copy
+from contextvars import ContextVar
+from datetime import datetime, timezone
+import json
 import logging
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, TimedRotatingFileHandler
 import os
+import queue
+import random
+import sys
+import threading
+from typing import Any
 
 import src.mlb_today.config as config
 
 LOG_DIRECTORY = config.LOG_DIRECTORY
 LOG_FILE_NAME = "application.log"
-LOG_FILE_PATH = os.path.join(LOG_DIRECTORY, LOG_FILE_NAME)
+LOG_FILE_PATH = os.path.join(LOG_DIRECTORY, LOG_FILE_NAME) if LOG_DIRECTORY else None
 LOG_LEVEL = config.LOG_LEVEL
+LOG_BATCH_SIZE: int = config.LOG_BATCH_SIZE
+LOG_DEBUG_SAMPLE_RATE: float = config.LOG_DEBUG_SAMPLE_RATE
 
-os.makedirs(LOG_DIRECTORY, exist_ok=True)
+invocation_id: ContextVar[str | None] = ContextVar("invocation_id", default=None)
+function_name: ContextVar[str | None] = ContextVar("function_name", default=None)
+
+
+def bind_invocation(context: Any) -> None:
+    """
+    Tag every record logged by the current invocation (and threads/tasks it starts) with its id and function name
+
+    Args:
+        context (func.Context): Azure Functions invocation context
+    """
+    invocation_id.set(getattr(context, "invocation_id", None))
+    function_name.set(getattr(context, "function_name", None))
+
+
+class InvocationQueueHandler(QueueHandler):
+    """ Enqueues records without formatting them, stamped with the caller's invocation context """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)  # Other handlers still see the original
+        record.invocation_id = invocation_id.get()
+        record.function_name = function_name.get()
+        if record.exc_info:  # Tracebacks can't cross threads safely; render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+
+class DebugSamplingFilter(logging.Filter):
+    """ Keeps only a fraction of DEBUG records; other levels always pass """
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1.0 or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """ One JSON object per line """
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "invocation_id": getattr(record, "invocation_id", None),
+            "function_name": getattr(record, "function_name", None),
+            "thread": record.threadName
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class BatchedFileHandler(TimedRotatingFileHandler):
+    """ TimedRotatingFileHandler that only flushes when told to, once per batch """
+    def flush(self) -> None:
+        pass
+
+    def flush_batch(self) -> None:
+        super().flush()
+
+
+class BatchedStreamHandler(logging.StreamHandler):
+    """ StreamHandler that only flushes when told to, once per batch """
+    def flush(self) -> None:
+        pass
+
+    def flush_batch(self) -> None:
+        super().flush()
+
+
+class LogWriter:
+    """ Background thread that drains the log queue and writes whatever has accumulated as one flushed batch """
+    _STOP = object()
+
+    def __init__(self, log_queue: queue.SimpleQueue, batch_size: int):
+        self.queue = log_queue
+        self.batch_size = batch_size
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """ Write everything queued so far, then stop """
+        if self._thread.is_alive():
+            self.queue.put(self._STOP)
+            self._thread.join(timeout=5)
+
+    def _create_handler(self) -> logging.Handler:
+        """ File handler when a log directory is configured, else stderr; created on this thread """
+        handler: logging.Handler
+        if LOG_FILE_PATH:
+            os.makedirs(LOG_DIRECTORY, exist_ok=True)
+            handler = BatchedFileHandler(filename=LOG_FILE_PATH, when='midnight', backupCount=30, encoding='utf-8')
+        else:
+            handler = BatchedStreamHandler(sys.stderr)
+        handler.setFormatter(JsonFormatter())
+        return handler
+
+    @staticmethod
+    def _fallback_handler(handler: logging.Handler | None, err: Exception) -> logging.Handler:
+        """ Helper method to replace a handler that can't write with one on stderr, so records aren't lost """
+        if handler is not None:
+            try:
+                handler.close()
+            except Exception:
+                pass
+        fallback: logging.Handler = BatchedStreamHandler(sys.stderr)
+        fallback.setFormatter(JsonFormatter())
+        sys.stderr.write(f"Log file unavailable, logging to stderr: {err!r}\n")
+        return fallback
+
+    @staticmethod
+    def _write_batch(handler: logging.Handler, records: list[logging.LogRecord]) -> None:
+        """ Helper method to write records and flush them once; raises if the flush fails, e.g. disk full """
+        for record in records:
+            try:
+                handler.handle(record)
+            except Exception:  # Never let one bad record kill the writer
+                handler.handleError(record)
+        handler.flush_batch()
+
+    def _run(self) -> None:
+        handler: logging.Handler
+        try:
+            handler = self._create_handler()
+        except Exception as err:  # e.g. LOG_DIRECTORY unwritable
+            handler = self._fallback_handler(None, err)
+
+        stopping: bool = False
+        while not stopping:
+            batch: list[Any] = [self.queue.get()]  # Sleep until there is something to write
+            while len(batch) < self.batch_size:  # Take whatever else is already waiting
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = any(record is self._STOP for record in batch)
+            records: list[logging.LogRecord] = [record for record in batch if record is not self._STOP]
+
+            try:
+                self._write_batch(handler, records)
+            except Exception as err:  # Write this batch and everything after it to stderr instead
+                handler = self._fallback_handler(handler, err)
+                try:
+                    self._write_batch(handler, records)
+                except Exception:  # stderr is gone too; keep draining so the queue can't grow
+                    pass
+        handler.close()
+
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_writer: LogWriter = LogWriter(log_queue, LOG_BATCH_SIZE)
+log_writer.start()
+atexit.register(log_writer.stop)
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO) # Set your desired logging level
-handler = TimedRotatingFileHandler(filename=LOG_FILE_PATH, when='midnight', backupCount=30, encoding='utf-8')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
+logger.setLevel(logging.getLevelNamesMapping().get((LOG_LEVEL or "").upper(), logging.INFO))  # LOG_LEVEL or INFO
+handler = InvocationQueueHandler(log_queue)
+handler.addFilter(DebugSamplingFilter(LOG_DEBUG_SAMPLE_RATE))
 logger.addHandler(handler)
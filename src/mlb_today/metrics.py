@@ -0,0 +1,300 @@
+""" Per-stage timing and payload size metrics """
+from bisect import bisect_left
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+import functools
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+import src.mlb_today.config as config
+from src.mlb_today.logger import logger
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics import MeterProvider
+
+METRICS_EXPORTER: str | None = config.METRICS_EXPORTER
+METRICS_FILE: str = config.METRICS_FILE or os.path.join(config.LOG_DIRECTORY or tempfile.gettempdir(), "metrics.json")
+
+# Explicit bucket upper bounds in milliseconds, as in an OpenTelemetry explicit-bucket histogram
+BUCKET_BOUNDS_MS: tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histogram:
+    """ Explicit-bucket histogram of one stage's durations, plus the bytes it moved """
+    __slots__ = ("count", "sum_ms", "min_ms", "max_ms", "bucket_counts", "bytes")
+
+    def __init__(self):
+        self.count: int = 0
+        self.sum_ms: float = 0.0
+        self.min_ms: float | None = None
+        self.max_ms: float | None = None
+        self.bucket_counts: list[int] = [0] * (len(BUCKET_BOUNDS_MS) + 1)  # Last bucket is +Inf
+        self.bytes: int = 0
+
+    def record(self, duration_ms: float, size: int) -> None:
+        self.count += 1
+        self.sum_ms += duration_ms
+        self.min_ms = duration_ms if self.min_ms is None else min(self.min_ms, duration_ms)
+        self.max_ms = duration_ms if self.max_ms is None else max(self.max_ms, duration_ms)
+        self.bucket_counts[bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+        self.bytes += size
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "min_ms": round(self.min_ms, 3) if self.min_ms is not None else None,
+            "max_ms": round(self.max_ms, 3) if self.max_ms is not None else None,
+            "explicit_bounds_ms": list(BUCKET_BOUNDS_MS),
+            "bucket_counts": list(self.bucket_counts),
+            "bytes": self.bytes
+        }
+
+
+def create_meter_provider() -> "MeterProvider":
+    """
+    Get the SDK MeterProvider: the global one if the host already set one up, else one exporting over OTLP/HTTP
+    to OTEL_EXPORTER_OTLP_ENDPOINT every OTEL_METRIC_EXPORT_INTERVAL milliseconds
+
+    Returns:
+        MeterProvider: meter provider
+    """
+    # Deferred: the SDK is only loaded by invocations that export to a collector
+    from opentelemetry import metrics as otel_metrics
+    from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+    from opentelemetry.sdk.resources import Resource
+
+    provider = otel_metrics.get_meter_provider()
+    if isinstance(provider, MeterProvider):
+        return provider
+    provider = MeterProvider(
+        metric_readers=[PeriodicExportingMetricReader(OTLPMetricExporter())],
+        resource=Resource.create({"service.name": "mlb-today"})
+    )
+    otel_metrics.set_meter_provider(provider)
+    return provider
+
+
+class OpenTelemetryExporter:
+    """ Records each span into OpenTelemetry instruments and flushes them to the collector after each invocation """
+    def __init__(self):
+        self._provider = create_meter_provider()
+        meter = self._provider.get_meter("mlb_today")
+        self._duration = meter.create_histogram("mlb_today.stage.duration", unit="ms")
+        self._bytes = meter.create_counter("mlb_today.stage.bytes", unit="By")
+
+    def record(self, stage: str, duration_ms: float, size: int) -> None:
+        self._duration.record(duration_ms, {"stage": stage})
+        if size:
+            self._bytes.add(size, {"stage": stage})
+
+    def export(self, stages: dict[str, Histogram]) -> None:
+        try:  # An idle instance may be frozen or recycled before the next periodic export
+            if not self._provider.force_flush(timeout_millis=5000):
+                logger.warning("Timed out flushing metrics to the OTLP collector")
+        except Exception as err:
+            logger.warning(f"Could not flush metrics to the OTLP collector: {err}")
+
+
+class JsonFileExporter:
+    """ Writes the histograms to a local JSON metrics file after each invocation """
+    def __init__(self, path: str):
+        self.path = path
+
+    def record(self, stage: str, duration_ms: float, size: int) -> None:
+        pass
+
+    def export(self, stages: dict[str, Histogram]) -> None:
+        document: dict[str, Any] = {
+            "updated": datetime.now(timezone.utc).isoformat(),
+            "stages": {stage: histogram.to_dict() for stage, histogram in sorted(stages.items())}
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(f"{self.path}.tmp", "w", encoding="utf-8") as metrics_file:
+                json.dump(document, metrics_file, indent=2)
+            os.replace(f"{self.path}.tmp", self.path)
+        except OSError as err:
+            logger.warning(f"Could not write metrics to {self.path}: {err}")
+
+
+def create_exporter() -> OpenTelemetryExporter | JsonFileExporter | None:
+    """
+    Pick the metrics exporter: METRICS_EXPORTER if set ("otel", "json" or "none"), else OpenTelemetry when
+    an OTLP collector is configured, else the local JSON file
+
+    Returns:
+        OpenTelemetryExporter | JsonFileExporter | None: exporter, or None if disabled
+    """
+    exporter_name: str = (METRICS_EXPORTER or "").lower()
+    if exporter_name == "none":
+        return None
+    if exporter_name == "otel" or (not exporter_name and os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")):
+        return OpenTelemetryExporter()
+    return JsonFileExporter(METRICS_FILE)
+
+
+class Span:
+    """ One timed stage; bytes recorded while it is current are attributed to it """
+    __slots__ = ("stage", "parent", "bytes", "started")
+
+    def __init__(self, stage: str, parent: "Span | None"):
+        self.stage = stage
+        self.parent = parent
+        self.bytes: int = 0
+        self.started: float = time.perf_counter()
+
+    def add_bytes(self, size: int) -> None:
+        self.bytes += size
+
+
+class MetricsRegistry:
+    """ Per-stage histograms for this worker, shared across invocations """
+    def __init__(self):
+        self.stages: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+        self._muted: ContextVar[bool] = ContextVar("metrics_muted", default=False)
+        self._exporter: OpenTelemetryExporter | JsonFileExporter | None = None
+        self._exporter_created: bool = False
+
+    @property
+    def exporter(self) -> OpenTelemetryExporter | JsonFileExporter | None:
+        if not self._exporter_created:  # Created on first use, so importing this module stays cheap
+            self._exporter = create_exporter()
+            self._exporter_created = True
+        return self._exporter
+
+    def current(self) -> Span | None:
+        return self._current.get()
+
+    def record(self, stage: str, duration_ms: float, size: int = 0) -> None:
+        """
+        Record one run of a stage
+
+        Args:
+            stage (str): stage name
+            duration_ms (float): wall time, in milliseconds
+            size (int): payload bytes moved
+        """
+        with self._lock:
+            histogram: Histogram | None = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.record(duration_ms, size)
+        if self.exporter:
+            self.exporter.record(stage, duration_ms, size)
+
+    def export(self) -> None:
+        """ Hand the current histograms to the exporter """
+        if self.exporter:
+            with self._lock:
+                stages: dict[str, Histogram] = dict(self.stages)
+                self.exporter.export(stages)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[Span]:
+        """
+        Time a block of code as one stage. Spans nest; when the outermost span of an
+        invocation ends, the metrics are exported.
+
+        Args:
+            stage (str): stage name
+
+        Yields:
+            Span: the span, for recording payload bytes
+        """
+        span: Span = Span(stage, self._current.get())
+        if self._muted.get():
+            yield span
+            return
+        token = self._current.set(span)
+        try:
+            yield span
+        finally:
+            self._current.reset(token)
+            self.record(stage, (time.perf_counter() - span.started) * 1000, span.bytes)
+            if span.parent is None:
+                self.export()
+
+    @contextmanager
+    def untimed(self) -> Iterator[None]:
+        """ Run a block without recording or exporting its spans, e.g. a frequent poll that usually does nothing """
+        token = self._muted.set(True)
+        try:
+            yield
+        finally:
+            self._muted.reset(token)
+
+
+metrics: MetricsRegistry = MetricsRegistry()
+
+
+def record_bytes(size: int) -> None:
+    """
+    Attribute payload bytes to the current span, if any
+
+    Args:
+        size (int): bytes read or written
+    """
+    span: Span | None = metrics.current()
+    if span is not None:
+        span.add_bytes(size)
+
+
+def span(stage: str) -> AbstractContextManager[Span]:
+    """
+    Time a block of code as one stage
+
+    Args:
+        stage (str): stage name
+
+    Returns:
+        AbstractContextManager[Span]: context manager yielding the span
+    """
+    return metrics.span(stage)
+
+
+def untimed() -> AbstractContextManager[None]:
+    """
+    Run a block without recording or exporting its spans, so frequent no-op work doesn't bury real timings
+
+    Returns:
+        AbstractContextManager[None]: context manager
+    """
+    return metrics.untimed()
+
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator timing every call of a function (sync or async) as one stage
+
+    Args:
+        stage (str): stage name
+
+    Returns:
+        Callable[[Callable], Callable]: decorator
+    """
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with metrics.span(stage):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with metrics.span(stage):
+                return function(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,207 @@
+""" Compact models of the email data: games, matchups and stat lines, with JSON codecs for email_data.json """
+import json
+from types import MappingProxyType
+from typing import Any, Mapping
+
+_NO_RECORD: Mapping[str, Any] = MappingProxyType({})  # Shared read-only default for missing nested objects
+
+
+class BroadcastSet:
+    """ TV call signs for a game, split into national, home, away and other broadcasts """
+    __slots__ = ("home", "away", "national", "misc")
+
+    def __init__(self, home: list[str], away: list[str], national: list[str], misc: list[str]):
+        self.home = home
+        self.away = away
+        self.national = national
+        self.misc = misc
+
+    def to_dict(self) -> dict[str, list[str]]:
+        return {"home": self.home, "away": self.away, "national": self.national, "misc": self.misc}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "BroadcastSet | None":
+        if data is None:
+            return None
+        return cls(data.get("home", []), data.get("away", []), data.get("national", []), data.get("misc", []))
+
+
+class ProbablePitcher:
+    """ A team's probable starter, their season line and its league context """
+    __slots__ = ("name", "wins", "losses", "era", "xfip", "war", "league")
+
+    def __init__(self, name: str, wins: Any, losses: Any, era: Any, xfip: Any, war: Any,
+                 league: dict[str, dict[str, Any]] | None = None):
+        self.name = name
+        self.wins = wins
+        self.losses = losses
+        self.era = era
+        self.xfip = xfip
+        self.war = war
+        self.league = league or {}  # Percentile and qualified rank by stat (see LeagueStats.context)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "record": {"wins": self.wins, "losses": self.losses},
+            "era": self.era,
+            "xfip": self.xfip,
+            "war": self.war,
+            "league": self.league
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ProbablePitcher":
+        record: Mapping[str, Any] = data.get("record") or _NO_RECORD
+        return cls(
+            data.get("name"), record.get("wins"), record.get("losses"), data.get("era"), data.get("xfip"),
+            data.get("war"), data.get("league")
+        )
+
+
+class TeamSide:
+    """ One side of a matchup: team, its record and its probable pitcher """
+    __slots__ = ("abbr", "wins", "losses", "pitcher")
+
+    def __init__(self, abbr: str | None, wins: Any, losses: Any, pitcher: ProbablePitcher):
+        self.abbr = abbr
+        self.wins = wins
+        self.losses = losses
+        self.pitcher = pitcher
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "abbr": self.abbr,
+            "record": {"wins": self.wins, "losses": self.losses},
+            "pitcher": self.pitcher.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TeamSide":
+        record: Mapping[str, Any] = data.get("record") or _NO_RECORD
+        return cls(
+            data.get("abbr"), record.get("wins"), record.get("losses"),
+            ProbablePitcher.from_dict(data.get("pitcher") or _NO_RECORD)
+        )
+
+
+class Game:
+    """ A game on today's slate """
+    __slots__ = ("date", "venue", "away", "home", "watch")
+
+    def __init__(self, date: str | None, venue: str, away: TeamSide, home: TeamSide, watch: BroadcastSet | None):
+        self.date = date
+        self.venue = venue
+        self.away = away
+        self.home = home
+        self.watch = watch
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "date": self.date,
+            "venue": self.venue,
+            "away": self.away.to_dict(),
+            "home": self.home.to_dict(),
+            "watch": self.watch.to_dict() if self.watch is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Game":
+        return cls(
+            data.get("date"), data.get("venue"), TeamSide.from_dict(data.get("away") or _NO_RECORD),
+            TeamSide.from_dict(data.get("home") or _NO_RECORD), BroadcastSet.from_dict(data.get("watch"))
+        )
+
+
+class BatterLine:
+    """ A batting leaderboard row, with its league context """
+    __slots__ = ("name", "team", "avg", "hr", "obp", "slg", "ops", "babip", "war", "league")
+
+    def __init__(self, name: str | None, team: str | None, avg: Any, hr: Any, obp: Any, slg: Any, ops: Any,
+                 babip: Any, war: Any, league: dict[str, dict[str, Any]] | None = None):
+        self.name = name
+        self.team = team
+        self.avg = avg
+        self.hr = hr
+        self.obp = obp
+        self.slg = slg
+        self.ops = ops
+        self.babip = babip
+        self.war = war
+        self.league = league or {}  # Percentile and qualified rank by stat (see LeagueStats.context)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BatterLine":
+        return cls(*(data.get(name) for name in cls.__slots__))
+
+
+class PitcherLine:
+    """ A pitching leaderboard row """
+    __slots__ = ("name", "team", "w", "l", "era", "xfip", "war")
+
+    def __init__(self, name: str | None, team: str | None, w: Any, l: Any, era: Any, xfip: Any,  # noqa: E741
+                 war: Any):
+        self.name = name
+        self.team = team
+        self.w = w
+        self.l = l  # noqa: E741
+        self.era = era
+        self.xfip = xfip
+        self.war = war
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PitcherLine":
+        return cls(*(data.get(name) for name in cls.__slots__))
+
+
+class EmailData:
+    """ Everything the email shows; serializes to the email_data.json shape the template expects """
+    __slots__ = ("probables", "batting", "pitching")
+
+    def __init__(self, probables: list[Game], batting: list[BatterLine], pitching: list[PitcherLine]):
+        self.probables = probables
+        self.batting = batting
+        self.pitching = pitching
+
+    def to_dict(self) -> dict[str, list[dict[str, Any]]]:
+        return {
+            "probables": [game.to_dict() for game in self.probables],
+            "batting": [batter.to_dict() for batter in self.batting],
+            "pitching": [pitcher.to_dict() for pitcher in self.pitching]
+        }
+
+    def to_json(self) -> str:
+        """
+        Encode as email_data.json. Compact, so json uses its C encoder (indent forces the pure-Python one).
+
+        Returns:
+            str: JSON document
+        """
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "EmailData":
+        return cls(
+            [Game.from_dict(game) for game in data.get("probables") or []],
+            [BatterLine.from_dict(batter) for batter in data.get("batting") or []],
+            [PitcherLine.from_dict(pitcher) for pitcher in data.get("pitching") or []]
+        )
+
+    @classmethod
+    def from_json(cls, document: str | bytes) -> "EmailData":
+        """
+        Decode email_data.json
+
+        Args:
+            document (str | bytes): JSON document
+
+        Returns:
+            EmailData: parsed email data
+        """
+        return cls.from_dict(json.loads(document))
@@ -0,0 +1,287 @@
+""" Read API over today's email data and leaderboards: views, field selection and a TTL/LRU response cache """
+from collections import OrderedDict
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable
+
+from azure.core.exceptions import ResourceNotFoundError
+
+import src.mlb_today.config as config
+from src.mlb_today.services.storage_service import StorageService
+
+API_CACHE_TTL_SECONDS: float = config.API_CACHE_TTL_SECONDS
+API_CACHE_ENTRIES: int = config.API_CACHE_ENTRIES
+GZIP_MIN_BYTES: int = 512  # Smaller bodies aren't worth compressing
+
+EMAIL_DATA_BLOB: tuple[str, str] = (config.EMAIL_BLOB_CONTAINER_NAME, "email_data.json")
+LEADERBOARD_BLOBS: dict[str, tuple[str, str]] = {
+    "batting": (config.BLOB_CONTAINER_NAME, "batting.leaders.json"),
+    "pitching": (config.BLOB_CONTAINER_NAME, "pitching.leaders.json")
+}
+
+
+class NotFound(Exception):
+    """ The requested view has no data """
+
+
+def parse_fields(raw: str | None) -> tuple[tuple[str, ...], ...]:
+    """
+    Parse a fields parameter, e.g. "date,away.abbr,away.pitcher.name"
+
+    Args:
+        raw (str | None): comma-separated, dot-separated field paths
+
+    Returns:
+        tuple[tuple[str, ...], ...]: field paths, sorted (empty for all fields)
+    """
+    if not raw:
+        return ()
+    return tuple(sorted({tuple(field.strip().split(".")) for field in raw.split(",") if field.strip()}))
+
+
+def select_fields(value: Any, fields: tuple[tuple[str, ...], ...]) -> Any:
+    """
+    Keep only the given field paths of an object, or of each object in a list. Missing fields are left out.
+
+    Args:
+        value (Any): view data
+        fields (tuple[tuple[str, ...], ...]): field paths from parse_fields (empty keeps everything)
+
+    Returns:
+        Any: projected data
+    """
+    if not fields:
+        return value
+    if isinstance(value, list):
+        return [select_fields(item, fields) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    selected: dict[str, Any] = {}
+    for path in fields:
+        source: Any = value
+        target: dict[str, Any] = selected
+        for depth, name in enumerate(path):
+            if not isinstance(source, dict) or name not in source:
+                break
+            source = source[name]
+            if depth == len(path) - 1:
+                target[name] = source
+            else:
+                existing: Any = target.get(name)
+                target = existing if isinstance(existing, dict) else target.setdefault(name, {})
+    return selected
+
+
+class ApiResponse:
+    """
+    An encoded view: JSON body, its strong ETag and a gzipped copy made on first request. The gzipped copy has its
+    own ETag (the body's with a -gzip suffix), since its bytes differ.
+    """
+    __slots__ = ("body", "etag", "gzip_etag", "_gzip_body")
+
+    def __init__(self, data: Any):
+        self.body: bytes = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        digest: str = hashlib.blake2b(self.body, digest_size=12).hexdigest()
+        self.etag: str = f"\"{digest}\""
+        self.gzip_etag: str = f"\"{digest}-gzip\""
+        self._gzip_body: bytes | None = None
+
+    def content_encoding(self, accept_encoding: str | None) -> str | None:
+        """
+        The Content-Encoding to send for a request's Accept-Encoding
+
+        Args:
+            accept_encoding (str | None): Accept-Encoding request header
+
+        Returns:
+            str | None: gzip, or None to send the body uncompressed
+        """
+        return "gzip" if len(self.body) >= GZIP_MIN_BYTES and accepts_gzip(accept_encoding) else None
+
+    def etag_for(self, content_encoding: str | None) -> str:
+        """ ETag of the body sent with a Content-Encoding """
+        return self.gzip_etag if content_encoding == "gzip" else self.etag
+
+    def encoded(self, accept_encoding: str | None) -> tuple[bytes, str | None]:
+        """
+        The body to send for a request's Accept-Encoding
+
+        Args:
+            accept_encoding (str | None): Accept-Encoding request header
+
+        Returns:
+            tuple[bytes, str | None]: body and its Content-Encoding (None if uncompressed)
+        """
+        if self.content_encoding(accept_encoding) is None:
+            return self.body, None
+        if self._gzip_body is None:
+            self._gzip_body = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzip_body, "gzip"
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """ Whether an If-None-Match request header already has this response, in either encoding (weak comparison) """
+        if not if_none_match:
+            return False
+        tags: set[str] = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags or self.gzip_etag in tags
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip
+
+    Args:
+        accept_encoding (str | None): Accept-Encoding request header
+
+    Returns:
+        bool: True unless gzip is absent or refused with q=0
+    """
+    for coding in (accept_encoding or "").lower().split(","):
+        name, _, parameters = coding.strip().partition(";")
+        if name.strip() in ("gzip", "*"):
+            return parameters.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class ReadApi:
+    """
+    Views of today's data, served from memory. Blobs are revalidated by ETag at most once per TTL,
+    and encoded responses are kept in an LRU until their blob changes.
+    """
+    def __init__(
+            self,
+            storage_factory: Callable[[], StorageService] = StorageService,
+            ttl_seconds: float = API_CACHE_TTL_SECONDS,
+            max_entries: int = API_CACHE_ENTRIES
+    ):
+        self.storage_factory = storage_factory
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._documents: dict[tuple[str, str], tuple[Any, float]] = {}
+        self._responses: OrderedDict[tuple[Any, ...], tuple[Any, ApiResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _document(self, blob: tuple[str, str]) -> Any:
+        """ Helper method to get a parsed blob, revalidating it with a conditional GET once the TTL has passed """
+        now: float = time.monotonic()
+        cached: tuple[Any, float] | None = self._documents.get(blob)
+        if cached is not None and now - cached[1] < self.ttl_seconds:
+            return cached[0]
+
+        container, filename = blob
+        try:
+            # A fresh service per check: its per-instance reads never expire, the shared blob cache keeps the ETag
+            document: Any = self.storage_factory().get_parsed_blob(filename, blob_container_name=container)
+        except ResourceNotFoundError:
+            raise NotFound(f"{filename} doesn't exist yet")
+        self._documents[blob] = (document, now)
+        return document
+
+    def _respond(self, key: tuple[Any, ...], document: Any, build: Callable[[], Any]) -> ApiResponse:
+        """ Helper method to get a cached response, building it if missing or built from an older document """
+        with self._lock:
+            cached: tuple[Any, ApiResponse] | None = self._responses.get(key)
+            if cached is not None and cached[0] is document:
+                self._responses.move_to_end(key)
+                return cached[1]
+
+        response: ApiResponse = ApiResponse(build())
+        with self._lock:
+            self._responses[key] = (document, response)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_entries:
+                self._responses.popitem(last=False)
+        return response
+
+    def games(self, fields: str | None = None) -> ApiResponse:
+        """
+        Today's games, in email order
+
+        Args:
+            fields (str | None): fields to keep, e.g. "date,away.abbr,home.abbr"
+
+        Returns:
+            ApiResponse: list of games
+        """
+        document: dict[str, Any] = self._document(EMAIL_DATA_BLOB)
+        selected = parse_fields(fields)
+        return self._respond(
+            ("games", selected), document, lambda: select_fields(document.get("probables") or [], selected)
+        )
+
+    def game(self, number: int, fields: str | None = None) -> ApiResponse:
+        """
+        One of today's games
+
+        Args:
+            number (int): position in today's games, from 0
+            fields (str | None): fields to keep
+
+        Returns:
+            ApiResponse: game
+
+        Raises:
+            NotFound: if there is no such game
+        """
+        document: dict[str, Any] = self._document(EMAIL_DATA_BLOB)
+        games: list[dict[str, Any]] = document.get("probables") or []
+        if not 0 <= number < len(games):
+            raise NotFound(f"No game {number} today ({len(games)} games)")
+        selected = parse_fields(fields)
+        return self._respond(("game", number, selected), document, lambda: select_fields(games[number], selected))
+
+    def team(self, abbr: str, fields: str | None = None) -> ApiResponse:
+        """
+        A team's games today (two on doubleheader days)
+
+        Args:
+            abbr (str): team abbreviation, e.g. NYY
+            fields (str | None): fields to keep
+
+        Returns:
+            ApiResponse: list of games
+
+        Raises:
+            NotFound: if the team doesn't play today
+        """
+        document: dict[str, Any] = self._document(EMAIL_DATA_BLOB)
+        abbr = abbr.strip().upper()
+        games: list[dict[str, Any]] = [
+            game for game in document.get("probables") or []
+            if abbr in (str((game.get(side) or {}).get("abbr") or "").upper() for side in ("away", "home"))
+        ]
+        if not games:
+            raise NotFound(f"{abbr} doesn't play today")
+        selected = parse_fields(fields)
+        return self._respond(("team", abbr, selected), document, lambda: select_fields(games, selected))
+
+    def leaders(self, group: str, stat: str, fields: str | None = None) -> ApiResponse:
+        """
+        A precomputed leaderboard
+
+        Args:
+            group (str): batting or pitching
+            stat (str): leaderboard stat, e.g. WAR or xFIP (case-insensitive)
+            fields (str | None): fields to keep, e.g. "PlayerName,TeamNameAbb,WAR"
+
+        Returns:
+            ApiResponse: leader rows
+
+        Raises:
+            NotFound: if there is no such leaderboard
+        """
+        blob: tuple[str, str] | None = LEADERBOARD_BLOBS.get(group.lower())
+        if blob is None:
+            raise NotFound(f"Unknown leaderboard group {group}; use batting or pitching")
+        document: dict[str, list[dict[str, Any]]] = self._document(blob)
+        name: str | None = next((name for name in document if name.lower() == stat.lower()), None)
+        if name is None:
+            raise NotFound(f"No {group} leaderboard for {stat}; available: {', '.join(document)}")
+        selected = parse_fields(fields)
+        return self._respond(
+            ("leaders", group.lower(), name, selected), document, lambda: select_fields(document[name], selected)
+        )
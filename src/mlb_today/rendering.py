@@ -0,0 +1,232 @@
+""" Email template environment, build-time precompilation and display formatting """
+import argparse
+import os
+import re
+import shutil
+from datetime import datetime
+from typing import Any, Callable
+
+from jinja2 import BaseLoader, Environment, FileSystemLoader, ModuleLoader, select_autoescape
+
+TEMPLATE_PATH: str = os.path.join(os.path.dirname(__file__), 'templates')
+COMPILED_TEMPLATE_PATH: str = os.path.join(TEMPLATE_PATH, 'compiled')
+
+_HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)  # Keep Outlook conditional comments
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_BETWEEN_TAGS = re.compile(r">\s+<")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def format_time_ampm(iso_string: str) -> str:
+    """Jinja2 filter to convert an ISO datetime string to a 12-hour AM/PM format."""
+    if not iso_string:
+        return ""
+    try:
+        dt_object = datetime.fromisoformat(iso_string)
+        # Format to 12-hour with AM/PM
+        formatted_time = dt_object.strftime("%I:%M %p")
+        # Remove leading zero for hours like '02:40 PM' -> '2:40 PM'
+        if formatted_time.startswith('0'):
+            return formatted_time[1:]
+        return formatted_time
+    except (ValueError, TypeError):
+        return iso_string  # Return original string on error
+
+
+def minify_markup(source: str) -> str:
+    """
+    Minify static template markup: drop comments and collapse whitespace between and inside tags
+
+    Args:
+        source (str): template source
+
+    Returns:
+        str: minified template source
+    """
+    source = _HTML_COMMENT.sub("", source)
+    source = _CSS_COMMENT.sub("", source)
+    source = _BETWEEN_TAGS.sub("><", source)
+    return _WHITESPACE.sub(" ", source).strip()
+
+
+class MinifyingLoader(FileSystemLoader):
+    """ FileSystemLoader that minifies template markup as it loads it """
+    def get_source(self, environment: Environment, template: str) -> tuple[str, str | None, Callable[[], bool]]:
+        source, filename, uptodate = super().get_source(environment, template)
+        return minify_markup(source), filename, uptodate
+
+
+def create_environment(loader: BaseLoader | None = None) -> Environment:
+    """
+    Create the email Jinja2 environment, using precompiled templates when a build is present
+
+    Args:
+        loader (BaseLoader | None): loader to use instead of the default
+
+    Returns:
+        Environment: Jinja2 environment
+    """
+    if loader is None:
+        if os.path.isdir(COMPILED_TEMPLATE_PATH):
+            loader = ModuleLoader(COMPILED_TEMPLATE_PATH)  # No parsing or compiling on cold start
+        else:
+            loader = MinifyingLoader(TEMPLATE_PATH)
+
+    environment: Environment = Environment(
+        loader=loader,
+        autoescape=select_autoescape(['html', 'xml'])
+    )
+    environment.filters['to_ampm'] = format_time_ampm
+    return environment
+
+
+def build_templates(target: str = COMPILED_TEMPLATE_PATH) -> list[str]:
+    """
+    Minify and precompile every template to Python modules for ModuleLoader
+
+    Args:
+        target (str): output directory (replaced)
+
+    Returns:
+        list[str]: compiled template names
+    """
+    environment: Environment = create_environment(MinifyingLoader(TEMPLATE_PATH))
+    names: list[str] = [name for name in environment.list_templates() if name.endswith('.jinja2')]
+
+    shutil.rmtree(target, ignore_errors=True)
+    environment.compile_templates(
+        target,
+        filter_func=lambda name: name.endswith('.jinja2'),
+        zip=None,
+        ignore_errors=False
+    )
+    return names
+
+
+def format_number(value: Any, decimals: int) -> str:
+    """
+    Format a stat for display, with "-" for missing values
+
+    Args:
+        value (Any): stat value
+        decimals (int): decimal places
+
+    Returns:
+        str: formatted stat
+    """
+    try:
+        return f"{float(value):.{decimals}f}"
+    except (ValueError, TypeError):
+        return "-"
+
+
+def format_percentile(value: Any) -> str:
+    """
+    Format a league percentile as an ordinal, e.g. 83 -> "83rd"
+
+    Args:
+        value (Any): percentile, 0-100
+
+    Returns:
+        str: ordinal, or "" for missing values
+    """
+    try:
+        number: int = int(value)
+    except (ValueError, TypeError):
+        return ""
+    suffix: str = "th" if 10 <= number % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
+    return f"{number}{suffix}"
+
+
+def format_rank(context: dict[str, Any]) -> str:
+    """
+    Format a rank among qualified players, e.g. "#4 of 131"
+
+    Args:
+        context (dict[str, Any]): one stat's league context (see LeagueStats.context)
+
+    Returns:
+        str: rank, or "" if the player isn't qualified
+    """
+    rank: Any = context.get("rank")
+    return f"#{rank} of {context.get('qualified')}" if rank else ""
+
+
+def format_context(context: dict[str, Any]) -> str:
+    """
+    Format a stat's league context, e.g. "83rd pct, #12 of 58"
+
+    Args:
+        context (dict[str, Any]): one stat's league context (see LeagueStats.context)
+
+    Returns:
+        str: percentile and, for qualified players, rank; "" if there is no context
+    """
+    percentile: str = format_percentile(context.get("pct"))
+    return ", ".join(part for part in (percentile and f"{percentile} pct", format_rank(context)) if part)
+
+
+def _format_pitcher(pitcher: dict[str, Any]) -> dict[str, Any]:
+    """ Display copy of a probable pitcher """
+    record: dict[str, Any] = pitcher.get("record", {})
+    return {
+        **pitcher,
+        "record": {"wins": format_number(record.get("wins"), 0), "losses": format_number(record.get("losses"), 0)},
+        "era": format_number(pitcher.get("era"), 2),
+        "xfip": format_number(pitcher.get("xfip"), 2),
+        "war": format_number(pitcher.get("war"), 2),
+        "context": {stat: format_context(context) for stat, context in (pitcher.get("league") or {}).items()}
+    }
+
+
+def prepare_email_data(email_data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Format every number in the email data for display, so the template only prints strings
+
+    Args:
+        email_data (dict[str, Any]): email data, as stored in email_data.json
+
+    Returns:
+        dict[str, Any]: probables, batting and pitching with formatted stats
+    """
+    probables: list[dict[str, Any]] = []
+    for game in email_data.get("probables") or []:
+        sides: dict[str, Any] = {}
+        for side in ("away", "home"):
+            team: dict[str, Any] = game.get(side) or {}
+            sides[side] = {**team, "pitcher": _format_pitcher(team.get("pitcher") or {})}
+        probables.append({**game, **sides})
+
+    batting: list[dict[str, Any]] = [
+        {
+            **batter,
+            "avg": format_number(batter.get("avg"), 3),
+            "hr": format_number(batter.get("hr"), 0),
+            "ops": format_number(batter.get("ops"), 3),
+            "ops_rank": format_rank((batter.get("league") or {}).get("ops") or {}),
+            "war": format_number(batter.get("war"), 3)
+        }
+        for batter in email_data.get("batting") or []
+    ]
+
+    pitching: list[dict[str, Any]] = [
+        {
+            **pitcher,
+            "w": format_number(pitcher.get("w"), 0),
+            "l": format_number(pitcher.get("l"), 0),
+            "era": format_number(pitcher.get("era"), 2),
+            "xfip": format_number(pitcher.get("xfip"), 2),
+            "war": format_number(pitcher.get("war"), 3)
+        }
+        for pitcher in email_data.get("pitching") or []
+    ]
+
+    return {"probables": probables, "batting": batting, "pitching": pitching}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompile the email templates for ModuleLoader")
+    parser.add_argument("--target", default=COMPILED_TEMPLATE_PATH, help="output directory")
+    arguments = parser.parse_args()
+    for template_name in build_templates(arguments.target):
+        print(f"Compiled {template_name} -> {arguments.target}")
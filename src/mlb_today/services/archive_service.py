@@ -0,0 +1,333 @@
+""" Service for the append-only archive of daily stats snapshots, read through memory-mapped local copies """
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from typing import Any, Iterable
+
+from azure.core.exceptions import ResourceNotFoundError
+
+import src.mlb_today.config as config
+from src.mlb_today.logger import logger
+from src.mlb_today.services.stats_table import PLAYER_ID_KEY, to_float
+from src.mlb_today.services.storage_service import StorageService
+
+ARCHIVE_DIRECTORY: str = config.ARCHIVE_DIRECTORY or os.path.join(tempfile.gettempdir(), "mlb-today", "archive")
+
+ARCHIVE_MAGIC: bytes = b"MLBA"
+ARCHIVE_VERSION: int = 1
+# Frame header: magic, version, stat column count, date (YYYY-MM-DD), player count, column names length
+FRAME_HEADER: struct.Struct = struct.Struct("<4sHH10sII")
+TEXT_COLUMNS: frozenset[str] = frozenset({"PlayerName", "TeamNameAbb"})  # Not archived; today's snapshot has them
+_INT: struct.Struct = struct.Struct("<i")
+_FLOAT: struct.Struct = struct.Struct("<f")
+_ALIGNMENT: int = 4
+
+_sync_lock = threading.Lock()  # One local copy per archive, shared by every instance in the process
+
+
+def archive_blob_filename(kind: str, season: str) -> str:
+    """
+    Name of a season's archive blob, e.g. archive/pitching/2025.bin
+
+    Args:
+        kind (str): snapshot kind, batting or pitching
+        season (str): season year
+
+    Returns:
+        str: blob file name
+    """
+    return f"archive/{kind}/{season}.bin"
+
+
+def _padding(length: int) -> int:
+    """ Zero bytes after the column names so the id and stat arrays start 4-byte aligned """
+    return -length % _ALIGNMENT
+
+
+def encode_frame(day: str, document: dict[str, Any], id_key: str = PLAYER_ID_KEY) -> bytes:
+    """
+    Encode one day's columnar snapshot as an archive frame: a header, the stat column names, player ids sorted
+    ascending (the frame's index) as int32, then one float32 array per stat in that player order (NaN if missing)
+
+    Args:
+        day (str): snapshot date in YYYY-MM-DD format
+        document (dict[str, Any]): columnar stats document
+        id_key (str): column holding the MLBAM player id
+
+    Returns:
+        bytes: frame, a multiple of 4 bytes long
+    """
+    columns: dict[str, list[Any]] = document.get("columns", {})
+    names: list[str] = [name for name in columns if name != id_key and name not in TEXT_COLUMNS]
+
+    positions_by_id: dict[int, int] = {}
+    for position, value in enumerate(columns.get(id_key) or []):
+        try:
+            positions_by_id.setdefault(int(value), position)  # First row wins, matching StatsTable
+        except (ValueError, TypeError):
+            continue
+    player_ids: list[int] = sorted(positions_by_id)
+    positions: list[int] = [positions_by_id[player_id] for player_id in player_ids]
+
+    encoded_names: bytes = "\n".join(names).encode("utf-8")
+    parts: list[bytes] = [
+        FRAME_HEADER.pack(
+            ARCHIVE_MAGIC, ARCHIVE_VERSION, len(names), day.encode("ascii"), len(player_ids), len(encoded_names)
+        ),
+        encoded_names,
+        b"\0" * _padding(FRAME_HEADER.size + len(encoded_names)),
+        struct.pack(f"<{len(player_ids)}i", *player_ids)
+    ]
+    for name in names:
+        values: list[Any] = columns[name]
+        parts.append(struct.pack(
+            f"<{len(positions)}f",
+            *(math.nan if (number := to_float(values[position])) is None else number for position in positions)
+        ))
+    return b"".join(parts)
+
+
+class ArchiveFrame:
+    """ Where one day's arrays sit in a season archive """
+    __slots__ = ("day", "rows", "columns", "ids_offset", "data_offset")
+
+    def __init__(self, day: str, rows: int, columns: list[str], ids_offset: int, data_offset: int):
+        self.day = day
+        self.rows = rows
+        self.columns: dict[str, int] = {name: index for index, name in enumerate(columns)}
+        self.ids_offset = ids_offset
+        self.data_offset = data_offset
+
+
+class SeasonArchive:
+    """ Memory-mapped season archive. Frames are indexed by date on open; nothing else is read until asked for. """
+    def __init__(self, path: str):
+        """
+        Map a local archive copy and index its frames
+
+        Args:
+            path (str): local archive file
+
+        Raises:
+            ValueError: if the file isn't a whole number of valid frames
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        size: int = os.fstat(self._file.fileno()).st_size
+        self._map: mmap.mmap | bytes = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.frames: dict[str, ArchiveFrame] = {}  # By date; a re-ingested date's later frame wins
+        try:
+            self._index(size)
+        except Exception:
+            self.close()
+            raise
+        self.days: list[str] = sorted(self.frames)
+
+    def _index(self, size: int) -> None:
+        """ Helper method to walk the frame headers """
+        offset: int = 0
+        while offset < size:
+            if offset + FRAME_HEADER.size > size:
+                raise ValueError(f"Truncated frame header at byte {offset} of {self.path}")
+            magic, version, column_count, day, rows, names_length = FRAME_HEADER.unpack_from(self._map, offset)
+            if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+                raise ValueError(f"Not an archive frame at byte {offset} of {self.path}")
+
+            names_offset: int = offset + FRAME_HEADER.size
+            names: bytes = self._map[names_offset:names_offset + names_length]
+            ids_offset: int = names_offset + names_length + _padding(FRAME_HEADER.size + names_length)
+            data_offset: int = ids_offset + _INT.size * rows
+            end: int = data_offset + _FLOAT.size * rows * column_count
+            if end > size:
+                raise ValueError(f"Truncated frame at byte {offset} of {self.path}")
+
+            columns: list[str] = names.decode("utf-8").split("\n") if names_length else []
+            self.frames[day.decode("ascii")] = ArchiveFrame(day.decode("ascii"), rows, columns, ids_offset, data_offset)
+            offset = end
+
+    def _position(self, frame: ArchiveFrame, player_id: int) -> int | None:
+        """ Helper method to binary search a frame's sorted player ids """
+        low, high = 0, frame.rows
+        while low < high:
+            middle: int = (low + high) // 2
+            (found,) = _INT.unpack_from(self._map, frame.ids_offset + _INT.size * middle)
+            if found < player_id:
+                low = middle + 1
+            elif found > player_id:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def series(self, player_id: Any, columns: Iterable[str] | None = None) -> list[dict[str, Any]]:
+        """
+        Get a player's stats on every archived date
+
+        Args:
+            player_id (Any): MLBAM player id (int or numeric string)
+            columns (Iterable[str] | None): stats to read (all archived stats if None)
+
+        Returns:
+            list[dict[str, Any]]: {"date": ..., stat: value} by date, only dates the player appears on;
+                stats missing that day read as None
+        """
+        try:
+            player_id = int(player_id)
+        except (ValueError, TypeError):
+            return []
+        wanted: list[str] | None = list(columns) if columns is not None else None
+
+        points: list[dict[str, Any]] = []
+        for day in self.days:
+            frame: ArchiveFrame = self.frames[day]
+            position: int | None = self._position(frame, player_id)
+            if position is None:
+                continue
+            point: dict[str, Any] = {"date": day}
+            for name in wanted if wanted is not None else frame.columns:
+                index: int | None = frame.columns.get(name)
+                if index is None:
+                    point[name] = None
+                    continue
+                offset: int = frame.data_offset + _FLOAT.size * (index * frame.rows + position)
+                (value,) = _FLOAT.unpack_from(self._map, offset)
+                point[name] = None if math.isnan(value) else float(f"{value:.7g}")  # Undo float32 rounding noise
+            points.append(point)
+        return points
+
+    def close(self) -> None:
+        """ Unmap and close the local copy """
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "SeasonArchive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ArchiveService:
+    """ Service for the append-only archive of daily stats snapshots, read through memory-mapped local copies """
+    def __init__(self, storage_service: StorageService | None = None, directory: str = ARCHIVE_DIRECTORY):
+        self.storage_service = storage_service or StorageService()
+        self.directory = directory
+
+    def append_snapshot(self, kind: str, day: str, document: dict[str, Any], if_missing: bool = False) -> bool:
+        """
+        Append a day's snapshot to its season's archive, partitioned by season (blob) and date (frame)
+
+        Args:
+            kind (str): snapshot kind, batting or pitching
+            day (str): snapshot date in YYYY-MM-DD format
+            document (dict[str, Any]): columnar stats document
+            if_missing (bool): skip if the date is already archived, e.g. for a snapshot that hasn't changed
+
+        Returns:
+            bool: True if a frame was appended
+        """
+        if if_missing and self.has_day(kind, day):
+            return False
+        frame: bytes = encode_frame(day, document)
+        blob_filename: str = archive_blob_filename(kind, day[:4])
+        self.storage_service.append_blob(blob_filename, frame)
+        logger.info(f"Archived {kind} for {day} to {blob_filename} ({len(frame)} bytes)")
+        return True
+
+    def has_day(self, kind: str, day: str) -> bool:
+        """
+        Check whether a date is already in its season's archive
+
+        Args:
+            kind (str): snapshot kind, batting or pitching
+            day (str): date in YYYY-MM-DD format
+
+        Returns:
+            bool: True if archived
+        """
+        try:
+            with self.open_season(kind, day[:4]) as archive:
+                return day in archive.frames
+        except ResourceNotFoundError:
+            return False
+
+    def _local_path(self, kind: str, season: str) -> str:
+        """ Helper method to get the local copy's path """
+        return os.path.join(self.directory, kind, f"{season}.bin")
+
+    def sync(self, kind: str, season: str) -> str:
+        """
+        Bring the local copy of a season's archive up to date, downloading only frames appended since the last sync
+
+        Args:
+            kind (str): snapshot kind, batting or pitching
+            season (str): season year
+
+        Returns:
+            str: local archive file
+
+        Raises:
+            ResourceNotFoundError: if nothing was archived for the season
+        """
+        path: str = self._local_path(kind, season)
+        blob_filename: str = archive_blob_filename(kind, season)
+        with _sync_lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            local_size: int = os.path.getsize(path) if os.path.exists(path) else 0
+            data, size = self.storage_service.read_blob_tail(blob_filename, local_size)
+            mode: str = "ab"
+            if size < local_size:  # Archive was recreated: start over
+                data, size = self.storage_service.read_blob_tail(blob_filename, 0)
+                mode = "wb"
+            if data or mode == "wb":
+                with open(path, mode) as archive_file:
+                    archive_file.write(data)
+        return path
+
+    def open_season(self, kind: str, season: str) -> SeasonArchive:
+        """
+        Sync and memory-map a season's archive; close it when done (it is a context manager)
+
+        Args:
+            kind (str): snapshot kind, batting or pitching
+            season (str): season year
+
+        Returns:
+            SeasonArchive: mapped archive
+
+        Raises:
+            ResourceNotFoundError: if nothing was archived for the season
+        """
+        path: str = self.sync(kind, season)
+        try:
+            return SeasonArchive(path)
+        except ValueError as err:  # Damaged local copy: download it again
+            logger.warning(f"Discarding local archive copy: {err}")
+            with _sync_lock:
+                os.remove(path)
+            return SeasonArchive(self.sync(kind, season))
+
+    def player_series(
+            self, kind: str, season: str, player_id: Any, columns: Iterable[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Get a player's stats on every archived date of a season
+
+        Args:
+            kind (str): snapshot kind, batting or pitching
+            season (str): season year
+            player_id (Any): MLBAM player id
+            columns (Iterable[str] | None): stats to read (all archived stats if None)
+
+        Returns:
+            list[dict[str, Any]]: {"date": ..., stat: value} by date (empty if the season has no archive)
+        """
+        try:
+            with self.open_season(kind, season) as archive:
+                return archive.series(player_id, columns)
+        except ResourceNotFoundError:
+            return []
@@ -0,0 +1,152 @@
+""" Warm-instance cache for parsed blobs, revalidated by ETag """
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+from typing import Any, Callable, Hashable
+
+from src.mlb_today.logger import logger
+
+
+class CacheEntry:
+    """ Parsed blob plus the ETag and raw size it was parsed from """
+    __slots__ = ("etag", "value", "size")
+
+    def __init__(self, etag: str, value: Any, size: int):
+        self.etag = etag
+        self.value = value
+        self.size = size
+
+
+class BlobCache:
+    """
+    Size-bounded LRU of parsed blobs that survives across warm invocations.
+
+    Entries are sized by the raw blob length. When a spill directory is configured,
+    raw blob bytes are also written there so an entry evicted from memory can be
+    revalidated and re-parsed without downloading the blob again.
+    """
+    def __init__(self, max_bytes: int, spill_directory: str | None = None):
+        self.max_bytes = max_bytes
+        self.spill_directory = spill_directory
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._total_bytes: int = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        """
+        Get a cached entry, marking it most recently used
+
+        Args:
+            key (Hashable): cache key
+
+        Returns:
+            CacheEntry | None: cached entry, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, etag: str, value: Any, size: int) -> None:
+        """
+        Cache a parsed blob, evicting least recently used entries over the byte budget
+
+        Args:
+            key (Hashable): cache key
+            etag (str): ETag of the blob the value was parsed from
+            value (Any): parsed blob
+            size (int): raw blob size in bytes
+        """
+        if size > self.max_bytes:  # Never let one blob flush the whole cache
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous.size
+
+            self._entries[key] = CacheEntry(etag, value, size)
+            self._total_bytes += size
+
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.size
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Drop a cached entry
+
+        Args:
+            key (Hashable): cache key
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry.size
+
+    def _spill_path(self, blob_key: str) -> str:
+        """ Path prefix for a blob's spill files """
+        digest: str = hashlib.sha1(blob_key.encode()).hexdigest()
+        return os.path.join(self.spill_directory, digest)
+
+    def read_spill(self, blob_key: str) -> tuple[str, bytes] | None:
+        """
+        Read a blob's raw bytes from the spill tier
+
+        Args:
+            blob_key (str): container/blob name
+
+        Returns:
+            tuple[str, bytes] | None: (etag, raw bytes), or None if not spilled
+        """
+        if not self.spill_directory:
+            return None
+
+        path: str = self._spill_path(blob_key)
+        try:
+            with open(f"{path}.etag", "r", encoding="utf-8") as etag_file:
+                etag: str = etag_file.read()
+            with open(f"{path}.blob", "rb") as blob_file:
+                return etag, blob_file.read()
+        except OSError:
+            return None
+
+    def write_spill(self, blob_key: str, etag: str, data: bytes) -> None:
+        """
+        Write a blob's raw bytes to the spill tier
+
+        Args:
+            blob_key (str): container/blob name
+            etag (str): blob ETag
+            data (bytes): raw blob bytes
+        """
+        if not self.spill_directory:
+            return
+
+        path: str = self._spill_path(blob_key)
+        try:
+            os.makedirs(self.spill_directory, exist_ok=True)
+            # Write the blob before its ETag, so a reader never pairs a new ETag with old bytes
+            with open(f"{path}.blob.tmp", "wb") as blob_file:
+                blob_file.write(data)
+            os.replace(f"{path}.blob.tmp", f"{path}.blob")
+            with open(f"{path}.etag.tmp", "w", encoding="utf-8") as etag_file:
+                etag_file.write(etag)
+            os.replace(f"{path}.etag.tmp", f"{path}.etag")
+        except OSError as err:
+            logger.warning(f"Could not spill {blob_key} to {self.spill_directory}: {err}")
+
+
+def parser_key(parser: Callable[[bytes], Any]) -> str:
+    """
+    Stable cache key component for a parser function
+
+    Args:
+        parser (Callable[[bytes], Any]): parser
+
+    Returns:
+        str: module-qualified parser name
+    """
+    return f"{getattr(parser, '__module__', '')}.{getattr(parser, '__qualname__', repr(parser))}"
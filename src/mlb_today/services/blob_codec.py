@@ -0,0 +1,236 @@
+""" Serializers and compression for stored documents, detected again on read """
+import gzip
+import json
+import zlib
+from functools import cache
+from typing import Any, Callable, Iterable, Iterator
+
+import src.mlb_today.config as config
+from src.mlb_today.services.json_stream import iter_encoded
+
+# orjson, msgpack and zstandard are the optional codecs extra; the default json codec and no compression need none
+
+try:  # Faster JSON, used for the orjson codec and for parsing every JSON blob
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BLOB_CODEC: str = config.BLOB_CODEC
+BLOB_COMPRESSION: str = config.BLOB_COMPRESSION
+
+JSON_CONTENT_TYPE: str = "application/json"
+MSGPACK_CONTENT_TYPE: str = "application/msgpack"
+GZIP_MAGIC: bytes = b"\x1f\x8b"
+ZSTD_MAGIC: bytes = b"\x28\xb5\x2f\xfd"
+# First bytes of a MessagePack map or array (fixmap, fixarray, array16/32, map16/32); JSON can't start with these
+MSGPACK_PREFIXES: frozenset[int] = frozenset(range(0x80, 0xa0)) | {0xdc, 0xdd, 0xde, 0xdf}
+
+
+class BlobCodec:
+    """ How a document is serialized: its name, Content-Type and encoder """
+    __slots__ = ("name", "content_type", "dumps", "streams")
+
+    def __init__(self, name: str, content_type: str, dumps: Callable[[Any], bytes], streams: bool = False):
+        self.name = name
+        self.content_type = content_type
+        self.dumps = dumps
+        self.streams = streams  # Encoded in chunks by iter_encoded instead of all at once
+
+
+def _json_dumps(value: Any) -> bytes:
+    """ Helper function for compact stdlib JSON """
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    """ Helper function for MessagePack """
+    return msgpack.packb(value, use_bin_type=True)
+
+
+CODECS: dict[str, BlobCodec] = {
+    "json": BlobCodec("json", JSON_CONTENT_TYPE, _json_dumps, streams=True),
+    "orjson": BlobCodec("orjson", JSON_CONTENT_TYPE, orjson.dumps if orjson else _json_dumps),
+    "msgpack": BlobCodec("msgpack", MSGPACK_CONTENT_TYPE, _msgpack_dumps)
+}
+COMPRESSIONS: tuple[str, ...] = ("none", "gzip", "zstd")
+
+
+@cache
+def get_codec(name: str) -> BlobCodec:
+    """
+    Get a codec by name
+
+    Args:
+        name (str): json, orjson or msgpack
+
+    Returns:
+        BlobCodec: codec
+
+    Raises:
+        ValueError: if the codec is unknown
+        RuntimeError: if the codec's package isn't installed
+    """
+    codec: BlobCodec | None = CODECS.get(name.strip().lower())
+    if codec is None:
+        raise ValueError(f"Unknown blob codec {name!r}; use one of {', '.join(CODECS)}")
+    if (codec.name == "orjson" and orjson is None) or (codec.name == "msgpack" and msgpack is None):
+        raise RuntimeError(f"Blob codec {codec.name} is configured but {codec.name} is not installed")
+    return codec
+
+
+@cache
+def get_compression(name: str) -> str | None:
+    """
+    Get a compression by name
+
+    Args:
+        name (str): none, gzip or zstd
+
+    Returns:
+        str | None: Content-Encoding, or None for uncompressed
+
+    Raises:
+        ValueError: if the compression is unknown
+        RuntimeError: if the compression's package isn't installed
+    """
+    name = name.strip().lower()
+    if name not in COMPRESSIONS:
+        raise ValueError(f"Unknown blob compression {name!r}; use one of {', '.join(COMPRESSIONS)}")
+    if name == "zstd" and zstandard is None:
+        raise RuntimeError("Blob compression zstd is configured but zstandard is not installed")
+    return None if name == "none" else name
+
+
+class EncodedBlob:
+    """ A serialized document, as chunks, with the Content-Type and Content-Encoding to store it under """
+    __slots__ = ("chunks", "content_type", "content_encoding")
+
+    def __init__(self, chunks: Iterable[bytes], content_type: str, content_encoding: str | None):
+        self.chunks = chunks
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+
+    @property
+    def data(self) -> bytes:
+        """ Whole blob content """
+        return b"".join(self.chunks)
+
+
+def compress_chunks(chunks: Iterable[bytes], content_encoding: str | None) -> Iterator[bytes]:
+    """
+    Compress a stream of chunks without holding the whole payload
+
+    Args:
+        chunks (Iterable[bytes]): uncompressed content
+        content_encoding (str | None): gzip, zstd or None (passed through)
+
+    Yields:
+        bytes: compressed chunks (never empty)
+    """
+    if content_encoding is None:
+        yield from chunks
+        return
+    if content_encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip header, no file name or time
+    else:
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    if tail := compressor.flush():
+        yield tail
+
+
+def encode_document(
+        document: Any, codec: str = BLOB_CODEC, compression: str = BLOB_COMPRESSION, stream: bool = False
+) -> EncodedBlob:
+    """
+    Serialize and compress a document for storage
+
+    Args:
+        document (Any): JSON-compatible document
+        codec (str): json, orjson or msgpack
+        compression (str): none, gzip or zstd
+        stream (bool): encode lazily in chunks where the codec allows it, for large documents
+
+    Returns:
+        EncodedBlob: encoded document
+
+    Raises:
+        ValueError: if the codec or compression is unknown
+        RuntimeError: if the codec's or compression's package isn't installed
+    """
+    blob_codec: BlobCodec = get_codec(codec)
+    content_encoding: str | None = get_compression(compression)
+    if stream and blob_codec.streams:
+        chunks: Iterable[bytes] = compress_chunks(iter_encoded(document), content_encoding)
+    else:
+        chunks = [b"".join(compress_chunks((blob_codec.dumps(document),), content_encoding))]
+    return EncodedBlob(chunks, blob_codec.content_type, content_encoding)
+
+
+def decompress(data: bytes, content_encoding: str | None = None) -> bytes:
+    """
+    Undo a blob's compression, from its Content-Encoding or, when that is unknown, its magic bytes
+
+    Args:
+        data (bytes): stored blob content
+        content_encoding (str | None): blob Content-Encoding, if known
+
+    Returns:
+        bytes: uncompressed content
+    """
+    encoding: str = (content_encoding or "").strip().lower()
+    if encoding == "gzip" or (not encoding and data[:2] == GZIP_MAGIC):
+        return gzip.decompress(data)
+    if encoding == "zstd" or (not encoding and data[:4] == ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("Blob is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def load_document(data: bytes) -> Any:
+    """
+    Parse an uncompressed blob, telling MessagePack from JSON by its first byte
+
+    Args:
+        data (bytes): uncompressed blob content
+
+    Returns:
+        Any: document
+    """
+    if data and data[0] in MSGPACK_PREFIXES:
+        if msgpack is None:
+            raise RuntimeError("Blob is MessagePack but msgpack is not installed")
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:  # e.g. NaN, which stdlib JSON writes but orjson rejects
+            pass
+    return json.loads(data)
+
+
+def decode_document(data: bytes, content_encoding: str | None = None) -> Any:
+    """
+    Decompress and parse a stored document in any codec and compression
+
+    Args:
+        data (bytes): stored blob content
+        content_encoding (str | None): blob Content-Encoding, if known
+
+    Returns:
+        Any: document
+    """
+    return load_document(decompress(data, content_encoding))
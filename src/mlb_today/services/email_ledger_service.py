@@ -0,0 +1,137 @@
+""" Service for the ledger of email data already sent, so duplicate blob triggers don't send again """
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+from typing import Any, Callable, Iterable
+
+import src.mlb_today.config as config
+from src.mlb_today.logger import logger
+from src.mlb_today.services.storage_service import StorageService
+
+EMAIL_LEDGER_BLOB: str = "ledger/email.json"  # In the stats container: writes to the email container trigger sends
+EMAIL_LEDGER_TTL: timedelta = timedelta(hours=config.EMAIL_LEDGER_TTL_HOURS)
+EMAIL_LEDGER_LEASE: timedelta = timedelta(minutes=config.EMAIL_LEDGER_LEASE_MINUTES)
+MAX_WRITE_ATTEMPTS: int = 5
+
+SENDING: str = "sending"
+SENT: str = "sent"
+PARTIAL: str = "partial"  # Some recipients got it; a retry sends to the rest
+
+
+def ledger_key(email_data: bytes, recipients: Iterable[str], preferences: str | None = None) -> str:
+    """
+    Ledger key for one email: a hash of the email data plus a hash of who gets it and how
+
+    Args:
+        email_data (bytes): raw email_data.json content
+        recipients (Iterable[str]): recipient email addresses
+        preferences (str | None): raw recipient preferences, since they change what is sent
+
+    Returns:
+        str: "<content hash>:<recipient set hash>"
+    """
+    content_hash: str = hashlib.sha256(email_data).hexdigest()
+    audience: str = json.dumps([sorted({address.strip().lower() for address in recipients}), preferences or ""])
+    recipients_hash: str = hashlib.sha256(audience.encode("utf-8")).hexdigest()[:16]
+    return f"{content_hash}:{recipients_hash}"
+
+
+class EmailLedgerService:
+    """ Service for the ledger of email data already sent, so duplicate blob triggers don't send again """
+    def __init__(self, storage_service: StorageService | None = None):
+        self.storage_service = storage_service or StorageService()
+
+    def _update(
+            self, key: str, change: Callable[[dict[str, Any] | None, datetime], dict[str, Any] | None | bool]
+    ) -> bool:
+        """
+        Helper method to apply a change to one ledger entry with optimistic concurrency, dropping expired entries
+
+        Args:
+            key (str): ledger key
+            change (Callable): given the current entry and the time, returns the new entry, None to remove it,
+                or False to leave the ledger alone
+
+        Returns:
+            bool: False if change declined to write, else True
+        """
+        for _ in range(MAX_WRITE_ATTEMPTS):
+            versioned: tuple[bytes, str] | None = self.storage_service.read_blob_versioned(EMAIL_LEDGER_BLOB)
+            entries: dict[str, dict[str, Any]] = json.loads(versioned[0]).get("entries", {}) if versioned else {}
+            now: datetime = datetime.now(timezone.utc)
+
+            entry: dict[str, Any] | None | bool = change(entries.get(key), now)
+            if entry is False:
+                return False
+            if entry is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = entry
+
+            cutoff: str = (now - EMAIL_LEDGER_TTL).isoformat()
+            entries = {name: value for name, value in entries.items() if value.get("at", "") >= cutoff}
+            data: str = json.dumps({"entries": entries}, separators=(",", ":"))
+            etag: str | None = versioned[1] if versioned else None
+            if self.storage_service.save_blob_if_unchanged(EMAIL_LEDGER_BLOB, data, etag):
+                return True
+            logger.info("Email ledger changed while updating it; retrying")  # Another invocation wrote first
+        raise RuntimeError(f"Could not update {EMAIL_LEDGER_BLOB} after {MAX_WRITE_ATTEMPTS} attempts")
+
+    def claim(self, key: str) -> set[str] | None:
+        """
+        Claim an email for sending, unless it was already sent or another invocation is sending it right now.
+        If the ledger can't be read or written, the email is sent anyway.
+
+        Args:
+            key (str): ledger key from ledger_key
+
+        Returns:
+            set[str] | None: addresses (lowercase) an earlier, partly failed send already reached, which the caller
+                should skip; None if the caller shouldn't send at all
+        """
+        delivered: set[str] = set()
+
+        def take(entry: dict[str, Any] | None, now: datetime) -> dict[str, Any] | bool:
+            if entry is not None:
+                if entry.get("status") == SENT:
+                    return False
+                if entry.get("status") == SENDING and now - datetime.fromisoformat(entry["at"]) < EMAIL_LEDGER_LEASE:
+                    return False
+                delivered.update(entry.get("delivered", []))  # PARTIAL, or a SENDING claim whose lease expired
+            return {"status": SENDING, "at": now.isoformat(), "delivered": sorted(delivered)}
+
+        try:
+            claimed: bool = self._update(key, take)
+        except Exception as err:  # Better a duplicate email than none
+            logger.warning(f"Email ledger unavailable, sending without it: {err}")
+            return set()
+        if not claimed:
+            logger.info(f"Email data {key[:12]} already sent or being sent; skipping")
+            return None
+        if delivered:
+            logger.info(f"Email data {key[:12]} already reached {len(delivered)} recipients; sending to the rest")
+        return delivered
+
+    def complete(self, key: str, delivered: Iterable[str], finished: bool) -> None:
+        """
+        Record a claimed email as sent, as partly sent so a retry reaches only the remaining recipients,
+        or release the claim if nobody got it
+
+        Args:
+            key (str): ledger key from ledger_key
+            delivered (Iterable[str]): addresses that got the email, including those from earlier attempts
+            finished (bool): whether every recipient got it
+        """
+        addresses: list[str] = sorted({address.strip().lower() for address in delivered})
+
+        def record(entry: dict[str, Any] | None, now: datetime) -> dict[str, Any] | None:
+            if finished:
+                return {"status": SENT, "at": now.isoformat()}
+            if addresses:
+                return {"status": PARTIAL, "at": now.isoformat(), "delivered": addresses}
+            return None
+
+        try:
+            self._update(key, record)
+        except Exception as err:
+            logger.warning(f"Could not record email {key[:12]} in the ledger: {err}")
@@ -1,11 +1,119 @@
 """Service for sending emails using Azure Communication Services."""
+from concurrent.futures import Future, ThreadPoolExecutor
+import random
+import threading
+import time
+from typing import Any
+import uuid
+
 from azure.communication.email import EmailClient
+from azure.core.exceptions import HttpResponseError
 
 import src.mlb_today.config as config
 from src.mlb_today.logger import logger
+from src.mlb_today.metrics import record_bytes, timed
 
 ACS_CONNECTION_STRING = config.ACS_CONNECTION_STRING
 ACS_SENDER_ADDRESS = config.ACS_SENDER_ADDRESS
+EMAIL_BATCH_SIZE: int = config.EMAIL_BATCH_SIZE
+EMAIL_MAX_CONCURRENCY: int = config.EMAIL_MAX_CONCURRENCY
+EMAIL_MAX_RETRIES: int = config.EMAIL_MAX_RETRIES
+EMAIL_BACKOFF_FACTOR: float = config.EMAIL_BACKOFF_FACTOR
+EMAIL_POLL_INTERVAL: float = config.EMAIL_POLL_INTERVAL
+EMAIL_SEND_TIMEOUT: float = config.EMAIL_SEND_TIMEOUT
+
+THROTTLED_STATUS_CODES: frozenset[int] = frozenset({429, 503})
+
+# One client per client class and connection string, shared by every send so its connections are reused
+_email_clients: dict[tuple[type, str], EmailClient] = {}
+_email_clients_lock = threading.Lock()
+
+
+def get_email_client(connection_string: str) -> EmailClient:
+    """
+    Get the process-wide EmailClient for a connection string, creating it on first use
+
+    Args:
+        connection_string (str): ACS connection string
+
+    Returns:
+        EmailClient: shared client
+    """
+    key: tuple[type, str] = (EmailClient, connection_string)
+    client: EmailClient | None = _email_clients.get(key)
+    if client is None:
+        with _email_clients_lock:
+            client = _email_clients.get(key)
+            if client is None:
+                client = EmailClient.from_connection_string(connection_string)
+                _email_clients[key] = client
+    return client
+
+
+def retry_after_seconds(err: HttpResponseError) -> float | None:
+    """
+    Read the server's requested delay from a throttled response
+
+    Args:
+        err (HttpResponseError): error raised by the ACS client
+
+    Returns:
+        float | None: seconds to wait, or None if the response doesn't say
+    """
+    headers = getattr(getattr(err, "response", None), "headers", None) or {}
+    for header, scale in (("retry-after-ms", 0.001), ("x-ms-retry-after-ms", 0.001), ("Retry-After", 1.0)):
+        value = headers.get(header)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                continue
+    return None
+
+
+class RateLimiter:
+    """Shared pause for every sender once ACS starts throttling, so they back off together."""
+    def __init__(self, backoff_factor: float):
+        self.backoff_factor = backoff_factor
+        self._resume_at: float = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Sleep until any backoff in effect has passed."""
+        while True:
+            with self._lock:
+                delay: float = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def back_off(self, attempt: int, retry_after: float | None = None) -> None:
+        """
+        Pause every sender, for the server's Retry-After or a jittered exponential delay.
+
+        Args:
+            attempt (int): failed attempts so far for this message
+            retry_after (float | None): delay requested by the server, in seconds
+        """
+        delay: float = retry_after if retry_after is not None else self.backoff_factor * 2 ** attempt
+        delay += random.uniform(0, self.backoff_factor)  # Spread the senders' retries out
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+
+class DeliveryResult:
+    """Outcome of one message: its recipients, the ACS operation id and final status."""
+    __slots__ = ("recipients", "operation_id", "status", "error")
+
+    def __init__(self, recipients: list[dict[str, str]], operation_id: str):
+        self.recipients = recipients
+        self.operation_id = operation_id
+        self.status: str = "NotStarted"
+        self.error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == "Succeeded"
 
 
 # noinspection PyMethodMayBeStatic,PyProtectedMember
@@ -22,65 +130,149 @@ class EmailService:
             return []
         return [{'address': addr.strip()} for addr in email_str_list.split(',') if addr.strip()]
 
-    def send_email_with_acs(self, subject, html_body, to_recipients, cc_recipients=None):
-        """Sends an HTML email using Azure Communication Services."""
+    def _normalize_recipients(self, recipients) -> list[dict[str, str]]:
+        """Accepts a comma-separated string, a list of address dicts or an iterable of address strings."""
+        if isinstance(recipients, str):
+            return self.create_email_recipients(recipients)
+        if isinstance(recipients, list):
+            return recipients
+        return [{'address': addr.strip()} for addr in recipients if addr.strip()]
+
+    def send_email_with_acs(self, subject, html_body, to_recipients, cc_recipients=None) -> list[DeliveryResult]:
+        """
+        Sends an HTML email using Azure Communication Services.
+
+        Args:
+            subject: Email subject.
+            html_body: Rendered HTML body.
+            to_recipients: Comma-separated string or list of recipients.
+            cc_recipients: Comma-separated string or list of recipients copied on the first message.
+
+        Returns:
+            list[DeliveryResult]: one result per message (empty if nothing was sent)
+        """
+        return self.send_personalized_with_acs(subject, [(html_body, to_recipients)], cc_recipients)
+
+    @timed("email.send")
+    def send_personalized_with_acs(self, subject, bodies, cc_recipients=None) -> list[DeliveryResult]:
+        """
+        Sends HTML emails, each body to its own recipients, using Azure Communication Services.
+
+        Recipients are split into messages of EMAIL_BATCH_SIZE, submitted concurrently through one shared client,
+        and their send operations are then awaited together. A failed message is logged and reported without
+        affecting the others.
+
+        Args:
+            subject: Email subject.
+            bodies: List of (HTML body, recipients) pairs; recipients as for send_email_with_acs.
+            cc_recipients: Comma-separated string or list of recipients copied on the first message.
+
+        Returns:
+            list[DeliveryResult]: one result per message (empty if nothing was sent)
+        """
         if not ACS_CONNECTION_STRING:
             logger.error("ACS_CONNECTION_STRING is not set. Cannot send email.")
-            return
+            return []
         if not ACS_SENDER_ADDRESS:
             logger.error("ACS_SENDER_ADDRESS is not set. Cannot send email.")
-            return
-        if not to_recipients:
+            return []
+        if not any(to_recipients for _, to_recipients in bodies):
             logger.error("No TO_EMAIL recipients specified. Cannot send email.")
-            return
+            return []
+
+        cc_list: list[dict[str, str]] = self._normalize_recipients(cc_recipients) if cc_recipients else []
+        batch_size: int = max(1, EMAIL_BATCH_SIZE)
+        messages: list[dict[str, Any]] = []
+        results: list[DeliveryResult] = []
+        for html_body, to_recipients in bodies:
+            to_list: list[dict[str, str]] = self._normalize_recipients(to_recipients) if to_recipients else []
+            for start in range(0, len(to_list), batch_size):
+                batch: list[dict[str, str]] = to_list[start:start + batch_size]
+                messages.append({
+                    "content": {"subject": subject, "html": html_body},
+                    "recipients": {"to": batch, "cc": cc_list if not messages and cc_list else ""},
+                    "senderAddress": ACS_SENDER_ADDRESS
+                })
+                results.append(DeliveryResult(batch, str(uuid.uuid4())))
 
         try:
-            email_client = EmailClient.from_connection_string(ACS_CONNECTION_STRING)
-            content = {
-                "subject": subject,
-                "html": html_body
-            }
+            email_client: EmailClient = get_email_client(ACS_CONNECTION_STRING)
+        except Exception as e:
+            logger.error(f"Failed to create ACS email client: {e}", exc_info=True)
+            return results
 
-            if isinstance(to_recipients, str):
-                to_list = self.create_email_recipients(to_recipients)
-            elif isinstance(to_recipients, list):
-                to_list = to_recipients
-            else:
-                to_list = [addr.strip() for addr in to_recipients]
-
-            recipients_obj = to_list
-
-            if cc_recipients:
-                if isinstance(cc_recipients, str):
-                    cc_list = self.create_email_recipients(cc_recipients)
-                elif isinstance(cc_recipients, list):
-                    cc_list = cc_recipients
-                else:
-                    cc_list = [addr.strip() for addr in cc_recipients]
-            else:
-                cc_list = None
-
-            message = {
-                "content": content,
-                "recipients": {
-                    "to": recipients_obj,
-                    "cc": cc_list if cc_list else ""
-                },
-                "senderAddress": ACS_SENDER_ADDRESS
-            }
+        pollers: dict[int, Any] = self._submit_all(email_client, messages, results)
+        self._await_all(pollers, results)
+        record_bytes(sum(len(messages[index]["content"]["html"].encode("utf-8")) for index in pollers))
 
-            poller = email_client.begin_send(message)
-            result = poller.result()
+        sent: int = sum(result.succeeded for result in results)
+        if sent == len(results):
+            logger.info(f"Email sent successfully via ACS ({sent} messages).")
+        else:
+            logger.error(f"ACS Email: {sent} of {len(results)} messages sent.")
+            for result in results:
+                if not result.succeeded:
+                    addresses: str = ", ".join(recipient.get('address', '?') for recipient in result.recipients)
+                    logger.error(f"ACS Email to {addresses} {result.status}: {result.error}")
+        return results
 
-            if poller.done() and result:
-                logger.info(f"Email sent successfully via ACS.")
-            else:
-                logger.error(
-                    f"ACS Email send operation finished, but status indicates failure or is unknown. Poller status: "
-                    f"{poller.status()}"
-                )
-                if hasattr(poller, '_operation') and hasattr(poller._operation, 'details'):
-                    logger.error(f"ACS Error details: {poller._operation.details}")
+    def _begin_send(self, email_client: EmailClient, message: dict[str, Any], operation_id: str,
+                    rate_limiter: RateLimiter) -> Any:
+        """Starts one send, backing off (with every other sender) while ACS is throttling."""
+        attempt: int = 0
+        while True:
+            rate_limiter.wait()
+            try:
+                # The operation id makes a retried submission idempotent on the ACS side
+                return email_client.begin_send(message, operation_id=operation_id)
+            except HttpResponseError as err:
+                if err.status_code not in THROTTLED_STATUS_CODES or attempt >= EMAIL_MAX_RETRIES:
+                    raise
+                rate_limiter.back_off(attempt, retry_after_seconds(err))
+                attempt += 1
+                logger.warning(f"ACS throttled send {operation_id} ({err.status_code}); retry {attempt}")
 
-        except Exception as e:
-            logger.error(f"Failed to send email via ACS: {e}", exc_info=True)
+    def _submit_all(self, email_client: EmailClient, messages: list[dict[str, Any]],
+                    results: list[DeliveryResult]) -> dict[int, Any]:
+        """Submits every message with bounded parallelism; returns the pollers of those accepted, by index."""
+        rate_limiter: RateLimiter = RateLimiter(EMAIL_BACKOFF_FACTOR)
+        pollers: dict[int, Any] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(EMAIL_MAX_CONCURRENCY, len(messages)))) as executor:
+            futures: dict[int, Future] = {
+                index: executor.submit(self._begin_send, email_client, message, results[index].operation_id,
+                                       rate_limiter)
+                for index, message in enumerate(messages)
+            }
+            for index, future in futures.items():
+                try:
+                    pollers[index] = future.result()
+                    results[index].status = "Running"
+                except Exception as e:  # This message failed; the others carry on
+                    results[index].status = "Failed"
+                    results[index].error = str(e)
+        return pollers
+
+    def _await_all(self, pollers: dict[int, Any], results: list[DeliveryResult]) -> None:
+        """Waits for every accepted send together; their pollers already poll ACS in the background."""
+        deadline: float = time.monotonic() + EMAIL_SEND_TIMEOUT
+        pending: dict[int, Any] = dict(pollers)
+        while pending:
+            for index, poller in list(pending.items()):
+                if not poller.done():
+                    continue
+                del pending[index]
+                try:
+                    result = poller.result()
+                    results[index].status = (result or {}).get("status") or poller.status()
+                    results[index].error = str((result or {}).get("error") or "") or None
+                except Exception as e:  # Failed operation
+                    results[index].status = "Failed"
+                    results[index].error = str(e)
+                    if hasattr(poller, '_operation') and hasattr(poller._operation, 'details'):
+                        logger.error(f"ACS Error details: {poller._operation.details}")
+            if pending:
+                if time.monotonic() >= deadline:
+                    for index, poller in pending.items():
+                        results[index].status = f"TimedOut ({poller.status()})"
+                    return
+                time.sleep(EMAIL_POLL_INTERVAL)
@@ -1,18 +1,24 @@
 """ Fangraphs API service """
-from typing import Any
+from typing import Any, Callable, Iterable
 
 import requests
 
 from src.mlb_today.logger import logger
 import src.mlb_today.config as config
+from src.mlb_today.metrics import timed
+from src.mlb_today.services.http_client import HttpClient, get_http_client
+from src.mlb_today.services.json_stream import iter_array_items
+from src.mlb_today.services.stats_format import to_columnar
 
 STATS_ENDPOINT: str = config.STATS_ENDPOINT
 
 class FangraphsService:
     """ Fangraphs API service """
     def __init__(self):
+        self.http_client: HttpClient = get_http_client()  # Shared, pooled client
         self.endpoint = STATS_ENDPOINT
 
+    @timed("fangraphs.get_data")
     def get_data(
             self, position: str, stats_type: str, year: str, sort_dir: str = None, sort_stat: str = None
     ) -> dict[str, Any] | None:
@@ -29,7 +35,59 @@ class FangraphsService:
         Returns:
             dict[str, Any]: data from Fangraphs API
         """
-        payload: dict[str, Any] = {  # Create payload
+        payload: dict[str, Any] = self._create_payload(position, stats_type, year, sort_dir, sort_stat)
+
+        try:
+            data: dict[str, Any] = self.http_client.get_json(self.endpoint, params=payload)  # Get data
+        except (requests.exceptions.RequestException, ValueError) as err:  # HTTP, connection or JSON errors
+            logger.error(err)
+            return None
+
+        return data
+
+    @timed("fangraphs.stream_data")
+    def stream_data(
+            self,
+            position: str,
+            stats_type: str,
+            year: str,
+            columns: Iterable[str],
+            sort_dir: str = None,
+            sort_stat: str = None,
+            row_filter: Callable[[dict[str, Any]], bool] | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Stream data from Fangraphs API into a projected, columnar document.
+        Rows are parsed one at a time as the response arrives, so the full league dump is never in memory.
+
+        Args:
+            position (str): position to get stats for
+            stats_type (str): type of stats to get
+            year (int): year to get stats for
+            columns (Iterable[str]): columns to keep from each row
+            sort_dir (str): sort direction
+            sort_stat (str): sort stat
+            row_filter (Callable[[dict[str, Any]], bool] | None): keep only rows this returns True for
+
+        Returns:
+            dict[str, Any]: columnar stats document
+        """
+        payload: dict[str, Any] = self._create_payload(position, stats_type, year, sort_dir, sort_stat)
+
+        try:
+            rows = iter_array_items(self.http_client.iter_bytes(self.endpoint, params=payload), "data")
+            if row_filter:
+                rows = (row for row in rows if row_filter(row))
+            return to_columnar(rows, columns)  # Projects each row as it is parsed
+        except (requests.exceptions.RequestException, ValueError) as err:  # HTTP, connection or JSON errors
+            logger.error(err)
+            return None
+
+    def _create_payload(
+            self, position: str, stats_type: str, year: str, sort_dir: str = None, sort_stat: str = None
+    ) -> dict[str, Any]:
+        """ Create Fangraphs leaderboard query parameters """
+        return {
             "pos": position,
             "stats": stats_type,
             "lg": "all",
@@ -39,12 +97,3 @@ class FangraphsService:
             "sortDir": sort_dir,
             "sortStat": sort_stat
         }
-
-        try:
-            r: requests.Response = requests.get(self.endpoint, params=payload)  # Get data
-            r.raise_for_status()  # Raise error for HTTP status code
-        except requests.exceptions.HTTPError or requests.exceptions.RequestException as err:
-            logger.error(err)
-            return None
-
-        return r.json()
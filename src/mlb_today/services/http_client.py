@@ -0,0 +1,165 @@
+""" Shared HTTP client for upstream APIs """
+from collections import OrderedDict
+import threading
+from typing import Any, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import src.mlb_today.config as config
+from src.mlb_today.logger import logger
+from src.mlb_today.metrics import record_bytes
+
+try:  # urllib3 only decodes brotli responses when a brotli package is installed
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING: str = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+RETRY_STATUS_CODES: tuple[int, ...] = (429, 500, 502, 503, 504)
+
+
+class CachedResponse:
+    """ Validators and parsed body of an earlier 200 response """
+    __slots__ = ("etag", "last_modified", "body")
+
+    def __init__(self, etag: str | None, last_modified: str | None, body: Any):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+
+
+class HttpClient:
+    """ Pooled, retrying HTTP client with gzip/brotli negotiation and conditional GETs """
+    def __init__(
+            self,
+            timeout: float = config.HTTP_TIMEOUT,
+            max_retries: int = config.HTTP_MAX_RETRIES,
+            backoff_factor: float = config.HTTP_BACKOFF_FACTOR,
+            pool_maxsize: int = config.HTTP_POOL_MAXSIZE,
+            cache_entries: int = config.HTTP_CACHE_ENTRIES
+    ):
+        self.timeout = timeout
+        self.cache_entries = cache_entries
+        self._cache: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+        retry_options: dict[str, Any] = {
+            "total": max_retries,
+            "connect": max_retries,
+            "read": max_retries,
+            "status": max_retries,
+            "backoff_factor": backoff_factor,
+            "status_forcelist": RETRY_STATUS_CODES,
+            "allowed_methods": frozenset({"GET", "HEAD"}),
+            "respect_retry_after_header": True,
+            "raise_on_status": False  # Hand the last response to raise_for_status
+        }
+        try:
+            retry: Retry = Retry(backoff_jitter=backoff_factor, **retry_options)
+        except TypeError:  # urllib3 < 2 has no jitter option
+            retry = Retry(**retry_options)
+
+        adapter: HTTPAdapter = HTTPAdapter(  # One keep-alive pool per host
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+
+        self.session: requests.Session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Accept": "application/json"})
+
+    def get_json(self, url: str, params: dict[str, Any] | None = None) -> Any:
+        """
+        GET a JSON resource, revalidating any earlier response with If-None-Match/If-Modified-Since
+
+        Args:
+            url (str): endpoint URL
+            params (dict[str, Any] | None): query parameters
+
+        Returns:
+            Any: parsed JSON body (shared with the cache on a 304, so don't mutate it)
+
+        Raises:
+            requests.exceptions.RequestException: on connection errors, or HTTP errors after retries
+        """
+        request: requests.PreparedRequest = self.session.prepare_request(
+            requests.Request("GET", url, params=params)
+        )
+        cache_key: str = request.url
+
+        with self._lock:
+            cached: CachedResponse | None = self._cache.get(cache_key)
+        if cached:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        r: requests.Response = self.session.send(request, timeout=self.timeout)
+
+        if r.status_code == 304 and cached:
+            logger.info(f"{url} not modified; using cached response")
+            return cached.body
+
+        r.raise_for_status()  # Raise error for HTTP status code
+        record_bytes(len(r.content))
+        body: Any = r.json()
+
+        etag: str | None = r.headers.get("ETag")
+        last_modified: str | None = r.headers.get("Last-Modified")
+        if (etag or last_modified) and self.cache_entries > 0:
+            with self._lock:
+                self._cache[cache_key] = CachedResponse(etag, last_modified, body)
+                self._cache.move_to_end(cache_key)
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+
+        return body
+
+    def iter_bytes(self, url: str, params: dict[str, Any] | None = None, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        GET a resource and yield its decompressed body in chunks, without buffering the whole response
+
+        Args:
+            url (str): endpoint URL
+            params (dict[str, Any] | None): query parameters
+            chunk_size (int): chunk size in bytes
+
+        Returns:
+            Iterator[bytes]: body chunks
+
+        Raises:
+            requests.exceptions.RequestException: on connection errors, or HTTP errors after retries
+        """
+        with self.session.get(url, params=params, timeout=self.timeout, stream=True) as r:
+            r.raise_for_status()  # Raise error for HTTP status code
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                record_bytes(len(chunk))
+                yield chunk
+
+
+_http_client: HttpClient | None = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Get the process-wide HTTP client, so connections are reused across services and warm invocations
+
+    Returns:
+        HttpClient: shared HTTP client
+    """
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient()
+    return _http_client
@@ -0,0 +1,137 @@
+""" Incremental JSON parsing and encoding for large payloads """
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+WHITESPACE: str = " \t\n\r"
+
+_decoder: json.JSONDecoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """ Text buffer fed from a byte stream, trimmed as values are consumed """
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text: str = ""
+        self.pos: int = 0
+        self.exhausted: bool = False
+
+    def fill(self) -> bool:
+        """ Append the next chunk, returning False once the stream is exhausted """
+        if self.exhausted:
+            return False
+        if self.pos > 65536:  # Drop consumed text so the buffer stays about one chunk long
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        try:
+            self.text += self._decoder.decode(next(self._chunks))
+        except StopIteration:
+            self.text += self._decoder.decode(b"", final=True)
+            self.exhausted = True
+        return True
+
+    def skip_whitespace(self) -> str:
+        """ Skip whitespace and return the next character, reading more input as needed """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def expect(self, char: str) -> None:
+        """ Consume one expected structural character """
+        if self.skip_whitespace() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of JSON stream")
+        self.pos += 1
+
+    def decode_value(self) -> Any:
+        """ Decode the next complete JSON value """
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # A value is only complete once a delimiter follows it; "12" may be the start of "123"
+                if end < len(self.text) or self.exhausted:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.exhausted:
+                    raise
+            self.fill()
+
+
+def iter_array_items(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Yield the items of a top-level object's array member as the bytes arrive,
+    e.g. each row of a Fangraphs {"data": [...], "totalCount": N} response.
+    Only one item is decoded at a time; other members are decoded and discarded.
+
+    Args:
+        chunks (Iterable[bytes]): response body chunks
+        key (str): name of the array member to stream
+
+    Returns:
+        Iterator[Any]: decoded array items
+    """
+    buffer: _Buffer = _Buffer(chunks)
+    buffer.expect("{")
+    if buffer.skip_whitespace() == "}":
+        return
+
+    while True:
+        member: str = buffer.decode_value()
+        buffer.expect(":")
+
+        if member == key:
+            buffer.expect("[")
+            if buffer.skip_whitespace() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield buffer.decode_value()
+                    separator: str = buffer.skip_whitespace()
+                    buffer.pos += 1
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise ValueError(f"Expected ',' or ']' at offset {buffer.pos - 1} of JSON stream")
+        else:
+            buffer.decode_value()
+
+        separator = buffer.skip_whitespace()
+        buffer.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or '}}' at offset {buffer.pos - 1} of JSON stream")
+
+
+def iter_encoded(value: Any, chunk_size: int = 4 * 1024 * 1024) -> Iterator[bytes]:
+    """
+    Encode a value as compact JSON, yielding UTF-8 chunks of about chunk_size bytes
+
+    Args:
+        value (Any): value to encode
+        chunk_size (int): target chunk size in bytes
+
+    Returns:
+        Iterator[bytes]: encoded chunks
+    """
+    encoder: json.JSONEncoder = json.JSONEncoder(separators=(",", ":"))
+    pending: list[bytes] = []
+    pending_size: int = 0
+
+    for fragment in encoder.iterencode(value):
+        encoded: bytes = fragment.encode("utf-8")
+        pending.append(encoded)
+        pending_size += len(encoded)
+        if pending_size >= chunk_size:
+            yield b"".join(pending)
+            pending = []
+            pending_size = 0
+
+    if pending:
+        yield b"".join(pending)
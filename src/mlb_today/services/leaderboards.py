@@ -0,0 +1,119 @@
+""" Stat leaderboards precomputed at ingest time """
+import heapq
+from typing import Any, Iterable
+
+import src.mlb_today.config as config
+from src.mlb_today.logger import logger
+from src.mlb_today.services.stats_table import to_float
+
+LEADERBOARD_SIZE: int = config.LEADERBOARD_SIZE
+
+
+class LeaderboardSpec:
+    """ How to rank one stat, and whether only qualified players are eligible """
+    __slots__ = ("stat", "descending", "qualified")
+
+    def __init__(self, stat: str, descending: bool = True, qualified: bool = False):
+        self.stat = stat
+        self.descending = descending
+        self.qualified = qualified
+
+
+BATTING_LEADERBOARD_SPECS: dict[str, LeaderboardSpec] = {
+    "WAR": LeaderboardSpec("WAR"),
+    "HR": LeaderboardSpec("HR"),
+    "OPS": LeaderboardSpec("OPS", qualified=True),
+    "AVG": LeaderboardSpec("AVG", qualified=True),
+    "K%": LeaderboardSpec("K%", descending=False, qualified=True)
+}
+
+PITCHING_LEADERBOARD_SPECS: dict[str, LeaderboardSpec] = {
+    "WAR": LeaderboardSpec("WAR"),
+    "W": LeaderboardSpec("W"),
+    "ERA": LeaderboardSpec("ERA", descending=False, qualified=True),
+    "xFIP": LeaderboardSpec("xFIP", descending=False, qualified=True),
+    "K%": LeaderboardSpec("K%", qualified=True)
+}
+
+# Playing time column and minimum for qualified leaderboards
+BATTING_QUALIFIER: tuple[str, float] = ("PA", config.QUALIFIED_MIN_PA)
+PITCHING_QUALIFIER: tuple[str, float] = ("IP", config.QUALIFIED_MIN_IP)
+
+
+def select_specs(names: Iterable[str], specs: dict[str, LeaderboardSpec]) -> list[LeaderboardSpec]:
+    """
+    Look up configured leaderboard names
+
+    Args:
+        names (Iterable[str]): configured stat names
+        specs (dict[str, LeaderboardSpec]): known leaderboards
+
+    Returns:
+        list[LeaderboardSpec]: known leaderboards, in configured order
+    """
+    selected: list[LeaderboardSpec] = []
+    for name in names:
+        if name in specs:
+            selected.append(specs[name])
+        else:
+            logger.warning(f"Unknown leaderboard '{name}'; skipping")
+    return selected
+
+
+def compute_leaderboards(
+        document: dict[str, Any],
+        specs: list[LeaderboardSpec],
+        qualifier: tuple[str, float],
+        size: int = LEADERBOARD_SIZE
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Compute every leaderboard in one pass over a columnar stats document, keeping a bounded heap per stat.
+    Ties keep leaderboard (WAR) order.
+
+    Args:
+        document (dict[str, Any]): columnar stats document
+        specs (list[LeaderboardSpec]): leaderboards to compute
+        qualifier (tuple[str, float]): playing time column and minimum for qualified leaderboards
+        size (int): players per leaderboard
+
+    Returns:
+        dict[str, list[dict[str, Any]]]: leader rows (all stored columns), by stat
+    """
+    columns: dict[str, list[Any]] = document.get("columns", {})
+    row_count: int = document.get("rows", 0)
+    qualifier_column, qualifier_min = qualifier
+    playing_time: list[Any] = columns.get(qualifier_column) or [None] * row_count
+
+    boards: list[tuple[LeaderboardSpec, list[Any], list[tuple[float, int]]]] = []
+    for spec in specs:
+        if spec.stat not in columns:
+            logger.warning(f"No {spec.stat} column in stats snapshot; skipping leaderboard")
+            continue
+        boards.append((spec, columns[spec.stat], []))
+
+    for position in range(row_count):
+        time_played: float | None = to_float(playing_time[position])
+        is_qualified: bool = time_played is not None and time_played >= qualifier_min
+
+        for spec, values, heap in boards:
+            if spec.qualified and not is_qualified:
+                continue
+            value: float | None = to_float(values[position])
+            if value is None:
+                continue
+            # Min-heap of the best `size` so far; on ties the later row sorts lower and is evicted first
+            entry: tuple[float, int] = (value if spec.descending else -value, -position)
+            if len(heap) < size:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    names: list[str] = list(columns)
+    arrays: list[list[Any]] = list(columns.values())
+    return {
+        spec.stat: [
+            dict(zip(names, (array[-negative_position] for array in arrays)))
+            for _, negative_position in sorted(heap, reverse=True)
+        ]
+        for spec, _, heap in boards
+    }
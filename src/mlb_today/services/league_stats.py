@@ -0,0 +1,109 @@
+""" League context for Fangraphs stats: percentile ranks, z-scores and qualified ranks for every player """
+import math
+from typing import Any, Iterable
+
+import numpy as np
+
+from src.mlb_today.logger import logger
+from src.mlb_today.services.leaderboards import LeaderboardSpec
+from src.mlb_today.services.stats_table import to_float
+
+
+class StatContext:
+    """ One stat's league context, computed for every stats row at once (NaN where it doesn't apply) """
+    __slots__ = ("percentile", "z_score", "rank", "qualified")
+
+    def __init__(self, percentile: np.ndarray, z_score: np.ndarray, rank: np.ndarray, qualified: int):
+        self.percentile = percentile
+        self.z_score = z_score  # Standard deviations of the raw value from the league mean (a high ERA is positive)
+        self.rank = rank
+        self.qualified = qualified  # Players in the qualified ranking
+
+    def at(self, position: int) -> tuple[float, float, float]:
+        """ Percentile, z-score and qualified rank of one stats row """
+        return float(self.percentile[position]), float(self.z_score[position]), float(self.rank[position])
+
+
+class LeagueStats:
+    """ Column arrays of a columnar stats snapshot, with league context computed for whole columns at once """
+    def __init__(self, document: dict[str, Any], specs: Iterable[LeaderboardSpec], qualifier: tuple[str, float]):
+        """
+        Convert the stat columns once and compute every spec's context
+
+        Args:
+            document (dict[str, Any]): columnar stats document (see stats_format)
+            specs (Iterable[LeaderboardSpec]): stats to put in context; descending means higher is better
+            qualifier (tuple[str, float]): playing time column and minimum for qualified ranks
+        """
+        columns: dict[str, list[Any]] = document.get("columns", {})
+        self.row_count: int = document.get("rows", 0)
+        self._positions: dict[str, int] = document.get("index") or {}
+
+        qualifier_column, qualifier_min = qualifier
+        is_qualified: np.ndarray = self._column(columns.get(qualifier_column)) >= qualifier_min  # NaN compares False
+
+        self.stats: dict[str, StatContext] = {}
+        for spec in specs:
+            if spec.stat not in columns:
+                logger.warning(f"No {spec.stat} column in stats snapshot; no league context for it")
+                continue
+            self.stats[spec.stat] = self._context(self._column(columns[spec.stat]), is_qualified, spec.descending)
+
+    def _column(self, values: list[Any] | None) -> np.ndarray:
+        """ Helper method to convert a stored column to floats, NaN where missing or non-numeric """
+        if values is None:
+            return np.full(self.row_count, np.nan)
+        try:  # Numbers, numeric strings and None (as NaN) convert in one call
+            return np.array(values, dtype=float)
+        except (ValueError, TypeError):  # A stray non-numeric value, e.g. "-": convert value by value
+            return np.array([math.nan if (number := to_float(value)) is None else number for value in values])
+
+    @staticmethod
+    def _context(values: np.ndarray, is_qualified: np.ndarray, descending: bool) -> StatContext:
+        """ Helper method to compute one stat's percentiles, z-scores and qualified ranks for the whole column """
+        scores: np.ndarray = values if descending else -values  # Higher score is better
+        present: np.ndarray = ~np.isnan(scores)
+        league: np.ndarray = np.sort(scores[present])
+        pool: np.ndarray = np.sort(scores[present & is_qualified])
+        if not league.size:
+            missing: np.ndarray = np.full(values.shape, np.nan)
+            return StatContext(missing, missing, missing, 0)
+
+        # Midpoint percentile: ties share the average of their positions
+        percentile = (np.searchsorted(league, scores, "left") + np.searchsorted(league, scores, "right")) / 2
+        percentile = percentile / league.size * 100
+        percentile[~present] = np.nan
+        deviation: float = float(np.nanstd(values))
+        z_score: np.ndarray = (values - np.nanmean(values)) / deviation if deviation else np.where(present, 0.0, np.nan)
+        rank = (pool.size - np.searchsorted(pool, scores, "right") + 1).astype(float)
+        rank[~(present & is_qualified)] = np.nan
+        return StatContext(percentile, z_score, rank, int(pool.size))
+
+    def context(self, player_id: Any) -> dict[str, dict[str, Any]]:
+        """
+        Get a player's league context for every stat
+
+        Args:
+            player_id (Any): MLBAM player id (int or numeric string)
+
+        Returns:
+            dict[str, dict[str, Any]]: by lower-cased stat, percentile (0-100, higher is better), z-score against
+                the league, rank among qualified players (None if not qualified) and the qualified count; empty if
+                the player isn't in the snapshot
+        """
+        position: int | None = self._positions.get(str(player_id)) if player_id else None
+        if position is None:
+            return {}
+
+        context: dict[str, dict[str, Any]] = {}
+        for stat, stats in self.stats.items():
+            percentile, z_score, rank = stats.at(position)
+            if math.isnan(percentile):
+                continue
+            context[stat.lower()] = {
+                "pct": round(percentile),
+                "z": round(z_score, 2),
+                "rank": None if math.isnan(rank) else int(rank),
+                "qualified": stats.qualified
+            }
+        return context
@@ -5,40 +5,60 @@ import requests
 
 import src.mlb_today.config as config
 from src.mlb_today.logger import logger
+from src.mlb_today.metrics import timed
+from src.mlb_today.services.http_client import HttpClient, get_http_client
 
 
 SCHEDULE_ENDPOINT: str = config.SCHEDULE_ENDPOINT
 
+SCHEDULE_HYDRATE: str = "team,broadcasts(all),venue(location),probablePitcher"
+# Only the fields the email and scheduling read; statsapi matches these names at any depth
+SCHEDULE_FIELDS: str = ",".join((
+    "dates", "date", "games", "gamePk", "gameDate", "gameNumber", "doubleHeader",
+    "teams", "away", "home", "team", "abbreviation", "leagueRecord", "wins", "losses",
+    "probablePitcher", "id", "fullName",
+    "venue", "name", "location", "city", "stateAbbrev",
+    "broadcasts", "type", "isNational", "callSign", "homeAway"
+))
+
 
 class MlbDotComService:
     """ MLB.com API service """
     def __init__(self):
+        self.http_client: HttpClient = get_http_client()  # Shared, pooled client
         self.endpoint = SCHEDULE_ENDPOINT
 
-    def get_schedule(self, date: str) -> list[dict[str, Any]] | None:
+    @timed("mlbdotcom.get_schedule_range")
+    def get_schedule_range(self, start_date: str, end_date: str) -> dict[str, list[dict[str, Any]]] | None:
         """
-        Get schedule for a given date
+        Get the schedule for a range of dates in one request
 
         Args:
-            date (str): date in YYYY-MM-DD format
+            start_date (str): first date in YYYY-MM-DD format
+            end_date (str): last date in YYYY-MM-DD format
 
         Returns:
-            list[dict[str, Any]]: list of games
+            dict[str, list[dict[str, Any]]]: games by date, for each date in the response (dates without games are
+            absent), or None if the request failed
         """
         payload: dict[str, Any] = {  # Create payload
             "sportId": 1,
-            "startDate": date,
-            "endDate": date,
+            "startDate": start_date,
+            "endDate": end_date,
             "timeZone": "America/New_York",
             "sortBy": "gameDate,gameType",
-            "hydrate": "team,broadcasts(all),venue(location),probablePitcher"
+            "hydrate": SCHEDULE_HYDRATE,
+            "fields": SCHEDULE_FIELDS
         }
 
         try:
-            r: requests.Response = requests.get(self.endpoint, params=payload)  # Get data
-            r.raise_for_status()  # Raise error for HTTP status code
-        except requests.exceptions.HTTPError or requests.exceptions.RequestException as err:
+            schedule: dict[str, Any] = self.http_client.get_json(self.endpoint, params=payload)  # Get data
+        except (requests.exceptions.RequestException, ValueError) as err:  # HTTP, connection or JSON errors
             logger.error(err)
             return None
 
-        return r.json()["dates"][0].get("games", [])
+        return {
+            entry["date"]: entry.get("games", [])
+            for entry in schedule.get("dates", [])
+            if entry.get("date")
+        }
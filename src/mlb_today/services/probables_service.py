@@ -1,162 +1,217 @@
 """ Service for creating today's probables data """
+import asyncio
 import json
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from src.mlb_today.logger import logger
+from src.mlb_today.metrics import timed
+from src.mlb_today.models import BatterLine, BroadcastSet, Game, PitcherLine, ProbablePitcher, TeamSide
+from src.mlb_today.services.league_stats import LeagueStats
+from src.mlb_today.services.leaderboards import (
+    BATTING_LEADERBOARD_SPECS, BATTING_QUALIFIER, PITCHING_LEADERBOARD_SPECS, PITCHING_QUALIFIER, LeaderboardSpec
+)
+from src.mlb_today.services.stats_format import is_columnar, load_stats_rows, to_columnar
+from src.mlb_today.services.stats_table import PLAYER_ID_KEY, StatsTable
 from src.mlb_today.services.storage_service import StorageService
 
+PITCHER_STAT_KEYS: tuple[str, ...] = ("W", "L", "ERA", "xFIP", "WAR")
+BATTING_LEADER_COLUMNS: tuple[str, ...] = (
+    "PlayerName", "TeamNameAbb", "AVG", "HR", "OBP", "SLG", "OPS", "BABIP", "WAR"
+)
+PITCHING_LEADER_COLUMNS: tuple[str, ...] = ("PlayerName", "TeamNameAbb", "W", "L", "ERA", "xFIP", "WAR")
+# Stats shown with league context on each probable pitcher's card
+PITCHER_CONTEXT_SPECS: tuple[LeaderboardSpec, ...] = tuple(
+    PITCHING_LEADERBOARD_SPECS[stat] for stat in ("ERA", "xFIP", "WAR")
+)
+# Stats shown with their qualified rank in the batting leaders table
+BATTER_CONTEXT_SPECS: tuple[LeaderboardSpec, ...] = (BATTING_LEADERBOARD_SPECS["OPS"],)
+# League context per stats blob: the stats to put in context and the playing time needed to be ranked
+LEAGUE_CONTEXT: dict[str, tuple[tuple[LeaderboardSpec, ...], tuple[str, float]]] = {
+    "pitching.json": (PITCHER_CONTEXT_SPECS, PITCHING_QUALIFIER),
+    "batting.json": (BATTER_CONTEXT_SPECS, BATTING_QUALIFIER)
+}
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})  # Default for missing objects, instead of a new {} per lookup
+
 
 # noinspection PyMethodMayBeStatic
 class ProbablesService:
     """ Service for creating today's probables data """
 
-    def __init__(self):
-        # Instantiate the storage service once to reuse the client
-        self.storage_service = StorageService()
+    def __init__(self, storage_service: StorageService | None = None):
+        # Instantiate the storage service once to reuse the client and its parsed reads
+        self.storage_service = storage_service or StorageService()
+        self._league: dict[str, tuple[Any, LeagueStats]] = {}  # Built once per stats snapshot
+
+    async def prefetch_stats(self) -> None:
+        """Download and parse the pitching stats and leaderboard blobs concurrently, ahead of assembly."""
+        await asyncio.gather(
+            asyncio.to_thread(self._prefetch_blob, 'pitching.json'),
+            asyncio.to_thread(self._prefetch_blob, 'batting.json'),
+            asyncio.to_thread(self._prefetch_blob, 'batting.leaders.json'),
+            asyncio.to_thread(self._prefetch_blob, 'pitching.leaders.json')
+        )
+
+    def _prefetch_blob(self, filename: str) -> None:
+        """Helper method to warm the storage service's parsed read of a blob."""
+        try:
+            self.storage_service.get_parsed_blob(filename)
+        except Exception as err:  # Assembly retries the read and reports the failure
+            logger.warning(f"Failed to prefetch {filename}: {err}")
 
-    def _load_stats_from_blob(self, filename: str) -> list[dict[str, Any]]:
-        """Helper method to load and parse stats data from a blob."""
+    def _load_stats_from_blob(self, filename: str, columns: tuple[str, ...] | None = None) -> list[dict[str, Any]]:
+        """Helper method to load and parse stats data from a blob, reading only the given columns."""
         try:
-            blob_bytes = self.storage_service.get_blob(filename).download_blob().readall()
-            # Safely get the 'data' key, defaulting to an empty list
-            return json.loads(blob_bytes).get("data", [])
+            # Downloaded and parsed at most once per run, and only again when the blob's ETag changes
+            document = self.storage_service.get_parsed_blob(filename)
+            # Columnar blobs are projected on read; legacy blobs fall back to their 'data' list
+            return load_stats_rows(document, columns)
         except json.JSONDecodeError as err:
             logger.error(f"JSON decode error for {filename}: {err}", exc_info=True)
         except Exception as err:
             logger.error(f"Failed to load or parse {filename}: {err}", exc_info=True)
         return []
 
-    def get_probables_data(self, probables: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def _load_leaderboard(self, filename: str, stat: str) -> list[dict[str, Any]] | None:
+        """Helper method to load one precomputed leaderboard, or None if it isn't available."""
+        try:
+            return self.storage_service.get_parsed_blob(filename).get(stat)
+        except Exception as err:
+            logger.warning(f"Failed to load {stat} leaderboard from {filename}: {err}")
+        return None
+
+    def get_league_stats(self, filename: str = 'pitching.json') -> LeagueStats | None:
+        """
+        Get league context for a stats snapshot, computed once per snapshot
+
+        Args:
+            filename (str): pitching.json or batting.json
+
+        Returns:
+            LeagueStats | None: league context, or None if the stats can't be loaded
+        """
+        try:
+            document: Any = self.storage_service.get_parsed_blob(filename)
+        except Exception as err:
+            logger.warning(f"Failed to load {filename} for league context: {err}")
+            return None
+        cached: tuple[Any, LeagueStats] | None = self._league.get(filename)
+        if cached is not None and cached[0] is document:
+            return cached[1]
+
+        specs, qualifier = LEAGUE_CONTEXT[filename]
+        columnar: Any = document
+        if not is_columnar(document):  # Legacy snapshot: project it to columns first
+            columns: tuple[str, ...] = (PLAYER_ID_KEY, qualifier[0], *(spec.stat for spec in specs))
+            columnar = to_columnar(load_stats_rows(document), columns)
+        league: LeagueStats = LeagueStats(columnar, specs, qualifier)
+        self._league[filename] = (document, league)
+        return league
+
+    @timed("probables.assemble")
+    def get_probables_data(self, probables: list[dict[str, Any]]) -> list[Game]:
         """Get data for today's teams and probable pitchers."""
-        pitching = self._load_stats_from_blob('pitching.json')
+        pitching = self._load_stats_from_blob('pitching.json', (PLAYER_ID_KEY, *PITCHER_STAT_KEYS))
         if not pitching:
             logger.warning("Could not load pitching stats. Pitcher data will be incomplete.")
+        pitching_table = StatsTable(pitching, PITCHER_STAT_KEYS)  # Index once for every matchup below
+        league: LeagueStats | None = self.get_league_stats() if pitching else None
 
-        games: list[dict[str, Any]] = []
+        games: list[Game] = []
         for game in probables:
-            away_team: dict[str, Any] = game.get("teams", {}).get("away", {})
-            home_team: dict[str, Any] = game.get("teams", {}).get("home", {})
-            away_pitcher: dict[str, Any] = away_team.get("probablePitcher", {})
-            home_pitcher: dict[str, Any] = home_team.get("probablePitcher", {})
-            venue: dict[str, Any] = game.get("venue", {})
-            location: dict[str, Any] = venue.get("location", {})
-            broadcasts: list[dict[str, Any]] = game.get("broadcasts", [])
+            teams: Mapping[str, Any] = game.get("teams") or _EMPTY
+            away_team: Mapping[str, Any] = teams.get("away") or _EMPTY
+            home_team: Mapping[str, Any] = teams.get("home") or _EMPTY
+            venue: Mapping[str, Any] = game.get("venue") or _EMPTY
+            location: Mapping[str, Any] = venue.get("location") or _EMPTY
 
             # Use an f-string for cleaner formatting
             venue_str = f"{venue.get('name', 'N/A')}, ({location.get('city', '?')}, {location.get('stateAbbrev', '?')})"
 
-            matchup = {
-                "date": game.get("gameDate"),
-                "venue": venue_str,
-                "away": self.get_matchup_team(away_team, away_pitcher, pitching),
-                "home": self.get_matchup_team(home_team, home_pitcher, pitching),
-                "watch": self.get_tv_watch(broadcasts)
-            }
-            games.append(matchup)
+            games.append(Game(
+                game.get("gameDate"),
+                venue_str,
+                self.get_matchup_team(away_team, away_team.get("probablePitcher") or _EMPTY, pitching_table, league),
+                self.get_matchup_team(home_team, home_team.get("probablePitcher") or _EMPTY, pitching_table, league),
+                self.get_tv_watch(game.get("broadcasts"))
+            ))
         return games
 
-    def get_matchup_team(self, team: dict, pitcher: dict, pitching_stats: list) -> dict:
+    def get_matchup_team(
+            self,
+            team: Mapping[str, Any],
+            pitcher: Mapping[str, Any],
+            pitching_table: StatsTable,
+            league: LeagueStats | None = None
+    ) -> TeamSide:
         """Get team data for matchup."""
-        pitcher_id = pitcher.get("id")
+        stat_line: Mapping[str, float | None] = pitching_table.lookup(pitcher.get("id")) or _EMPTY
+        record: Mapping[str, Any] = team.get("leagueRecord") or _EMPTY
 
-        pitcher_name = pitcher.get("fullName")
+        def get_stat_as_float(stat_key: str, default_value: float = 0.0) -> float:
+            """Reads a pre-converted stat, falling back to a default for the template."""
+            stat_value = stat_line.get(stat_key)
+            return default_value if stat_value is None else stat_value
+
+        return TeamSide(
+            (team.get("team") or _EMPTY).get("abbreviation"),
+            record.get("wins", 'N/A'),
+            record.get("losses", 'N/A'),
+            ProbablePitcher(
+                pitcher.get("fullName") or "TBD",
+                get_stat_as_float('W'),
+                get_stat_as_float('L'),
+                get_stat_as_float('ERA'),
+                get_stat_as_float('xFIP'),
+                get_stat_as_float('WAR'),
+                league.context(pitcher.get("id")) if league is not None else None
+            )
+        )
 
-        if not pitcher_name:
-            pitcher_name = "TBD"
+    def get_player_stats(self, player_id: int | None, stats_table: StatsTable) -> dict[str, float | None]:
+        """
+        Get a player's full stat line from an indexed stats table
 
-        def get_stat_as_float(stat_key: str, default_value: float = 0.0) -> float:
-            """Safely retrieves a stat and converts it to a float."""
-            stat_value = self.get_pitcher_stat(stat_key, pitcher_id, pitching_stats)
-            if stat_value is None:
-                return default_value
-            try:
-                # Ensure the stat is always a number for the template
-                return float(stat_value)
-            except (ValueError, TypeError):
-                return default_value
-
-        return {
-            "abbr": team.get("team", {}).get("abbreviation"),
-            "record": {
-                "wins": team.get("leagueRecord", {}).get("wins", 'N/A'),
-                "losses": team.get("leagueRecord", {}).get("losses", 'N/A')
-            },
-            "pitcher": {
-                "name": pitcher_name,
-                "record": {
-                    "wins": get_stat_as_float('W'),
-                    "losses": get_stat_as_float('L')
-                },
-                "era": get_stat_as_float('ERA'),
-                "xfip": get_stat_as_float('xFIP'),
-                "war": get_stat_as_float('WAR')
-            },
-        }
-
-    def get_pitcher_stat(self, stat_key: str, pitcher_id: int, pitching_stats: list) -> str | None:
-        """Finds a stat for a pitcher, safely comparing IDs."""
-        if not pitcher_id:
-            return None
+        Args:
+            player_id (int | None): MLBAM player id
+            stats_table (StatsTable): indexed pitching or batting stats
 
-        # Use a generator expression with next() for efficiency
-        try:
-            pitcher_data = next(
-                (p for p in pitching_stats if int(p.get('xMLBAMID', 0)) == pitcher_id),
-                None
-            )
-            return pitcher_data.get(stat_key) if pitcher_data else None
-        except (ValueError, TypeError):
-            # This handles cases where xMLBAMID is not a valid integer
-            logger.warning(f"Encountered a non-integer pitcher ID in stats data.")
-            return None
+        Returns:
+            dict[str, float | None]: stat line, or an empty dict if the player isn't found
+        """
+        return stats_table.lookup(player_id) or {}
 
-    def get_off_war_leaders(self) -> list[dict[str, Any]]:
+    def get_off_war_leaders(self) -> list[BatterLine]:
         """Get today's top 25 offensive WAR leaders."""
-        batting = self._load_stats_from_blob('batting.json')
-        off_war_leaders: list[dict[str, Any]] = []
-
-        for batter in batting[:25]:
-            leader = {
-                "name": batter.get("PlayerName"),
-                "team": batter.get("TeamNameAbb"),
-                "avg": batter.get("AVG"),
-                "hr": batter.get("HR"),
-                "obp": batter.get("OBP"),
-                "slg": batter.get("SLG"),
-                "ops": batter.get("OPS"),
-                "babip": batter.get("BABIP"),
-                "war": batter.get("WAR")
-            }
-            off_war_leaders.append(leader)
-        return off_war_leaders
-
-    def get_pitching_war_leaders(self) -> list[dict[str, Any]]:
+        batting = self._load_leaderboard('batting.leaders.json', 'WAR')
+        if batting is None:  # Fall back to the full snapshot, which is sorted by WAR
+            batting = self._load_stats_from_blob('batting.json', (PLAYER_ID_KEY, *BATTING_LEADER_COLUMNS))
+        league: LeagueStats | None = self.get_league_stats('batting.json') if batting else None
+        return [
+            BatterLine(
+                *map(batter.get, BATTING_LEADER_COLUMNS),
+                league=league.context(batter.get(PLAYER_ID_KEY)) if league is not None else None
+            )
+            for batter in batting[:25]
+        ]
+
+    def get_pitching_war_leaders(self) -> list[PitcherLine]:
         """Get today's top 25 pitching WAR leaders."""
-        pitching = self._load_stats_from_blob('pitching.json')
-        pitching_war_leaders: list[dict[str, Any]] = []
-
-        for pitcher in pitching[:25]:
-            leader = {
-                "name": pitcher.get("PlayerName"),
-                "team": pitcher.get("TeamNameAbb"),
-                "w": pitcher.get("W"),
-                "l": pitcher.get("L"),
-                "era": pitcher.get("ERA"),
-                "xfip": pitcher.get("xFIP"),
-                "war": pitcher.get("WAR")
-            }
-            pitching_war_leaders.append(leader)
-        return pitching_war_leaders
-
-    def get_tv_watch(self, broadcasts: list[dict[str, Any]]) -> dict[str, Any] | None:
+        pitching = self._load_leaderboard('pitching.leaders.json', 'WAR')
+        if pitching is None:  # Fall back to the full snapshot, which is sorted by WAR
+            pitching = self._load_stats_from_blob('pitching.json', PITCHING_LEADER_COLUMNS)
+        return [PitcherLine(*map(pitcher.get, PITCHING_LEADER_COLUMNS)) for pitcher in pitching[:25]]
+
+    def get_tv_watch(self, broadcasts: list[dict[str, Any]] | None) -> BroadcastSet | None:
         """
         Get TV broadcasts for a game.
 
         Args:
-            broadcasts (dict): list of all broadcast data.
+            broadcasts (list[dict[str, Any]] | None): list of all broadcast data.
 
         Returns:
-            dict: dictionary of broadcasts.
+            BroadcastSet | None: broadcasts by audience, or None if there are none.
         """
         if not broadcasts:
             return None
@@ -168,22 +223,16 @@ class ProbablesService:
 
         for broadcast in broadcasts:
             if broadcast.get("type") == "TV":
-                if broadcast.get("isNational") and broadcast.get("callSign") not in national:
-                    national.append(broadcast.get("callSign"))
+                call_sign = broadcast.get("callSign")
+                if call_sign in national:
+                    continue
+                if broadcast.get("isNational"):
+                    national.append(call_sign)
+                elif broadcast.get("homeAway") == "home":
+                    home.append(call_sign)
+                elif broadcast.get("homeAway") == "away":
+                    away.append(call_sign)
                 else:
-                    if broadcast.get("homeAway") == "home" and broadcast.get("callSign") not in national:
-                        home.append(broadcast.get("callSign"))
-                    elif broadcast.get("homeAway") == "away" and broadcast.get("callSign") not in national:
-                        away.append(broadcast.get("callSign"))
-                    else:
-                        if broadcast.get("callSign") not in national:
-                            misc.append(broadcast.get("callSign"))
-
-        tvwatch = {
-            "home": home,
-            "away": away,
-            "national": national,
-            "misc": misc
-        }
-
-        return tvwatch
\ No newline at end of file
+                    misc.append(call_sign)
+
+        return BroadcastSet(home, away, national, misc)
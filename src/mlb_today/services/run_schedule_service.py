@@ -0,0 +1,138 @@
+""" Service for runs scheduled in storage, launched by a frequent timer instead of an app setting CRON """
+from datetime import datetime, timedelta, timezone
+import json
+from typing import Any
+
+from azure.core.exceptions import ResourceNotFoundError
+
+import src.mlb_today.config as config
+from src.mlb_today.logger import logger
+from src.mlb_today.services.storage_service import StorageService
+
+PROBABLES_JOB: str = "get_probables"
+RUN_MAX_ATTEMPTS: int = config.RUN_MAX_ATTEMPTS
+RUN_LEASE: timedelta = timedelta(minutes=30)  # A run started longer ago than this is assumed to have died
+
+SCHEDULED: str = "scheduled"
+STARTED: str = "started"
+FAILED: str = "failed"
+DONE: str = "done"
+
+
+def run_blob_filename(job: str) -> str:
+    """
+    Name of a job's scheduled run blob, e.g. runs/get_probables.json
+
+    Args:
+        job (str): job name
+
+    Returns:
+        str: blob file name
+    """
+    return f"runs/{job}.json"
+
+
+class RunScheduleService:
+    """ Service for runs scheduled in storage, launched by a frequent timer instead of an app setting CRON """
+    def __init__(self, storage_service: StorageService | None = None):
+        self.storage_service = storage_service or StorageService()
+
+    def schedule(self, job: str, day: str, run_at: datetime) -> None:
+        """
+        Schedule a job's run for a day, replacing any earlier schedule unless today's run already started
+
+        Args:
+            job (str): job name
+            day (str): date the run is for, in YYYY-MM-DD format
+            run_at (datetime): timezone-aware time to run at
+        """
+        current: dict[str, Any] | None = self.get_run(job)
+        if current and current.get("day") == day and current.get("status") in (STARTED, DONE):
+            logger.info(f"{job} already {current['status']} for {day}; not rescheduling")
+            return
+
+        run: dict[str, Any] = {
+            "job": job,
+            "day": day,
+            "run_at": run_at.astimezone(timezone.utc).isoformat(),
+            "status": SCHEDULED,
+            "attempts": 0,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+        self.storage_service.save_blob(run_blob_filename(job), json.dumps(run, separators=(",", ":")))
+
+    def get_run(self, job: str) -> dict[str, Any] | None:
+        """
+        Get a job's scheduled run. Repeat polls only cost a conditional GET while it is unchanged.
+
+        Args:
+            job (str): job name
+
+        Returns:
+            dict[str, Any] | None: scheduled run (shared; don't mutate), or None if there isn't one
+        """
+        try:
+            return self.storage_service.get_parsed_blob(run_blob_filename(job))
+        except ResourceNotFoundError:
+            return None
+
+    def _is_due(self, run: dict[str, Any] | None, day: str, now: datetime) -> bool:
+        """ Helper method to check whether a run should start now """
+        if not run or run.get("day") != day or datetime.fromisoformat(run["run_at"]) > now:
+            return False
+        status: str = run.get("status")
+        if status == STARTED:  # Running elsewhere, unless that invocation died; a dead attempt still counts
+            return (
+                now - datetime.fromisoformat(run["updated_at"]) >= RUN_LEASE
+                and run.get("attempts", 0) < RUN_MAX_ATTEMPTS
+            )
+        if status == FAILED:
+            return run.get("attempts", 0) < RUN_MAX_ATTEMPTS
+        return status == SCHEDULED
+
+    def claim_due(self, job: str, day: str, now: datetime) -> bool:
+        """
+        Claim today's run of a job if it is due. Only one invocation can claim it.
+
+        Args:
+            job (str): job name
+            day (str): today's date in YYYY-MM-DD format
+            now (datetime): timezone-aware current time
+
+        Returns:
+            bool: True if the caller should run the job now
+        """
+        if not self._is_due(self.get_run(job), day, now):
+            return False
+
+        versioned: tuple[bytes, str] | None = self.storage_service.read_blob_versioned(run_blob_filename(job))
+        run: dict[str, Any] | None = json.loads(versioned[0]) if versioned else None
+        if not self._is_due(run, day, now):  # Claimed since the cached read
+            return False
+
+        run.update({"status": STARTED, "attempts": run.get("attempts", 0) + 1, "updated_at": now.isoformat()})
+        if not self.storage_service.save_blob_if_unchanged(
+                run_blob_filename(job), json.dumps(run, separators=(",", ":")), versioned[1]
+        ):
+            logger.info(f"Run of {job} for {day} was claimed by another invocation")
+            return False
+        logger.info(f"Starting {job} for {day} (scheduled for {run['run_at']}, attempt {run['attempts']})")
+        return True
+
+    def finish(self, job: str, succeeded: bool) -> None:
+        """
+        Record how a claimed run ended; a failed run is retried by later polls up to RUN_MAX_ATTEMPTS
+
+        Args:
+            job (str): job name
+            succeeded (bool): whether the run succeeded
+        """
+        versioned: tuple[bytes, str] | None = self.storage_service.read_blob_versioned(run_blob_filename(job))
+        if versioned is None:
+            return
+        run: dict[str, Any] = json.loads(versioned[0])
+        run.update({"status": DONE if succeeded else FAILED, "updated_at": datetime.now(timezone.utc).isoformat()})
+        if not self.storage_service.save_blob_if_unchanged(
+                run_blob_filename(job), json.dumps(run, separators=(",", ":")), versioned[1]
+        ):
+            logger.warning(f"Run of {job} was rescheduled while it ran; leaving the new schedule")
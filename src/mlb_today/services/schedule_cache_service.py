@@ -0,0 +1,109 @@
+""" Service for the per-day schedule cache shared by the schedule and probables functions """
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from azure.core.exceptions import ResourceNotFoundError
+
+import src.mlb_today.config as config
+from src.mlb_today.logger import logger
+from src.mlb_today.services.mlbdotcom_service import MlbDotComService
+from src.mlb_today.services.storage_service import StorageService
+
+SCHEDULE_FETCH_DAYS: int = config.SCHEDULE_FETCH_DAYS
+SCHEDULE_CACHE_MAX_AGE: timedelta = timedelta(minutes=config.SCHEDULE_CACHE_MAX_AGE_MINUTES)
+
+
+def schedule_blob_filename(day: str) -> str:
+    """
+    Name of a day's schedule cache blob, e.g. schedule/2025-07-04.json
+
+    Args:
+        day (str): date in YYYY-MM-DD format
+
+    Returns:
+        str: blob file name
+    """
+    return f"schedule/{day}.json"
+
+
+class ScheduleCacheService:
+    """ Service for the per-day schedule cache shared by the schedule and probables functions """
+    def __init__(
+            self,
+            storage_service: StorageService | None = None,
+            mlbdotcom_service: MlbDotComService | None = None
+    ):
+        self.storage_service = storage_service or StorageService()
+        self.mlbdotcom_service = mlbdotcom_service or MlbDotComService()
+
+    def _load_cached_day(self, day: str) -> dict[str, Any] | None:
+        """ Helper method to load a day's cache entry, if any """
+        try:
+            return self.storage_service.get_parsed_blob(schedule_blob_filename(day))
+        except ResourceNotFoundError:
+            return None
+        except Exception as err:  # Treat an unreadable entry as a miss
+            logger.warning(f"Could not load cached schedule for {day}: {err}")
+            return None
+
+    def refresh(self, start_date: str, days: int = SCHEDULE_FETCH_DAYS) -> dict[str, list[dict[str, Any]]] | None:
+        """
+        Fetch the schedule for a range of dates in one request and cache each day, including days without games
+
+        Args:
+            start_date (str): first date in YYYY-MM-DD format
+            days (int): number of dates to fetch
+
+        Returns:
+            dict[str, list[dict[str, Any]]] | None: games by date, or None if the request failed
+        """
+        first: date = date.fromisoformat(start_date)
+        dates: list[str] = [(first + timedelta(days=offset)).isoformat() for offset in range(max(1, days))]
+
+        games_by_date: dict[str, list[dict[str, Any]]] | None = self.mlbdotcom_service.get_schedule_range(
+            dates[0], dates[-1]
+        )
+        if games_by_date is None:
+            return None
+
+        fetched_at: str = datetime.now(timezone.utc).isoformat()
+        entries: dict[str, list[dict[str, Any]]] = {day: games_by_date.get(day, []) for day in dates}
+        try:
+            self.storage_service.save_documents({  # Store each day in Azure Blob
+                schedule_blob_filename(day): {"date": day, "fetched_at": fetched_at, "games": games}
+                for day, games in entries.items()
+            })
+        except Exception as err:  # The fetch still succeeded; the next caller fetches again
+            logger.warning(f"Could not cache schedule from {dates[0]} to {dates[-1]}: {err}")
+        return entries
+
+    def get_games(self, day: str, max_age: timedelta = SCHEDULE_CACHE_MAX_AGE) -> list[dict[str, Any]] | None:
+        """
+        Get a day's games from the cache, fetching the next SCHEDULE_FETCH_DAYS days if the entry is missing or
+        older than max_age (probable pitchers change during the day). A stale entry is used if the fetch fails.
+
+        Args:
+            day (str): date in YYYY-MM-DD format
+            max_age (timedelta): oldest cache entry to use without fetching
+
+        Returns:
+            list[dict[str, Any]] | None: games (empty if there are none), or None if no schedule is available
+        """
+        cached: dict[str, Any] | None = self._load_cached_day(day)
+        if cached is not None:
+            try:
+                age: timedelta = datetime.now(timezone.utc) - datetime.fromisoformat(cached.get("fetched_at"))
+            except (TypeError, ValueError):
+                age = max_age
+            if age < max_age:
+                logger.info(f"Using cached schedule for {day} ({int(age.total_seconds() // 60)} minutes old)")
+                return cached.get("games", [])
+
+        games_by_date: dict[str, list[dict[str, Any]]] | None = self.refresh(day)
+        if games_by_date is not None:
+            return games_by_date.get(day, [])
+
+        if cached is not None:
+            logger.warning(f"Schedule request failed; using stale cached schedule for {day}")
+            return cached.get("games", [])
+        return None
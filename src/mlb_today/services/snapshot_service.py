@@ -0,0 +1,233 @@
+""" Service for delta-aware storage of stats snapshots """
+import hashlib
+import json
+import os
+from typing import Any
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from src.mlb_today.logger import logger
+from src.mlb_today.services.json_stream import iter_encoded
+from src.mlb_today.services.stats_format import COLUMNAR_FORMAT, COLUMNAR_VERSION, is_columnar
+from src.mlb_today.services.stats_table import PLAYER_ID_KEY
+from src.mlb_today.services.storage_service import StorageService
+
+DELTA_FORMAT: str = "columnar-delta"
+
+
+def sidecar_filename(blob_filename: str, suffix: str) -> str:
+    """
+    Name of a blob stored alongside a snapshot, e.g. pitching.json -> pitching.manifest.json
+
+    Args:
+        blob_filename (str): snapshot blob file name
+        suffix (str): sidecar kind
+
+    Returns:
+        str: sidecar blob file name
+    """
+    stem, extension = os.path.splitext(blob_filename)
+    return f"{stem}.{suffix}{extension or '.json'}"
+
+
+def content_hash(document: dict[str, Any]) -> str:
+    """
+    Stable hash of a columnar document's stats, in leaderboard order
+
+    Args:
+        document (dict[str, Any]): columnar document
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    for chunk in iter_encoded(document.get("columns", {})):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def keyed_rows(document: dict[str, Any]) -> list[tuple[str, int]]:
+    """
+    Rows a delta can address: those with a player id, the first row of each id, in leaderboard order
+
+    Args:
+        document (dict[str, Any]): columnar document
+
+    Returns:
+        list[tuple[str, int]]: (player id, row position) pairs
+    """
+    return sorted(document.get("index", {}).items(), key=lambda item: item[1])
+
+
+def row_hashes(document: dict[str, Any], id_key: str = PLAYER_ID_KEY) -> dict[str, str]:
+    """
+    Short hash of each player's row in a columnar document
+
+    Args:
+        document (dict[str, Any]): columnar document
+        id_key (str): column holding the MLBAM player id
+
+    Returns:
+        dict[str, str]: row hash, by player id
+    """
+    columns: dict[str, list[Any]] = document.get("columns", {})
+    arrays: list[list[Any]] = list(columns.values())
+    hashes: dict[str, str] = {}
+
+    for player_id, position in keyed_rows(document):
+        values: list[Any] = [array[position] for array in arrays]
+        encoded: bytes = json.dumps(values, separators=(",", ":")).encode("utf-8")
+        hashes[player_id] = hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+    if id_key not in columns:
+        logger.warning(f"Snapshot has no {id_key} column; row hashes are empty.")
+    return hashes
+
+
+def create_delta(
+        document: dict[str, Any], hashes: dict[str, str], previous: dict[str, Any] | None
+) -> dict[str, Any]:
+    """
+    Compact delta from the previous snapshot to this one: changed or added rows, removed ids and the new order.
+    Only keyed rows (see keyed_rows) are carried; rows without a player id or repeating one are left out.
+
+    Args:
+        document (dict[str, Any]): new columnar document
+        hashes (dict[str, str]): new row hashes
+        previous (dict[str, Any] | None): previous manifest
+
+    Returns:
+        dict[str, Any]: delta document
+    """
+    previous_hashes: dict[str, str] = (previous or {}).get("rows", {})
+    columns: dict[str, list[Any]] = document.get("columns", {})
+    arrays: list[list[Any]] = list(columns.values())
+    rows: list[tuple[str, int]] = keyed_rows(document)
+
+    changed: dict[str, list[Any]] = {
+        player_id: [array[position] for array in arrays]
+        for player_id, position in rows
+        if previous_hashes.get(player_id) != hashes.get(player_id)
+    }
+
+    return {
+        "format": DELTA_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "base_hash": (previous or {}).get("content_hash"),
+        "content_hash": None,  # Filled in by the caller
+        "columns": list(columns),
+        "order": [player_id for player_id, _ in rows],
+        "changed": changed,
+        "removed": [player_id for player_id in previous_hashes if player_id not in hashes]
+    }
+
+
+def apply_delta(document: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    """
+    Rebuild the new snapshot's keyed rows from the previous columnar document and a delta
+
+    Args:
+        document (dict[str, Any]): previous columnar document (the delta's base)
+        delta (dict[str, Any]): delta document
+
+    Returns:
+        dict[str, Any]: new columnar document
+
+    Raises:
+        ValueError: if the document isn't the delta's base, or the delta doesn't match its columns or order
+    """
+    columns: list[str] = delta.get("columns", [])
+    if not is_columnar(document) or list(document.get("columns", {})) != columns:
+        raise ValueError("Delta columns do not match the base snapshot")
+    base_hash: str | None = delta.get("base_hash")
+    if base_hash is not None:  # No base: every row is in changed
+        document_hash: str = content_hash(document)
+        if document_hash != base_hash:
+            raise ValueError(f"Delta applies to snapshot {base_hash[:12]}, not {document_hash[:12]}")
+
+    old_columns: dict[str, list[Any]] = document["columns"]
+    old_index: dict[str, int] = document.get("index", {})
+    changed: dict[str, list[Any]] = delta.get("changed", {})
+
+    data: dict[str, list[Any]] = {column: [] for column in columns}
+    arrays: list[list[Any]] = list(data.values())
+    old_arrays: list[list[Any]] = [old_columns[column] for column in columns]
+    index: dict[str, int] = {}
+
+    for position, player_id in enumerate(delta.get("order", [])):
+        if player_id in changed:
+            values: list[Any] = changed[player_id]
+        elif player_id in old_index:
+            values = [array[old_index[player_id]] for array in old_arrays]
+        else:
+            raise ValueError(f"Delta order references unknown player {player_id}")
+        for array, value in zip(arrays, values):
+            array.append(value)
+        index[player_id] = position
+
+    return {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "rows": len(delta.get("order", [])),
+        "columns": data,
+        "index": index
+    }
+
+
+class SnapshotService:
+    """ Service for delta-aware storage of stats snapshots """
+    def __init__(self, storage_service: StorageService | None = None):
+        self.storage_service = storage_service or StorageService()
+
+    def _load_manifest(self, blob_filename: str) -> dict[str, Any] | None:
+        """ Helper method to load the previous snapshot's manifest, if any """
+        try:
+            return self.storage_service.get_parsed_blob(sidecar_filename(blob_filename, "manifest"))
+        except ResourceNotFoundError:
+            return None
+        except Exception as err:  # Treat an unreadable manifest as a first run
+            logger.warning(f"Could not load manifest for {blob_filename}: {err}")
+            return None
+
+    def save_snapshot(self, blob_filename: str, document: dict[str, Any]) -> bool:
+        """
+        Save a columnar stats snapshot unless it is identical to the stored one.
+        When it changed, also write a delta of the changed players and a new manifest of hashes.
+
+        Args:
+            blob_filename (str): snapshot blob file name
+            document (dict[str, Any]): columnar stats document
+
+        Returns:
+            bool: True if the snapshot was written, False if it was unchanged
+        """
+        new_hash: str = content_hash(document)
+        previous: dict[str, Any] | None = self._load_manifest(blob_filename)
+
+        if previous and previous.get("content_hash") == new_hash:
+            logger.info(f"{blob_filename} unchanged (content hash {new_hash[:12]}); skipping upload")
+            return False
+
+        hashes: dict[str, str] = row_hashes(document)
+        delta: dict[str, Any] = create_delta(document, hashes, previous)
+        delta["content_hash"] = new_hash
+
+        self.storage_service.save_document(  # Write the snapshot first; the manifest marks it complete
+            blob_filename=blob_filename,
+            document=document,
+            stream=True
+        )
+        self.storage_service.save_blob(
+            blob_filename=sidecar_filename(blob_filename, "delta"),
+            data=json.dumps(delta, separators=(",", ":"))
+        )
+        self.storage_service.save_blob(
+            blob_filename=sidecar_filename(blob_filename, "manifest"),
+            data=json.dumps({"content_hash": new_hash, "rows": hashes}, separators=(",", ":"))
+        )
+
+        logger.info(
+            f"Saved {blob_filename} (content hash {new_hash[:12]}): "
+            f"{len(delta['changed'])} changed and {len(delta['removed'])} removed players"
+        )
+        return True
@@ -0,0 +1,96 @@
+""" Compact column-oriented storage format for Fangraphs stats blobs """
+from typing import Any, Iterable
+
+from src.mlb_today.services.stats_table import PLAYER_ID_KEY
+
+COLUMNAR_FORMAT: str = "columnar"
+COLUMNAR_VERSION: int = 1
+
+
+def to_columnar(rows: Iterable[dict[str, Any]], columns: Iterable[str], id_key: str = PLAYER_ID_KEY) -> dict[str, Any]:
+    """
+    Project Fangraphs rows onto a set of columns and store them column-wise.
+    Rows are read once, in order, so a streaming iterator never has more than one full row in memory.
+
+    Args:
+        rows (Iterable[dict[str, Any]]): Fangraphs leaderboard rows, in leaderboard order
+        columns (Iterable[str]): columns to keep
+        id_key (str): column holding the MLBAM player id, always kept for the row index
+
+    Returns:
+        dict[str, Any]: one array per column plus a player id -> row position index
+    """
+    columns = list(dict.fromkeys(columns))  # De-dupe, keep order
+    if id_key not in columns:
+        columns.insert(0, id_key)
+
+    data: dict[str, list[Any]] = {column: [] for column in columns}
+    arrays: list[tuple[str, list[Any]]] = list(data.items())
+    index: dict[str, int] = {}
+    row_count: int = 0
+
+    for row in rows:
+        for column, array in arrays:
+            array.append(row.get(column))
+        player_id: Any = row.get(id_key)
+        if player_id is not None:
+            index.setdefault(str(player_id), row_count)  # First row wins, matching StatsTable
+        row_count += 1
+
+    return {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "rows": row_count,
+        "columns": data,
+        "index": index
+    }
+
+
+def is_columnar(document: Any) -> bool:
+    """
+    Check whether a decoded stats blob uses the columnar format
+
+    Args:
+        document (Any): decoded blob
+
+    Returns:
+        bool: True if columnar
+    """
+    return isinstance(document, dict) and document.get("format") == COLUMNAR_FORMAT
+
+
+def from_columnar(document: dict[str, Any], columns: Iterable[str] | None = None) -> list[dict[str, Any]]:
+    """
+    Rebuild row dicts from a columnar document, reading only the requested columns
+
+    Args:
+        document (dict[str, Any]): columnar document
+        columns (Iterable[str] | None): columns to read (all stored columns if None)
+
+    Returns:
+        list[dict[str, Any]]: rows in leaderboard order; missing columns read as None
+    """
+    stored: dict[str, list[Any]] = document.get("columns", {})
+    row_count: int = document.get("rows", 0)
+    wanted: list[str] = list(stored) if columns is None else list(dict.fromkeys(columns))
+
+    arrays: list[list[Any]] = [stored.get(column) or [None] * row_count for column in wanted]
+    return [dict(zip(wanted, values)) for values in zip(*arrays)] if wanted else [{} for _ in range(row_count)]
+
+
+def load_stats_rows(document: Any, columns: Iterable[str] | None = None) -> list[dict[str, Any]]:
+    """
+    Read stats rows from either a columnar document or a legacy Fangraphs {"data": [...]} blob
+
+    Args:
+        document (Any): decoded blob
+        columns (Iterable[str] | None): columns to read (all if None)
+
+    Returns:
+        list[dict[str, Any]]: stats rows
+    """
+    if is_columnar(document):
+        return from_columnar(document, columns)
+    if isinstance(document, dict):
+        return document.get("data", [])
+    return []
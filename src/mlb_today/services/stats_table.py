@@ -0,0 +1,79 @@
+""" Indexed Fangraphs stats table """
+from typing import Any, Iterable
+
+from src.mlb_today.logger import logger
+
+PLAYER_ID_KEY: str = "xMLBAMID"
+
+
+def to_float(value: Any) -> float | None:
+    """
+    Convert a raw Fangraphs stat value to a float
+
+    Args:
+        value (Any): raw stat value
+
+    Returns:
+        float | None: converted value, or None if it can't be converted
+    """
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class StatsTable:
+    """ Fangraphs stat lines keyed by MLBAM player id, built once per load """
+    def __init__(self, rows: list[dict[str, Any]], stat_keys: Iterable[str], id_key: str = PLAYER_ID_KEY):
+        """
+        Build the player id index
+
+        Args:
+            rows (list[dict[str, Any]]): Fangraphs leaderboard rows
+            stat_keys (Iterable[str]): stats to pre-convert to floats for each player
+            id_key (str): row key holding the MLBAM player id
+        """
+        self.rows: list[dict[str, Any]] = rows
+        self.stat_keys: tuple[str, ...] = tuple(stat_keys)
+        self._index: dict[int, dict[str, float | None]] = {}
+
+        skipped: int = 0
+        for row in rows:
+            try:
+                player_id: int = int(row.get(id_key))  # Normalize ids to int once, at build time
+            except (ValueError, TypeError):
+                skipped += 1
+                continue
+
+            if player_id in self._index:  # Keep the first row, as the old linear scan did
+                continue
+
+            self._index[player_id] = {key: to_float(row.get(key)) for key in self.stat_keys}
+
+        if skipped:
+            logger.warning(f"Skipped {skipped} stats rows with a missing or non-integer {id_key}.")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, player_id: Any) -> bool:
+        return self.lookup(player_id) is not None
+
+    def lookup(self, player_id: Any) -> dict[str, float | None] | None:
+        """
+        Get a player's full stat line
+
+        Args:
+            player_id (Any): MLBAM player id (int or numeric string)
+
+        Returns:
+            dict[str, float | None] | None: stat line, or None if the player isn't in the table
+        """
+        if not player_id:
+            return None
+        try:
+            return self._index.get(int(player_id))
+        except (ValueError, TypeError):
+            return None
@@ -1,54 +1,478 @@
 """ Azure Storage service """
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from typing import Any, Callable, Iterable
+
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError, ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+from azure.storage.blob import BlobBlock, BlobServiceClient, BlobClient, ContainerClient, ContentSettings
 
 import src.mlb_today.config as config
+from src.mlb_today.logger import logger
+from src.mlb_today.metrics import record_bytes, timed
+from src.mlb_today.services.blob_cache import BlobCache, parser_key
+from src.mlb_today.services.blob_codec import EncodedBlob, decompress, encode_document, load_document
 
 STORAGE_CONNECTION_STRING: str = config.STORAGE_CONNECTION_STRING
 BLOB_CONTAINER_NAME: str = config.BLOB_CONTAINER_NAME
+BLOB_MAX_CONCURRENCY: int = config.BLOB_MAX_CONCURRENCY
+BLOB_BLOCK_SIZE: int = 4 * 1024 * 1024
+
+# One pooled client per connection string, and the containers known to exist, shared by every instance
+_blob_service_clients: dict[str, BlobServiceClient] = {}
+_confirmed_containers: set[tuple[str, str]] = set()
+_registry_lock = threading.Lock()
+
+# Parsed blobs kept across warm invocations of this worker
+blob_cache: BlobCache = BlobCache(
+    max_bytes=config.BLOB_CACHE_MAX_BYTES,
+    spill_directory=config.BLOB_CACHE_SPILL_DIRECTORY
+)
+
+
+def get_blob_service_client(connection_string: str) -> BlobServiceClient:
+    """
+    Get the process-wide BlobServiceClient for a connection string, creating it on first use
+
+    Args:
+        connection_string (str): storage account connection string
+
+    Returns:
+        BlobServiceClient: shared, pooled client
+    """
+    client: BlobServiceClient | None = _blob_service_clients.get(connection_string)
+    if client is None:
+        with _registry_lock:
+            client = _blob_service_clients.get(connection_string)
+            if client is None:
+                client = BlobServiceClient.from_connection_string(
+                    connection_string,
+                    max_single_put_size=BLOB_BLOCK_SIZE,  # Larger uploads go as parallel blocks
+                    max_block_size=BLOB_BLOCK_SIZE,
+                    max_single_get_size=BLOB_BLOCK_SIZE,  # Larger downloads go as parallel ranges
+                    max_chunk_get_size=BLOB_BLOCK_SIZE
+                )
+                _blob_service_clients[connection_string] = client
+    return client
+
+
+def content_settings(encoded: EncodedBlob) -> ContentSettings:
+    """
+    Blob Content-Type and Content-Encoding for an encoded document, which reads use to decode it
+
+    Args:
+        encoded (EncodedBlob): encoded document
+
+    Returns:
+        ContentSettings: content settings to upload with
+    """
+    return ContentSettings(content_type=encoded.content_type, content_encoding=encoded.content_encoding)
+
+
+def payload_size(data: str | bytes) -> int:
+    """
+    Size of a blob payload in bytes, as uploaded
+
+    Args:
+        data (str | bytes): blob content
+
+    Returns:
+        int: size in bytes
+    """
+    return len(data.encode("utf-8")) if isinstance(data, str) else len(data)
+
 
 class StorageService:
     """ Azure Storage service """
     def __init__(self):
         self.connection_string = STORAGE_CONNECTION_STRING
+        self._invocation_reads: dict[tuple[str, str, str], Any] = {}  # Parsed reads made by this instance
 
-    def save_blob(self, blob_filename: str, data: str, blob_container_name: str = BLOB_CONTAINER_NAME) -> None:
+    @property
+    def blob_service_client(self) -> BlobServiceClient:
+        """ Process-wide BlobServiceClient for this service's connection string """
+        return get_blob_service_client(self.connection_string)
+
+    def _get_container_client(self, blob_container_name: str) -> ContainerClient:
+        """
+        Get a container client for writing, creating the container the first time this process writes to it
+
+        Args:
+            blob_container_name (str): blob container name
+
+        Returns:
+            ContainerClient: container client
+        """
+        container_client: ContainerClient = self.blob_service_client.get_container_client(blob_container_name)
+
+        key: tuple[str, str] = (self.connection_string, blob_container_name)
+        if key not in _confirmed_containers:
+            try:  # One round trip either way, instead of exists() followed by create
+                container_client.create_container()
+            except ResourceExistsError:
+                pass
+            _confirmed_containers.add(key)
+
+        return container_client
+
+    @timed("storage.save_blob")
+    def save_blob(
+            self,
+            blob_filename: str,
+            data: str | bytes,
+            blob_container_name: str = BLOB_CONTAINER_NAME,
+            settings: ContentSettings | None = None
+    ) -> None:
         """
         Save blob to Azure Storage
 
         Args:
             blob_filename (str): blob file name
-            data (str): data to save
+            data (str | bytes): data to save
             blob_container_name (str): blob container name (optional)
+            settings (ContentSettings | None): Content-Type and Content-Encoding to store (optional)
         """
-        # Create a BlobServiceClient
-        blob_service_client: BlobServiceClient = BlobServiceClient.from_connection_string(self.connection_string)
+        # Create a container client (and the container, on first write)
+        container_client: ContainerClient = self._get_container_client(blob_container_name)
 
-        # Create a container client
-        container_client: ContainerClient = blob_service_client.get_container_client(blob_container_name)
+        blob_client: BlobClient = container_client.get_blob_client(blob_filename)  # Create a blob client
+        blob_client.upload_blob(  # Upload blob
+            data, overwrite=True, max_concurrency=BLOB_MAX_CONCURRENCY, content_settings=settings
+        )
+        record_bytes(payload_size(data))
+
+        self._forget_reads(blob_filename, blob_container_name)
+
+    @timed("storage.save_blob_stream")
+    def save_blob_stream(
+            self,
+            blob_filename: str,
+            chunks: Iterable[bytes],
+            blob_container_name: str = BLOB_CONTAINER_NAME,
+            settings: ContentSettings | None = None
+    ) -> None:
+        """
+        Save blob to Azure Storage from a stream of chunks, staging one block per chunk.
+        The blob only changes when the block list is committed, after the last chunk.
 
-        if not container_client.exists():  # If container doesn't exist, create it
-            container_client.create_container()
+        Args:
+            blob_filename (str): blob file name
+            chunks (Iterable[bytes]): blob content, in order (up to 4000 MiB per chunk)
+            blob_container_name (str): blob container name (optional)
+            settings (ContentSettings | None): Content-Type and Content-Encoding to store (optional)
+        """
+        # Create a container client (and the container, on first write)
+        container_client: ContainerClient = self._get_container_client(blob_container_name)
 
         blob_client: BlobClient = container_client.get_blob_client(blob_filename)  # Create a blob client
-        blob_client.upload_blob(data, overwrite=True)  # Upload blob
 
-    def get_blob(self, blob_filename: str) -> BlobClient:
+        blocks: list[BlobBlock] = []
+        for number, chunk in enumerate(chunks):
+            block_id: str = f"{number:08d}"  # Block ids must all be the same length
+            blob_client.stage_block(block_id=block_id, data=chunk)
+            record_bytes(len(chunk))
+            blocks.append(BlobBlock(block_id=block_id))
+        blob_client.commit_block_list(blocks, content_settings=settings)  # Replace the blob with the staged blocks
+
+        self._forget_reads(blob_filename, blob_container_name)
+
+    @timed("storage.save_blobs")
+    def save_blobs(
+            self,
+            blobs: dict[str, str | bytes],
+            blob_container_name: str = BLOB_CONTAINER_NAME,
+            settings: ContentSettings | None = None
+    ) -> None:
+        """
+        Save several blobs to Azure Storage in parallel
+
+        Args:
+            blobs (dict[str, str | bytes]): data to save, by blob file name
+            blob_container_name (str): blob container name (optional)
+            settings (ContentSettings | None): Content-Type and Content-Encoding to store for every blob (optional)
+        """
+        if not blobs:
+            return
+
+        container_client: ContainerClient = self._get_container_client(blob_container_name)
+
+        def upload(item: tuple[str, str | bytes]) -> None:
+            blob_filename, data = item
+            container_client.get_blob_client(blob_filename).upload_blob(
+                data, overwrite=True, max_concurrency=BLOB_MAX_CONCURRENCY, content_settings=settings
+            )
+
+        with ThreadPoolExecutor(max_workers=min(len(blobs), BLOB_MAX_CONCURRENCY)) as executor:
+            list(executor.map(upload, blobs.items()))  # Re-raises the first upload error
+        record_bytes(sum(payload_size(data) for data in blobs.values()))
+
+        for blob_filename in blobs:
+            self._forget_reads(blob_filename, blob_container_name)
+
+    def save_document(
+            self,
+            blob_filename: str,
+            document: Any,
+            blob_container_name: str = BLOB_CONTAINER_NAME,
+            stream: bool = False
+    ) -> None:
+        """
+        Serialize and save a document with the configured codec and compression (BLOB_CODEC, BLOB_COMPRESSION).
+        get_parsed_blob reads it back whatever they were.
+
+        Args:
+            blob_filename (str): blob file name
+            document (Any): JSON-compatible document
+            blob_container_name (str): blob container name (optional)
+            stream (bool): encode and upload in blocks, for large documents
+        """
+        encoded: EncodedBlob = encode_document(document, stream=stream)
+        if stream:
+            self.save_blob_stream(blob_filename, encoded.chunks, blob_container_name, content_settings(encoded))
+        else:
+            self.save_blob(blob_filename, encoded.data, blob_container_name, content_settings(encoded))
+
+    def save_documents(self, documents: dict[str, Any], blob_container_name: str = BLOB_CONTAINER_NAME) -> None:
+        """
+        Serialize and save several documents in parallel, like save_document
+
+        Args:
+            documents (dict[str, Any]): documents, by blob file name
+            blob_container_name (str): blob container name (optional)
+        """
+        if not documents:
+            return
+        encoded: dict[str, EncodedBlob] = {
+            blob_filename: encode_document(document) for blob_filename, document in documents.items()
+        }
+        self.save_blobs(
+            {blob_filename: blob.data for blob_filename, blob in encoded.items()},
+            blob_container_name,
+            content_settings(next(iter(encoded.values())))  # Same codec and compression for all
+        )
+
+    @timed("storage.read_blob_versioned")
+    def read_blob_versioned(
+            self, blob_filename: str, blob_container_name: str = BLOB_CONTAINER_NAME
+    ) -> tuple[bytes, str] | None:
+        """
+        Download a blob along with its ETag, for a later save_blob_if_unchanged
+
+        Args:
+            blob_filename (str): blob file name
+            blob_container_name (str): blob container name (optional)
+
+        Returns:
+            tuple[bytes, str] | None: blob content and ETag, or None if the blob doesn't exist
+        """
+        blob_client: BlobClient = self.get_blob(blob_filename, blob_container_name)
+        try:
+            downloader = blob_client.download_blob()
+            data: bytes = downloader.readall()
+        except ResourceNotFoundError:
+            return None
+        record_bytes(len(data))
+        return data, downloader.properties.etag
+
+    @timed("storage.save_blob_if_unchanged")
+    def save_blob_if_unchanged(
+            self,
+            blob_filename: str,
+            data: str | bytes,
+            etag: str | None,
+            blob_container_name: str = BLOB_CONTAINER_NAME
+    ) -> bool:
+        """
+        Save a blob only if nobody else wrote it since it was read (optimistic concurrency)
+
+        Args:
+            blob_filename (str): blob file name
+            data (str | bytes): data to save
+            etag (str | None): ETag from read_blob_versioned, or None if the blob didn't exist
+            blob_container_name (str): blob container name (optional)
+
+        Returns:
+            bool: True if saved, False if the blob changed (or was created) in the meantime
+        """
+        container_client: ContainerClient = self._get_container_client(blob_container_name)
+        blob_client: BlobClient = container_client.get_blob_client(blob_filename)
+        try:
+            if etag is None:
+                blob_client.upload_blob(data, overwrite=False)  # Fails if another writer created it first
+            else:
+                blob_client.upload_blob(data, overwrite=True, etag=etag, match_condition=MatchConditions.IfNotModified)
+        except (ResourceExistsError, ResourceModifiedError):
+            return False
+        record_bytes(payload_size(data))
+        self._forget_reads(blob_filename, blob_container_name)
+        return True
+
+    @timed("storage.append_blob")
+    def append_blob(self, blob_filename: str, data: bytes, blob_container_name: str = BLOB_CONTAINER_NAME) -> None:
+        """
+        Append one block to an append blob, creating the blob on first use. A block lands whole or not at all,
+        and concurrent appends never interleave within a block.
+
+        Args:
+            blob_filename (str): blob file name
+            data (bytes): data to append (up to 4 MiB)
+            blob_container_name (str): blob container name (optional)
+        """
+        container_client: ContainerClient = self._get_container_client(blob_container_name)
+        blob_client: BlobClient = container_client.get_blob_client(blob_filename)
+        try:
+            blob_client.append_block(data)
+        except ResourceNotFoundError:
+            try:
+                blob_client.create_append_blob(etag="*", match_condition=MatchConditions.IfMissing)
+            except ResourceExistsError:  # Another writer created it first
+                pass
+            blob_client.append_block(data)
+        record_bytes(len(data))
+        self._forget_reads(blob_filename, blob_container_name)
+
+    @timed("storage.read_blob_tail")
+    def read_blob_tail(
+            self, blob_filename: str, offset: int, blob_container_name: str = BLOB_CONTAINER_NAME
+    ) -> tuple[bytes, int]:
+        """
+        Download a blob from an offset to its end, e.g. what was appended since an earlier read
+
+        Args:
+            blob_filename (str): blob file name
+            offset (int): bytes already read
+            blob_container_name (str): blob container name (optional)
+
+        Returns:
+            tuple[bytes, int]: content after offset (empty if none, or if the blob is now shorter) and blob size
+
+        Raises:
+            ResourceNotFoundError: if the blob doesn't exist
+        """
+        blob_client: BlobClient = self.get_blob(blob_filename, blob_container_name)
+        size: int = blob_client.get_blob_properties().size
+        if size <= offset:
+            return b"", size
+        data: bytes = blob_client.download_blob(offset=offset, max_concurrency=BLOB_MAX_CONCURRENCY).readall()
+        record_bytes(len(data))
+        return data, offset + len(data)
+
+    @timed("storage.get_blobs")
+    def get_blobs(self, blob_filenames: Iterable[str], blob_container_name: str = BLOB_CONTAINER_NAME) -> dict[str, bytes]:
+        """
+        Download several blobs from Azure Storage in parallel
+
+        Args:
+            blob_filenames (Iterable[str]): blob file names
+            blob_container_name (str): blob container name (optional)
+
+        Returns:
+            dict[str, bytes]: blob content, by blob file name
+        """
+        blob_filenames = list(dict.fromkeys(blob_filenames))
+        if not blob_filenames:
+            return {}
+
+        def download(blob_filename: str) -> bytes:
+            blob_client: BlobClient = self.get_blob(blob_filename, blob_container_name)
+            return blob_client.download_blob(max_concurrency=BLOB_MAX_CONCURRENCY).readall()
+
+        with ThreadPoolExecutor(max_workers=min(len(blob_filenames), BLOB_MAX_CONCURRENCY)) as executor:
+            downloaded: dict[str, bytes] = dict(zip(blob_filenames, executor.map(download, blob_filenames)))
+        record_bytes(sum(len(data) for data in downloaded.values()))
+        return downloaded
+
+    def _forget_reads(self, blob_filename: str, blob_container_name: str) -> None:
+        """ Drop this instance's parsed reads of a blob after writing it """
+        self._invocation_reads = {
+            key: value for key, value in self._invocation_reads.items()
+            if key[:2] != (blob_container_name, blob_filename)
+        }
+
+    def get_blob(self, blob_filename: str, blob_container_name: str = BLOB_CONTAINER_NAME) -> BlobClient:
         """
         Get blob from Azure Storage
 
         Args:
             blob_filename (str): blob file name
+            blob_container_name (str): blob container name (optional)
 
         Returns:
             BlobClient: blob client
         """
-        # Create a BlobServiceClient
-        blob_service_client: BlobServiceClient = BlobServiceClient.from_connection_string(self.connection_string)
-
         # Create a container client
-        container_client: ContainerClient = blob_service_client.get_container_client(BLOB_CONTAINER_NAME)
+        container_client: ContainerClient = self.blob_service_client.get_container_client(blob_container_name)
 
         # Create a blob client and get the blob
         blob_client: BlobClient = container_client.get_blob_client(blob_filename)
 
         return blob_client
+
+    @timed("storage.get_parsed_blob")
+    def get_parsed_blob(
+            self,
+            blob_filename: str,
+            parser: Callable[[bytes], Any] = load_document,
+            blob_container_name: str = BLOB_CONTAINER_NAME
+    ) -> Any:
+        """
+        Read-through cached download and parse of a blob. Compressed blobs are decompressed
+        (by their Content-Encoding) before parsing, and the default parser reads any codec.
+
+        Repeat reads on this instance are served without a network call. Otherwise a parsed
+        copy from an earlier warm invocation is revalidated with a conditional GET on its
+        ETag, and only downloaded and parsed again if the blob changed. Cached values are
+        shared, so callers must not mutate them.
+
+        Args:
+            blob_filename (str): blob file name
+            parser (Callable[[bytes], Any]): parser for the uncompressed blob bytes
+            blob_container_name (str): blob container name (optional)
+
+        Returns:
+            Any: parsed blob
+        """
+        key: tuple[str, str, str] = (blob_container_name, blob_filename, parser_key(parser))
+        if key in self._invocation_reads:
+            return self._invocation_reads[key]
+
+        blob_key: str = f"{blob_container_name}/{blob_filename}"
+        blob_client: BlobClient = self.get_blob(blob_filename, blob_container_name)
+
+        cached = blob_cache.get(key)
+        spilled: tuple[str, bytes] | None = None
+        etag: str | None = cached.etag if cached else None
+        if etag is None:
+            spilled = blob_cache.read_spill(blob_key)
+            etag = spilled[0] if spilled else None
+
+        try:
+            # Decompressed here rather than by the transport, which can't undo it across parallel ranges
+            if etag is None:
+                downloader = blob_client.download_blob(decompress=False)
+            else:
+                downloader = blob_client.download_blob(
+                    etag=etag, match_condition=MatchConditions.IfModified, decompress=False
+                )
+            stored: bytes = downloader.readall()
+            record_bytes(len(stored))
+        except HttpResponseError as err:
+            if err.status_code != 304:  # The storage SDK surfaces 304 as a plain HttpResponseError
+                raise
+            if cached:
+                logger.info(f"{blob_key} unchanged (ETag {etag}); using cached copy")
+                value = cached.value
+            else:
+                logger.info(f"{blob_key} unchanged (ETag {etag}); parsing spilled copy")
+                value = parser(spilled[1])
+                blob_cache.put(key, etag, value, len(spilled[1]))
+            self._invocation_reads[key] = value
+            return value
+
+        new_etag: str = downloader.properties.etag
+        data: bytes = decompress(stored, downloader.properties.content_settings.content_encoding)
+        value = parser(data)
+        blob_cache.put(key, new_etag, value, len(data))
+        blob_cache.write_spill(blob_key, new_etag, data)
+        self._invocation_reads[key] = value
+        return value
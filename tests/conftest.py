@@ -0,0 +1,9 @@
+""" Shared test setup """
+import sys
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """ Drain the background log writer while pytest's captured stderr is still open """
+    logger_module = sys.modules.get("src.mlb_today.logger")
+    if logger_module is not None:
+        logger_module.log_writer.stop()
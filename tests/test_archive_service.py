@@ -0,0 +1,112 @@
+""" Appends to and reads from the season stats archive """
+from typing import Any
+
+from benchmarks.fakes import FakeStorageService
+from src.mlb_today.services.archive_service import ArchiveService, archive_blob_filename
+from src.mlb_today.services.stats_format import to_columnar
+
+COLUMNS: list[str] = ["xMLBAMID", "PlayerName", "ERA"]
+DOCUMENT: dict[str, Any] = to_columnar([{"xMLBAMID": 1, "PlayerName": "A", "ERA": 2.5}], COLUMNS)
+STATS: list[str] = ["xMLBAMID", "PlayerName", "ERA", "WAR"]
+
+
+def snapshot(*rows: tuple[Any, ...]) -> dict[str, Any]:
+    """ Columnar pitching snapshot from (id, ERA, WAR) rows """
+    return to_columnar([dict(zip(STATS, (player_id, f"P{player_id}", *stats))) for player_id, *stats in rows], STATS)
+
+
+def season(tmp_path) -> tuple[FakeStorageService, ArchiveService]:
+    """ Archive with three days: player 2 misses the second, and player 1 has no WAR on the first """
+    storage: FakeStorageService = FakeStorageService()
+    archive_service: ArchiveService = ArchiveService(storage, directory=str(tmp_path))
+    archive_service.append_snapshot("pitching", "2025-04-01", snapshot((1, 3.14, None), (2, 4.5, 0.2)))
+    archive_service.append_snapshot("pitching", "2025-04-02", snapshot((1, 2.9, 0.3)))
+    archive_service.append_snapshot("pitching", "2025-04-03", snapshot((2, 4.25, 0.4), (1, "2.75", 0.5)))
+    return storage, archive_service
+
+
+def test_append_if_missing_fills_a_missing_day_once(tmp_path):
+    storage: FakeStorageService = FakeStorageService()
+    archive_service: ArchiveService = ArchiveService(storage, directory=str(tmp_path))
+
+    assert archive_service.append_snapshot("pitching", "2025-04-01", DOCUMENT, if_missing=True)
+    written: int = storage.bytes_written
+    assert not archive_service.append_snapshot("pitching", "2025-04-01", DOCUMENT, if_missing=True)
+    assert storage.bytes_written == written
+
+    assert archive_service.append_snapshot("pitching", "2025-04-02", DOCUMENT, if_missing=True)
+    with archive_service.open_season("pitching", "2025") as archive:
+        assert archive.days == ["2025-04-01", "2025-04-02"]
+
+
+def test_append_without_if_missing_always_appends(tmp_path):
+    storage: FakeStorageService = FakeStorageService()
+    archive_service: ArchiveService = ArchiveService(storage, directory=str(tmp_path))
+
+    archive_service.append_snapshot("batting", "2025-04-01", DOCUMENT)
+    written: int = storage.bytes_written
+    assert archive_service.append_snapshot("batting", "2025-04-01", DOCUMENT)
+    assert storage.bytes_written == 2 * written
+
+
+def test_player_series_reads_every_archived_day(tmp_path):
+    _, archive_service = season(tmp_path)
+
+    assert archive_service.player_series("pitching", "2025", 1) == [
+        {"date": "2025-04-01", "ERA": 3.14, "WAR": None},  # NaN reads as None; float32 noise is undone
+        {"date": "2025-04-02", "ERA": 2.9, "WAR": 0.3},
+        {"date": "2025-04-03", "ERA": 2.75, "WAR": 0.5}
+    ]
+    assert archive_service.player_series("pitching", "2025", "2", ["WAR", "FIP"]) == [  # Missing on 2025-04-02
+        {"date": "2025-04-01", "WAR": 0.2, "FIP": None},
+        {"date": "2025-04-03", "WAR": 0.4, "FIP": None}
+    ]
+    assert archive_service.player_series("pitching", "2025", 3) == []
+    assert archive_service.player_series("pitching", "2024", 1) == []  # No archive for the season
+
+
+def test_reingested_day_reads_as_its_latest_frame(tmp_path):
+    _, archive_service = season(tmp_path)
+
+    archive_service.append_snapshot("pitching", "2025-04-02", snapshot((1, 3.0, 0.35)))
+
+    series: list[dict[str, Any]] = archive_service.player_series("pitching", "2025", 1, ["ERA"])
+    assert [point["date"] for point in series] == ["2025-04-01", "2025-04-02", "2025-04-03"]
+    assert series[1]["ERA"] == 3.0
+
+
+def test_sync_downloads_only_new_frames(tmp_path):
+    storage, archive_service = season(tmp_path)
+    archive_service.player_series("pitching", "2025", 1)
+
+    written: int = storage.bytes_written
+    archive_service.append_snapshot("pitching", "2025-04-04", snapshot((1, 2.5, 0.6)))
+    appended: int = storage.bytes_written - written
+
+    read: int = storage.bytes_read
+    assert archive_service.player_series("pitching", "2025", 1, ["ERA"])[-1] == {"date": "2025-04-04", "ERA": 2.5}
+    assert storage.bytes_read - read == appended  # Just the new frame
+
+
+def test_recreated_archive_is_downloaded_again(tmp_path):
+    storage, archive_service = season(tmp_path)
+    archive_service.player_series("pitching", "2025", 1)
+
+    storage.blobs = {key: value for key, value in storage.blobs.items() if "archive/" not in key[1]}
+    archive_service.append_snapshot("pitching", "2025-05-01", snapshot((1, 1.5, 1.0)))
+
+    assert archive_service.player_series("pitching", "2025", 1) == [{"date": "2025-05-01", "ERA": 1.5, "WAR": 1.0}]
+
+
+def test_damaged_local_copy_is_discarded_and_downloaded_again(tmp_path):
+    storage, archive_service = season(tmp_path)
+    expected: list[dict[str, Any]] = archive_service.player_series("pitching", "2025", 1)
+
+    local_path = tmp_path / "pitching" / "2025.bin"
+    damaged: bytes = b"JUNK" + local_path.read_bytes()[4:]  # Same size, so sync alone wouldn't notice
+    local_path.write_bytes(damaged)
+
+    assert archive_service.player_series("pitching", "2025", 1) == expected
+    blob_filename: str = archive_blob_filename("pitching", "2025")
+    archived: bytes = next(data for (_, name), data in storage.blobs.items() if name == blob_filename)
+    assert local_path.read_bytes() == archived
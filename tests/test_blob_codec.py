@@ -0,0 +1,52 @@
+""" Blob codecs and compressions: round trips, and configured ones whose package is missing """
+import pytest
+
+from src.mlb_today.services import blob_codec
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    blob_codec.get_codec.cache_clear()
+    blob_codec.get_compression.cache_clear()
+    yield
+    blob_codec.get_codec.cache_clear()
+    blob_codec.get_compression.cache_clear()
+
+
+def test_missing_codec_package_raises(monkeypatch):
+    monkeypatch.setattr(blob_codec, "msgpack", None)
+
+    with pytest.raises(RuntimeError, match="msgpack"):
+        blob_codec.encode_document({"a": 1}, codec="msgpack", compression="none")
+
+
+def test_missing_compression_package_raises(monkeypatch):
+    monkeypatch.setattr(blob_codec, "zstandard", None)
+
+    with pytest.raises(RuntimeError, match="zstandard"):
+        blob_codec.encode_document({"a": 1}, codec="json", compression="zstd")
+
+
+def test_reading_a_blob_whose_package_is_missing_raises(monkeypatch):
+    monkeypatch.setattr(blob_codec, "zstandard", None)
+
+    with pytest.raises(RuntimeError, match="zstandard"):
+        blob_codec.decompress(blob_codec.ZSTD_MAGIC + b"rest")
+
+
+PACKAGES: dict[str, str] = {"orjson": "orjson", "msgpack": "msgpack", "zstd": "zstandard"}
+
+
+@pytest.mark.parametrize("compression", blob_codec.COMPRESSIONS)
+@pytest.mark.parametrize("codec", list(blob_codec.CODECS))
+def test_round_trip(codec, compression):
+    for name in (codec, compression):
+        if name in PACKAGES:
+            pytest.importorskip(PACKAGES[name], reason="codecs extra not installed")
+    document = {"columns": {"ERA": [2.5, None], "Name": ["A", "B"]}, "rows": 2, "index": {"1": 0}}
+
+    blob = blob_codec.encode_document(document, codec=codec, compression=compression)
+
+    assert blob.content_encoding == (None if compression == "none" else compression)
+    assert blob_codec.decode_document(blob.data, blob.content_encoding) == document
+    assert blob_codec.decode_document(blob.data) == document  # Detected without the Content-Encoding
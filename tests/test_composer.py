@@ -0,0 +1,52 @@
+""" Personalized emails assembled from cached fragments """
+from typing import Any
+
+import pytest
+
+from benchmarks.bench_render import sample_email_data
+from src.mlb_today.composer import TEMPLATE_NAME, EmailComposer, RecipientPreferences
+from src.mlb_today.rendering import create_environment, prepare_email_data
+
+
+@pytest.fixture(scope="module")
+def environment():
+    return create_environment()
+
+
+@pytest.fixture(scope="module")
+def email_data() -> dict[str, Any]:
+    return prepare_email_data(sample_email_data())
+
+
+def test_standard_email_matches_a_one_shot_render(environment, email_data):
+    one_shot: str = environment.get_template(TEMPLATE_NAME).render(**email_data)
+
+    assert EmailComposer(environment).edition(email_data).assemble() == one_shot
+
+
+def test_only_teams_with_no_game_today_gets_the_full_slate(environment, email_data):
+    edition = EmailComposer(environment).edition(email_data)
+
+    assert edition.assemble(RecipientPreferences(["XXX"], only_teams=True)) == edition.assemble()
+
+
+def test_only_teams_keeps_just_their_games(environment, email_data):
+    edition = EmailComposer(environment).edition(email_data)
+
+    body: str = edition.assemble(RecipientPreferences(["T02"], only_teams=True))  # Game 1: T02 at T03
+    assert "Ballpark 1," in body
+    assert "Ballpark 2," not in body
+    assert body != edition.assemble()
+
+
+def test_equal_preferences_share_one_body(environment, email_data):
+    composer = EmailComposer(environment)
+    edition = composer.edition(email_data)
+
+    first: str = edition.assemble(RecipientPreferences(["t02", "T05"]))
+    misses: int = composer.cache.misses
+    second: str = edition.assemble(RecipientPreferences([" T05", "T02 "]))
+
+    assert second is first
+    assert composer.cache.misses == misses
+    assert first != edition.assemble()  # Highlighting changes the body
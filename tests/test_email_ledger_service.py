@@ -0,0 +1,31 @@
+""" Claims and per-recipient results in the email ledger """
+from benchmarks.fakes import FakeStorageService
+from src.mlb_today.services.email_ledger_service import EmailLedgerService, ledger_key
+
+KEY: str = ledger_key(b"{}", ["a@example.com", "b@example.com"])
+
+
+def test_claimed_email_isnt_claimed_again_until_completed():
+    ledger: EmailLedgerService = EmailLedgerService(FakeStorageService())
+
+    assert ledger.claim(KEY) == set()
+    assert ledger.claim(KEY) is None  # Still being sent
+
+
+def test_partly_failed_send_is_retried_for_the_remaining_recipients():
+    ledger: EmailLedgerService = EmailLedgerService(FakeStorageService())
+
+    ledger.claim(KEY)
+    ledger.complete(KEY, ["A@example.com"], finished=False)
+    assert ledger.claim(KEY) == {"a@example.com"}
+
+    ledger.complete(KEY, ["a@example.com", "b@example.com"], finished=True)
+    assert ledger.claim(KEY) is None
+
+
+def test_send_that_reached_nobody_releases_the_claim():
+    ledger: EmailLedgerService = EmailLedgerService(FakeStorageService())
+
+    ledger.claim(KEY)
+    ledger.complete(KEY, [], finished=False)
+    assert ledger.claim(KEY) == set()
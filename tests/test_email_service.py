@@ -0,0 +1,123 @@
+""" Concurrent ACS delivery: throttling, Retry-After, isolated failures and timeouts """
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from azure.core.exceptions import HttpResponseError
+import pytest
+
+from src.mlb_today.services import email_service
+from src.mlb_today.services.email_service import EmailService, RateLimiter, retry_after_seconds
+
+
+class FakePoller:
+    """ LROPoller stand-in that finishes with a given status, or never if status is None """
+    def __init__(self, status: str | None):
+        self._status = status
+
+    def done(self) -> bool:
+        return self._status is not None
+
+    def status(self) -> str:
+        return self._status or "Running"
+
+    def result(self) -> dict[str, Any]:
+        return {"status": self._status}
+
+
+class FakeEmailClient:
+    """ EmailClient stand-in: per address, a list of outcomes to raise or a poller status, in call order """
+    def __init__(self, outcomes: dict[str, list[Any]] | None = None):
+        self.outcomes = outcomes or {}
+        self.calls: list[tuple[str, str]] = []
+
+    def begin_send(self, message: dict[str, Any], operation_id: str) -> FakePoller:
+        address: str = message["recipients"]["to"][0]["address"]
+        self.calls.append((address, operation_id))
+        pending: list[Any] = self.outcomes.get(address, [])
+        outcome: Any = pending.pop(0) if pending else "Succeeded"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakePoller(outcome)
+
+
+def throttled(status_code: int = 429, headers: dict[str, str] | None = None) -> HttpResponseError:
+    response = SimpleNamespace(status_code=status_code, reason="Throttled", headers=headers or {}, text=lambda: "")
+    return HttpResponseError(response=response)
+
+
+@pytest.fixture
+def send(monkeypatch):
+    """ Send one body to some addresses through a fake client; returns the results and the client """
+    monkeypatch.setattr(email_service, "ACS_CONNECTION_STRING", "endpoint=https://fake/;accesskey=ZmFrZQ==")
+    monkeypatch.setattr(email_service, "ACS_SENDER_ADDRESS", "DoNotReply@example.com")
+    monkeypatch.setattr(email_service, "EMAIL_BATCH_SIZE", 1)
+    monkeypatch.setattr(email_service, "EMAIL_BACKOFF_FACTOR", 0.0)
+    monkeypatch.setattr(email_service, "EMAIL_POLL_INTERVAL", 0.01)
+
+    def run(addresses: list[str], client: FakeEmailClient) -> list[email_service.DeliveryResult]:
+        monkeypatch.setattr(email_service, "get_email_client", lambda connection_string: client)
+        return EmailService().send_email_with_acs("Subject", "<p>Body</p>", ",".join(addresses))
+    return run
+
+
+def test_throttled_send_is_retried_with_the_same_operation_id(send):
+    client = FakeEmailClient({"a@example.com": [throttled(429), throttled(503)]})
+
+    results = send(["a@example.com"], client)
+
+    assert [result.status for result in results] == ["Succeeded"]
+    assert len(client.calls) == 3
+    assert len({operation_id for _, operation_id in client.calls}) == 1
+
+
+def test_throttling_past_max_retries_fails_only_that_message(send, monkeypatch):
+    monkeypatch.setattr(email_service, "EMAIL_MAX_RETRIES", 1)
+    client = FakeEmailClient({"a@example.com": [throttled(), throttled(), throttled()]})
+
+    results = send(["a@example.com", "b@example.com"], client)
+
+    assert [result.status for result in results] == ["Failed", "Succeeded"]
+
+
+def test_failed_batch_does_not_abort_the_others(send):
+    client = FakeEmailClient({"b@example.com": [throttled(400)], "c@example.com": ["Failed"]})
+
+    results = send(["a@example.com", "b@example.com", "c@example.com", "d@example.com"], client)
+
+    assert [result.status for result in results] == ["Succeeded", "Failed", "Failed", "Succeeded"]
+    assert [result.succeeded for result in results] == [True, False, False, True]
+
+
+def test_send_that_never_finishes_times_out(send, monkeypatch):
+    monkeypatch.setattr(email_service, "EMAIL_SEND_TIMEOUT", 0.05)
+    client = FakeEmailClient({"a@example.com": [None]})
+
+    results = send(["a@example.com", "b@example.com"], client)
+
+    assert results[0].status == "TimedOut (Running)"
+    assert results[1].succeeded
+
+
+def test_retry_after_headers():
+    assert retry_after_seconds(throttled(headers={"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(throttled(headers={"Retry-After": "2"})) == 2.0
+    assert retry_after_seconds(throttled(headers={"Retry-After": "soon"})) is None
+    assert retry_after_seconds(throttled()) is None
+
+
+def test_rate_limiter_honours_retry_after():
+    limiter = RateLimiter(backoff_factor=0.0)
+    limiter.back_off(attempt=5, retry_after=0.05)  # Retry-After wins over the exponential delay
+
+    start: float = time.monotonic()
+    limiter.wait()
+    assert 0.05 <= time.monotonic() - start < 0.5
+
+
+def test_rate_limiter_backs_off_exponentially_without_retry_after():
+    limiter = RateLimiter(backoff_factor=0.01)
+    limiter.back_off(attempt=2)
+
+    delay: float = limiter._resume_at - time.monotonic()
+    assert 0.03 < delay <= 0.05  # 0.01 * 2 ** 2, plus up to 0.01 of jitter
@@ -0,0 +1,49 @@
+""" League percentiles, z-scores and qualified ranks """
+from typing import Any
+
+from src.mlb_today.services.leaderboards import LeaderboardSpec
+from src.mlb_today.services.league_stats import LeagueStats
+from src.mlb_today.services.stats_format import to_columnar
+
+COLUMNS: list[str] = ["xMLBAMID", "IP", "ERA", "WAR"]
+SPECS: tuple[LeaderboardSpec, ...] = (
+    LeaderboardSpec("ERA", descending=False, qualified=True), LeaderboardSpec("WAR")
+)
+
+
+def league(*rows: tuple[Any, ...]) -> LeagueStats:
+    return LeagueStats(to_columnar([dict(zip(COLUMNS, row)) for row in rows], COLUMNS), SPECS, ("IP", 30))
+
+
+def test_percentiles_and_qualified_ranks():
+    stats: LeagueStats = league((1, 100, 2.0, 5.0), (2, 80, 3.0, 3.0), (3, 10, 1.0, 1.0), (4, 60, 4.0, 0.0))
+
+    assert stats.context(1) == {
+        "era": {"pct": 62, "z": -0.45, "rank": 1, "qualified": 3},
+        "war": {"pct": 88, "z": 1.43, "rank": 1, "qualified": 3}
+    }
+    assert stats.context(4)["era"] == {"pct": 12, "z": 1.34, "rank": 3, "qualified": 3}  # Lower ERA is better
+    assert stats.context(3)["era"] == {"pct": 88, "z": -1.34, "rank": None, "qualified": 3}  # Too few innings
+
+
+def test_ties_share_a_rank_and_percentile():
+    stats: LeagueStats = league((1, 100, 3.0, 2.0), (2, 100, 3.0, 2.0), (3, 100, 4.0, 1.0))
+
+    assert stats.context(1)["era"] == stats.context(2)["era"] == {"pct": 67, "z": -0.71, "rank": 1, "qualified": 3}
+
+
+def test_missing_and_non_numeric_values_get_no_context():
+    stats: LeagueStats = league((1, "100", "2.50", None), (2, 100, "-", 1.5), (3, None, 3.5, "2.0"))
+
+    assert stats.context(1) == {"era": {"pct": 75, "z": -1.0, "rank": 1, "qualified": 1}}
+    assert "era" not in stats.context(2)
+    assert stats.context(3)["war"] == {"pct": 75, "z": 1.0, "rank": None, "qualified": 1}
+    assert stats.context(99) == {}
+
+
+def test_z_scores_are_against_the_whole_league():
+    stats: LeagueStats = league((1, 100, 2.0, 5.0), (2, 80, 3.0, 3.0), (3, 10, 1.0, 1.0), (4, 60, 4.0, 0.0))
+
+    # ERA mean 2.5, standard deviation 1.118; unqualified pitchers count toward both
+    assert [stats.context(player)["era"]["z"] for player in (1, 2, 3, 4)] == [-0.45, 0.45, -1.34, 1.34]
+    assert league((1, 100, 3.0, 2.0), (2, 100, 3.0, 2.0)).context(1)["era"]["z"] == 0.0  # No spread
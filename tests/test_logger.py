@@ -0,0 +1,45 @@
+""" Background log writer when the log file can't be written """
+import logging
+import queue
+
+from src.mlb_today import logger as logger_module
+from src.mlb_today.logger import BatchedFileHandler, LogWriter
+
+
+def write(messages: list[str]) -> None:
+    """ Run a fresh writer over some records and stop it """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    writer: LogWriter = LogWriter(log_queue, batch_size=10)
+    writer.start()
+    for message in messages:
+        log_queue.put(logging.makeLogRecord({"msg": message, "levelno": logging.INFO, "levelname": "INFO"}))
+    writer.stop()
+    assert not writer._thread.is_alive()
+
+
+def test_unwritable_log_directory_falls_back_to_stderr(tmp_path, monkeypatch, capsys):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setattr(logger_module, "LOG_DIRECTORY", str(blocker / "logs"))
+    monkeypatch.setattr(logger_module, "LOG_FILE_PATH", str(blocker / "logs" / "application.log"))
+
+    write(["first", "second"])
+
+    stderr: str = capsys.readouterr().err
+    assert "Log file unavailable" in stderr
+    assert '"message": "first"' in stderr and '"message": "second"' in stderr
+
+
+def test_failed_flush_rewrites_the_batch_to_stderr(tmp_path, monkeypatch, capsys):
+    def disk_full(self):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(logger_module, "LOG_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(logger_module, "LOG_FILE_PATH", str(tmp_path / "application.log"))
+    monkeypatch.setattr(BatchedFileHandler, "flush_batch", disk_full)
+
+    write(["lost on disk"])
+
+    stderr: str = capsys.readouterr().err
+    assert "No space left on device" in stderr
+    assert '"message": "lost on disk"' in stderr
@@ -0,0 +1,44 @@
+""" Span recording and export """
+from src.mlb_today.metrics import MetricsRegistry
+
+
+class CountingExporter:
+    def __init__(self):
+        self.exports: int = 0
+
+    def record(self, stage: str, duration_ms: float, size: int) -> None:
+        pass
+
+    def export(self, stages) -> None:
+        self.exports += 1
+
+
+def registry() -> tuple[MetricsRegistry, CountingExporter]:
+    metrics = MetricsRegistry()
+    exporter = CountingExporter()
+    metrics._exporter, metrics._exporter_created = exporter, True
+    return metrics, exporter
+
+
+def test_outermost_span_exports_once():
+    metrics, exporter = registry()
+
+    with metrics.span("function.run"):
+        with metrics.span("storage.read"):
+            pass
+
+    assert set(metrics.stages) == {"function.run", "storage.read"}
+    assert exporter.exports == 1
+
+
+def test_untimed_block_records_and_exports_nothing():
+    metrics, exporter = registry()
+
+    with metrics.untimed():
+        with metrics.span("storage.read"):
+            pass
+    with metrics.span("function.run"):
+        pass
+
+    assert set(metrics.stages) == {"function.run"}
+    assert exporter.exports == 1
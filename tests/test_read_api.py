@@ -0,0 +1,25 @@
+""" Encodings and revalidation of read API responses """
+from src.mlb_today.read_api import ApiResponse, GZIP_MIN_BYTES
+
+LARGE: dict[str, str] = {"venue": "x" * GZIP_MIN_BYTES}
+
+
+def test_gzip_body_has_its_own_etag():
+    response: ApiResponse = ApiResponse(LARGE)
+
+    assert response.encoded("gzip, deflate")[1] == "gzip"
+    assert response.etag_for("gzip") == response.etag[:-1] + "-gzip\""
+    assert response.etag_for(None) == response.etag
+
+
+def test_either_etag_revalidates():
+    response: ApiResponse = ApiResponse(LARGE)
+
+    assert response.matches(response.etag)
+    assert response.matches(f"W/{response.gzip_etag}")
+    assert not response.matches(ApiResponse({"venue": "y"}).etag)
+
+
+def test_small_bodies_and_refused_gzip_are_sent_uncompressed():
+    assert ApiResponse({"venue": "x"}).content_encoding("gzip") is None
+    assert ApiResponse(LARGE).content_encoding("gzip;q=0, identity") is None
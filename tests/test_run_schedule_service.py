@@ -0,0 +1,35 @@
+""" When a scheduled run may be claimed """
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from src.mlb_today.services.run_schedule_service import (
+    FAILED, RUN_LEASE, RUN_MAX_ATTEMPTS, SCHEDULED, STARTED, RunScheduleService
+)
+
+NOW: datetime = datetime(2025, 6, 1, 17, 0, tzinfo=timezone.utc)
+DAY: str = "2025-06-01"
+
+
+def run(status: str, attempts: int, updated: datetime = NOW) -> dict[str, Any]:
+    return {
+        "job": "get_probables", "day": DAY, "run_at": (NOW - timedelta(hours=1)).isoformat(),
+        "status": status, "attempts": attempts, "updated_at": updated.isoformat()
+    }
+
+
+def is_due(scheduled: dict[str, Any]) -> bool:
+    return RunScheduleService(storage_service=object())._is_due(scheduled, DAY, NOW)
+
+
+def test_scheduled_run_is_due():
+    assert is_due(run(SCHEDULED, 0))
+
+
+def test_started_run_is_due_again_only_after_its_lease():
+    assert not is_due(run(STARTED, 1))
+    assert is_due(run(STARTED, 1, updated=NOW - RUN_LEASE))
+
+
+def test_attempts_limit_applies_to_failed_and_abandoned_runs():
+    assert not is_due(run(FAILED, RUN_MAX_ATTEMPTS))
+    assert not is_due(run(STARTED, RUN_MAX_ATTEMPTS, updated=NOW - RUN_LEASE))
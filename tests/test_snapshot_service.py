@@ -0,0 +1,56 @@
+""" Round trips of snapshot deltas """
+from typing import Any
+
+import pytest
+
+from src.mlb_today.services.snapshot_service import apply_delta, content_hash, create_delta, row_hashes
+from src.mlb_today.services.stats_format import to_columnar
+
+COLUMNS: list[str] = ["xMLBAMID", "PlayerName", "ERA"]
+
+
+def snapshot(*rows: tuple[Any, str, float]) -> dict[str, Any]:
+    return to_columnar([dict(zip(COLUMNS, row)) for row in rows], COLUMNS)
+
+
+def manifest(document: dict[str, Any]) -> dict[str, Any]:
+    return {"content_hash": content_hash(document), "rows": row_hashes(document)}
+
+
+def delta_between(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    delta: dict[str, Any] = create_delta(new, row_hashes(new), manifest(old))
+    delta["content_hash"] = content_hash(new)
+    return delta
+
+
+OLD: dict[str, Any] = snapshot((1, "A", 2.5), (2, "B", 3.1), (3, "C", 4.0))
+
+
+def test_round_trip_with_changed_added_removed_and_reordered_rows():
+    new: dict[str, Any] = snapshot((2, "B", 2.4), (1, "A", 2.5), (4, "D", 3.3))
+    delta: dict[str, Any] = delta_between(OLD, new)
+
+    assert set(delta["changed"]) == {"2", "4"}
+    assert delta["removed"] == ["3"]
+    assert apply_delta(OLD, delta) == new
+
+
+def test_first_delta_carries_every_row():
+    delta: dict[str, Any] = create_delta(OLD, row_hashes(OLD), None)
+
+    assert apply_delta(snapshot(), delta) == OLD
+
+
+def test_rows_without_an_id_or_repeating_one_are_left_out():
+    new: dict[str, Any] = snapshot((1, "A", 2.5), (None, "No id", 5.0), (2, "B", 3.0), (1, "A again", 9.9))
+    delta: dict[str, Any] = delta_between(OLD, new)
+
+    assert delta["order"] == ["1", "2"]
+    assert apply_delta(OLD, delta) == snapshot((1, "A", 2.5), (2, "B", 3.0))
+
+
+def test_delta_is_rejected_for_another_base():
+    delta: dict[str, Any] = delta_between(OLD, snapshot((1, "A", 2.0)))
+
+    with pytest.raises(ValueError, match="applies to snapshot"):
+        apply_delta(snapshot((1, "A", 2.7)), delta)